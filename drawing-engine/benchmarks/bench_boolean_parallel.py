@@ -0,0 +1,92 @@
+"""Benchmark: OCCT parallel boolean mode on hole-dense specs.
+
+Builds hole-grid blocks (see :mod:`benchmarks.bench_fused_cuts`) with
+``GeometryEngine.build_solid`` and :class:`BooleanOptions` set to serial
+mode and to parallel mode with growing thread pools, and reports the
+speedup over serial. Optionally also applies a fuzzy tolerance.
+
+OCCT's thread pool is sized once per process
+(:func:`configure_occt_threads`), so every pool size runs in a fresh
+worker process.
+
+Scaling depends on the cores of the machine: the table is only
+meaningful up to ``os.cpu_count()`` threads.
+
+Usage (from the ``drawing-engine`` folder)::
+
+    python -m benchmarks.bench_boolean_parallel
+    python -m benchmarks.bench_boolean_parallel --counts 400 1000 \\
+        --threads 1 2 4 8 16 --fuzzy 1e-5
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import math
+import os
+import time
+from typing import List
+
+from scanmaster_drawing_engine.geometry_engine import (
+    BooleanOptions,
+    GeometryEngine,
+    SolidSpec,
+    configure_occt_threads,
+)
+
+from benchmarks.bench_fused_cuts import hole_grid_spec
+
+
+def _time_build(
+    engine: GeometryEngine, spec: SolidSpec, options: BooleanOptions, repeat: int
+) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.build_solid(spec, options)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _measure(count: int, threads: int | None, fuzzy: float, repeat: int) -> float:
+    """Time one case in a fresh worker process with its own pool size."""
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(_time_in_process, count, threads, fuzzy, repeat).result()
+
+
+def _time_in_process(
+    count: int, threads: int | None, fuzzy: float, repeat: int
+) -> float:
+    configure_occt_threads(threads)
+    engine = GeometryEngine()
+    # Warm up CadQuery/OCP so the case does not pay the import.
+    engine.build_solid(hole_grid_spec(1), BooleanOptions(parallel=False))
+    options = BooleanOptions(parallel=threads is not None, fuzzy=fuzzy)
+    return _time_build(engine, hole_grid_spec(count), options, repeat)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 400])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--fuzzy", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"cpu_count={os.cpu_count()} fuzzy={args.fuzzy:g}")
+    print(f"{'holes':>6} {'mode':>10} {'build_s':>8} {'speedup':>8}")
+    for count in args.counts:
+        t_serial = _measure(count, None, args.fuzzy, args.repeat)
+        print(f"{count:>6} {'serial':>10} {t_serial:>8.3f} {1.0:>7.1f}x")
+        for threads in args.threads:
+            seconds = _measure(count, threads, args.fuzzy, args.repeat)
+            print(
+                f"{count:>6} {f'{threads} thr':>10} {seconds:>8.3f} "
+                f"{t_serial / seconds:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
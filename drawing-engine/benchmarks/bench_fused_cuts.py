@@ -0,0 +1,98 @@
+"""Benchmark: fused multi-tool cut vs. one boolean per hole.
+
+Builds a block with N through-holes laid out on a grid and times
+``GeometryEngine.build_solid`` with ``fuse_modifiers`` on and off.
+
+Usage (from the ``drawing-engine`` folder)::
+
+    python -m benchmarks.bench_fused_cuts
+    python -m benchmarks.bench_fused_cuts --counts 1 10 100 500 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from typing import List
+
+from scanmaster_drawing_engine.geometry_engine import (
+    BaseBox,
+    GeometryEngine,
+    SolidSpec,
+    ThroughHole,
+)
+
+
+HOLE_RADIUS = 1.0
+HOLE_PITCH = 4.0
+BLOCK_HEIGHT = 10.0
+
+
+def hole_grid_spec(count: int) -> SolidSpec:
+    """Return a block with ``count`` Z through-holes on a square grid."""
+
+    per_row = max(1, math.ceil(math.sqrt(count)))
+    rows = math.ceil(count / per_row)
+    width = per_row * HOLE_PITCH
+    depth = rows * HOLE_PITCH
+
+    holes: List[ThroughHole] = []
+    for i in range(count):
+        row, col = divmod(i, per_row)
+        holes.append(
+            ThroughHole(
+                radius=HOLE_RADIUS,
+                depth=BLOCK_HEIGHT,
+                axis="z",
+                center=(
+                    (col + 0.5) * HOLE_PITCH,
+                    (row + 0.5) * HOLE_PITCH,
+                    BLOCK_HEIGHT / 2.0,
+                ),
+            )
+        )
+
+    return SolidSpec(
+        id=f"hole-grid-{count}",
+        operations=[
+            BaseBox(
+                width=width,
+                depth=depth,
+                height=BLOCK_HEIGHT,
+                centered_xy=False,
+                centered_z=False,
+            ),
+            *holes,
+        ],
+    )
+
+
+def _time_build(engine: GeometryEngine, spec: SolidSpec, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.build_solid(spec)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    fused = GeometryEngine(fuse_modifiers=True)
+    sequential = GeometryEngine(fuse_modifiers=False)
+
+    print(f"{'holes':>6} {'sequential_s':>13} {'fused_s':>9} {'speedup':>8}")
+    for count in args.counts:
+        spec = hole_grid_spec(count)
+        t_seq = _time_build(sequential, spec, args.repeat)
+        t_fused = _time_build(fused, spec, args.repeat)
+        print(f"{count:>6} {t_seq:>13.3f} {t_fused:>9.3f} {t_seq / t_fused:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
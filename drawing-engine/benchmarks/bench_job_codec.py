@@ -0,0 +1,120 @@
+"""Benchmark: JSON vs. msgpack vs. columnar job encodings.
+
+Encodes a hole-grid job with N through-holes in several wire formats
+and measures, per format:
+
+* ``bytes``      size of the encoded job (what goes through the pipe),
+* ``decode_s``   bytes → job dict,
+* ``prepare_s``  decode plus validation and ``SolidSpec`` parsing, i.e.
+  everything ``job_runner`` does before CAD work starts. Columnar holes
+  are validated column-wise and parsed into one ``ThroughHoleTable``.
+
+It also reports the size and encode time of the compact JSON result
+line with and without the echoed specs (``"echo_specs": false``).
+
+Usage (from the ``drawing-engine`` folder)::
+
+    python -m benchmarks.bench_job_codec
+    python -m benchmarks.bench_job_codec --counts 1000 10000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Tuple
+
+from scanmaster_drawing_engine.geometry_engine import SolidSpec
+from scanmaster_drawing_engine.job_codec import compact_operations, pack, unpack
+from scanmaster_drawing_engine.spec_parsing import solid_spec_from_dict
+from scanmaster_drawing_engine.validation import ensure_valid_job
+
+from benchmarks.bench_fused_cuts import hole_grid_spec
+
+
+def job_for(spec: SolidSpec) -> Dict[str, Any]:
+    """Return the JSON job dict that Node would send for ``spec``."""
+
+    operations = [{"type": type(op).__name__, **asdict(op)} for op in spec.operations]
+    return {
+        "job_id": spec.id,
+        "solid": {"id": spec.id, "operations": operations},
+        "output_step": f"out/{spec.id}.step",
+    }
+
+
+def _columnar(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {**job, "solid": compact_operations(job["solid"])}
+
+
+Encoder = Callable[[Dict[str, Any]], bytes]
+Decoder = Callable[[bytes], Any]
+
+FORMATS: Dict[str, Tuple[Encoder, Decoder]] = {
+    "json_pretty": (
+        lambda job: json.dumps(job, indent=2).encode("utf8"),
+        json.loads,
+    ),
+    "json": (
+        lambda job: json.dumps(job, separators=(",", ":")).encode("utf8"),
+        json.loads,
+    ),
+    "json_columnar": (
+        lambda job: json.dumps(_columnar(job), separators=(",", ":")).encode("utf8"),
+        json.loads,
+    ),
+    "msgpack": (pack, unpack),
+    "msgpack_columnar": (lambda job: pack(_columnar(job)), unpack),
+}
+
+
+def _prepare(decode: Callable[[bytes], Any], data: bytes) -> SolidSpec:
+    job = decode(data)
+    ensure_valid_job(job)
+    return solid_spec_from_dict(job["solid"])
+
+
+def _best(func: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for count in args.counts:
+        spec = hole_grid_spec(count)
+        job = job_for(spec)
+        print(f"\n{count} holes")
+        print(f"{'format':<17} {'bytes':>10} {'decode_s':>9} {'prepare_s':>10}")
+        for name, (encode, decode) in FORMATS.items():
+            data = encode(job)
+            t_decode = _best(lambda: decode(data), args.repeat)
+            t_prepare = _best(lambda: _prepare(decode, data), args.repeat)
+            print(f"{name:<17} {len(data):>10} {t_decode:>9.4f} {t_prepare:>10.4f}")
+
+        print(f"\n{'result':<17} {'bytes':>10} {'encode_s':>9}")
+        for name, echo in (("echo_specs", True), ("no_echo", False)):
+
+            def encode_result() -> str:
+                result: Dict[str, Any] = {"output_step": job["output_step"]}
+                if echo:
+                    result["solid"] = asdict(spec)
+                return json.dumps(result, separators=(",", ":"))
+
+            t_result = _best(encode_result, args.repeat)
+            print(f"{name:<17} {len(encode_result()):>10} {t_result:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
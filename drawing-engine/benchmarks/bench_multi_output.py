@@ -0,0 +1,88 @@
+"""Benchmark: one solid build for many artifacts vs one build per artifact.
+
+Exports a hole-grid block (see :mod:`benchmarks.bench_fused_cuts`) to
+STEP, STL, BREP and a PNG thumbnail three ways:
+
+* ``separate``  one uncached build per format, as when every artifact
+  is requested by its own job or process,
+* ``shared``    one build, the exports one after the other,
+* ``threaded``  one build, the exports on ``--threads`` threads
+  (:func:`~scanmaster_drawing_engine.exporters.export_geometry`).
+
+The threads only overlap where the OCP bindings release the GIL, so
+``threaded`` depends on the build and on the cores of the machine.
+
+Usage (from the ``drawing-engine`` folder)::
+
+    python -m benchmarks.bench_multi_output
+    python -m benchmarks.bench_multi_output --counts 100 400 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from scanmaster_drawing_engine.exporters import GEOMETRY_FORMATS, export_geometry
+from scanmaster_drawing_engine.geometry_engine import GeometryEngine, SolidSpec
+
+from benchmarks.bench_fused_cuts import hole_grid_spec
+
+
+def _best(func: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _separate(spec: SolidSpec, outputs: Dict[str, str]) -> None:
+    for fmt, path in outputs.items():
+        solid = GeometryEngine().build_solid(spec)
+        export_geometry(solid, {fmt: path})
+
+
+def _shared(spec: SolidSpec, outputs: Dict[str, str], threads: int) -> None:
+    solid = GeometryEngine().build_solid(spec)
+    export_geometry(solid, outputs, max_workers=threads)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[25, 100])
+    parser.add_argument("--threads", type=int, default=len(GEOMETRY_FORMATS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = {fmt: str(Path(tmp) / f"part.{fmt}") for fmt in GEOMETRY_FORMATS}
+        # Warm up CadQuery/OCP so the first case does not pay the import.
+        _shared(hole_grid_spec(1), outputs, 1)
+
+        print(f"cpu_count={os.cpu_count()} formats={','.join(GEOMETRY_FORMATS)}")
+        print(f"{'holes':>6} {'mode':>9} {'total_s':>8} {'speedup':>8}")
+        for count in args.counts:
+            spec = hole_grid_spec(count)
+            cases = {
+                "separate": lambda: _separate(spec, outputs),
+                "shared": lambda: _shared(spec, outputs, 1),
+                "threaded": lambda: _shared(spec, outputs, args.threads),
+            }
+            baseline = None
+            for mode, run in cases.items():
+                seconds = _best(run, args.repeat)
+                baseline = baseline or seconds
+                print(
+                    f"{count:>6} {mode:>9} {seconds:>8.3f} {baseline / seconds:>7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
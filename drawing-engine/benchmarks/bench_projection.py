@@ -0,0 +1,86 @@
+"""Benchmark: hidden-line projection per view vs. shared setup vs. cache.
+
+Projects the example solids and a hole-grid block along front, top and
+isometric directions three ways:
+
+* ``per_view``  a fresh HLR setup per direction (what TechDraw does),
+* ``shared``    one HLR setup for all directions (``project_views``),
+* ``cached``    a second ``project_views`` call against a warm
+  :class:`ProjectionCache`, as a later job for the same solid would.
+
+Usage (from the ``drawing-engine`` folder)::
+
+    python -m benchmarks.bench_projection
+    python -m benchmarks.bench_projection --counts 10 100 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from typing import Callable, List
+
+from scanmaster_drawing_engine.drawing_engine import ViewSpec
+from scanmaster_drawing_engine.geometry_engine import GeometryEngine, SolidSpec
+from scanmaster_drawing_engine.projection import ProjectionCache, project_views
+
+from benchmarks.bench_fused_cuts import hole_grid_spec
+
+
+VIEWS = [
+    ViewSpec(id="FRONT", direction=(0.0, -1.0, 0.0)),
+    ViewSpec(id="TOP", direction=(0.0, 0.0, 1.0)),
+    ViewSpec(id="ISO", direction=(1.0, -1.0, 1.0)),
+]
+
+
+def _best(func: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    from examples_calibration_block import calibration_block_solid_spec
+    from examples_full_ring_fig1 import full_ring_solid_spec
+
+    specs: List[SolidSpec] = [full_ring_solid_spec(), calibration_block_solid_spec()]
+    specs += [hole_grid_spec(count) for count in args.counts]
+
+    engine = GeometryEngine()
+    print(
+        f"{'solid':<16} {'per_view_s':>11} {'shared_s':>9} {'cached_s':>9} "
+        f"{'shared_x':>9} {'cached_x':>9}"
+    )
+    for spec in specs:
+        solid = engine.build_solid(spec)
+
+        t_per_view = _best(
+            lambda: [project_views(solid, [view]) for view in VIEWS], args.repeat
+        )
+        t_shared = _best(lambda: project_views(solid, VIEWS), args.repeat)
+
+        cache = ProjectionCache()
+        project_views(solid, VIEWS, cache=cache, shape_key=spec.id)
+        t_cached = _best(
+            lambda: project_views(solid, VIEWS, cache=cache, shape_key=spec.id),
+            args.repeat,
+        )
+
+        print(
+            f"{spec.id:<16} {t_per_view:>11.4f} {t_shared:>9.4f} {t_cached:>9.6f} "
+            f"{t_per_view / t_shared:>8.1f}x {t_per_view / t_cached:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Benchmark: memory and parse time of large specs.
+
+Builds a spec with N through-holes from column data (what a decoded
+job holds) three ways and reports, per layout:
+
+* ``bytes``       Python heap held by the operations (tracemalloc),
+* ``parse_s``     time to build the operations from the columns,
+* ``validate_s``  ``validate_solid_spec`` on the finished spec.
+
+Layouts:
+
+* ``dataclass``  plain ``@dataclass`` objects with a ``__dict__`` (what
+  the spec classes were before they were slotted),
+* ``slotted``    one :class:`ThroughHole` per hole,
+* ``table``      a single :class:`ThroughHoleTable` of NumPy columns.
+
+Usage (from the ``drawing-engine`` folder)::
+
+    python -m benchmarks.bench_spec_memory
+    python -m benchmarks.bench_spec_memory --counts 10000 100000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import math
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from scanmaster_drawing_engine.geometry_engine import (
+    BaseBox,
+    SolidSpec,
+    ThroughHole,
+    ThroughHoleTable,
+    validate_solid_spec,
+)
+
+
+@dataclass
+class _DictThroughHole:
+    radius: float
+    depth: float
+    axis: str = "z"
+    center: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+
+
+def hole_columns(count: int) -> Dict[str, List[Any]]:
+    """Return column data for ``count`` holes on a square grid."""
+
+    per_row = max(1, math.ceil(math.sqrt(count)))
+    return {
+        "radius": [0.5] * count,
+        "depth": [10.0] * count,
+        "center": [
+            [(i % per_row) * 2.0 + 1.0, (i // per_row) * 2.0 + 1.0, 5.0]
+            for i in range(count)
+        ],
+    }
+
+
+def _objects(cls: type, columns: Dict[str, List[Any]]) -> List[Any]:
+    return [
+        cls(
+            radius=float(radius),
+            depth=float(depth),
+            axis="z",
+            center=tuple(float(v) for v in center),
+        )
+        for radius, depth, center in zip(
+            columns["radius"], columns["depth"], columns["center"]
+        )
+    ]
+
+
+def _table(columns: Dict[str, List[Any]]) -> List[Any]:
+    import numpy as np
+
+    return [
+        ThroughHoleTable(
+            radius=np.asarray(columns["radius"], dtype=float),
+            depth=np.asarray(columns["depth"], dtype=float),
+            center=np.asarray(columns["center"], dtype=float),
+        )
+    ]
+
+
+LAYOUTS: Dict[str, Callable[[Dict[str, List[Any]]], List[Any]]] = {
+    "dataclass": lambda columns: _objects(_DictThroughHole, columns),
+    "slotted": lambda columns: _objects(ThroughHole, columns),
+    "table": _table,
+}
+
+
+def _measure(build: Callable[[], List[Any]]) -> Tuple[List[Any], int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    operations = build()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return operations, held
+
+
+def _best(func: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    import numpy  # noqa: F401  - keep the import out of the measurements
+
+    for count in args.counts:
+        columns = hole_columns(count)
+        print(f"\n{count} holes")
+        print(
+            f"{'layout':<10} {'bytes':>12} {'per_op':>7} {'parse_s':>8} "
+            f"{'validate_s':>11}"
+        )
+        for name, build in LAYOUTS.items():
+            operations, held = _measure(lambda: build(columns))
+            t_parse = _best(lambda: build(columns), args.repeat)
+            if name == "dataclass":
+                t_validate = "-"
+            else:
+                base = BaseBox(width=1.0, depth=1.0, height=1.0)
+                spec = SolidSpec(id="bench", operations=[base, *operations])
+                seconds = _best(lambda: validate_solid_spec(spec), args.repeat)
+                t_validate = f"{seconds:.4f}"
+            print(
+                f"{name:<10} {held:>12} {held / count:>7.1f} {t_parse:>8.4f} "
+                f"{t_validate:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark: bounding-box tool pre-pass before the boolean cut.
+
+Builds a hole-grid block whose tool list is padded the way generated
+specs often are: every hole listed twice, a ring of holes outside the
+block, and a slot along the top written as many abutting ``CutBox``
+segments. Times ``GeometryEngine.build_solid`` with
+``prefilter_tools`` on and off and reports the tools that reached OCCT.
+
+Usage (from the ``drawing-engine`` folder)::
+
+    python -m benchmarks.bench_tool_prefilter
+    python -m benchmarks.bench_tool_prefilter --counts 100 400 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from typing import Any, Dict, List, Tuple
+
+from scanmaster_drawing_engine.geometry_engine import (
+    CutBox,
+    GeometryEngine,
+    SolidSpec,
+    ThroughHole,
+)
+from scanmaster_drawing_engine.instrumentation import Timings
+
+from benchmarks.bench_fused_cuts import BLOCK_HEIGHT, HOLE_PITCH, hole_grid_spec
+
+
+def padded_spec(count: int) -> SolidSpec:
+    """Return :func:`hole_grid_spec` plus duplicate, stray and slot tools."""
+
+    spec = hole_grid_spec(count)
+    base, *holes = spec.operations
+    width = base.width  # type: ignore[union-attr]
+    segments = max(1, int(width // HOLE_PITCH))
+    slot = [
+        CutBox(
+            width=HOLE_PITCH,
+            depth=1.0,
+            height=1.0,
+            center=((i + 0.5) * HOLE_PITCH, 0.5, BLOCK_HEIGHT - 0.5),
+        )
+        for i in range(segments)
+    ]
+    strays = [
+        ThroughHole(
+            radius=1.0,
+            depth=BLOCK_HEIGHT,
+            axis="z",
+            center=(-10.0 - 4.0 * i, -10.0, BLOCK_HEIGHT / 2),
+        )
+        for i in range(count // 4)
+    ]
+    return SolidSpec(
+        id=f"padded-{count}", operations=[base, *holes, *holes, *strays, *slot]
+    )
+
+
+def _build(
+    engine: GeometryEngine, spec: SolidSpec, repeat: int
+) -> Tuple[float, Dict[str, Any]]:
+    best = math.inf
+    meta: Dict[str, Any] = {}
+    for _ in range(repeat):
+        timings = Timings()
+        start = time.perf_counter()
+        with timings.activate():
+            engine.build_solid(spec)
+        best = min(best, time.perf_counter() - start)
+        meta = next(r.meta for r in timings.records if r.name == "geometry.tools")
+    return best, meta
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 400])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    plain = GeometryEngine(prefilter_tools=False)
+    filtered = GeometryEngine(prefilter_tools=True)
+
+    print(
+        f"{'holes':>6} {'tools':>6} {'cut':>5} {'plain_s':>8} {'prefilter_s':>12} "
+        f"{'speedup':>8}"
+    )
+    for count in args.counts:
+        spec = padded_spec(count)
+        t_plain, plain_meta = _build(plain, spec, args.repeat)
+        t_filtered, meta = _build(filtered, spec, args.repeat)
+        print(
+            f"{count:>6} {plain_meta['tools']:>6} {meta['tools']:>5} {t_plain:>8.3f} "
+            f"{t_filtered:>12.3f} {t_plain / t_filtered:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
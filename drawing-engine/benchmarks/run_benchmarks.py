@@ -0,0 +1,334 @@
+"""Benchmark suite for GeometryEngine and the drawing pipeline.
+
+Runs a fixed set of cases – the example specs plus synthetic stress
+specs – and records, per case:
+
+* ``build_s``         best-of-N ``GeometryEngine.build_solid`` wall time
+* ``peak_rss_delta``  growth of the peak RSS while building (bytes)
+* ``python_peak``     peak Python heap allocation (tracemalloc, bytes)
+* ``boolean_ops``     number of OCCT cut operations performed
+* ``tools``           number of tool bodies subtracted
+* ``step_bytes`` / ``stl_bytes`` / ``brep_bytes``  export sizes
+* ``drawing_s`` / ``pdf_bytes``  FreeCAD/TechDraw stage, only when
+  ``FREECAD_PATH`` and ``TECHDRAW_TEMPLATE_PATH`` are set and FreeCAD
+  imports; otherwise it is skipped automatically.
+
+Each case runs in a fresh worker process so memory figures are not
+polluted by earlier cases.
+
+Usage (from the ``drawing-engine`` folder)::
+
+    # Compare against benchmarks/baseline.json, exit 1 on regression
+    python -m benchmarks.run_benchmarks
+
+    # Re-record the baseline on this machine
+    python -m benchmarks.run_benchmarks --update-baseline
+
+    # Only some cases, results also written to a file
+    python -m benchmarks.run_benchmarks --cases ring block --output out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from scanmaster_drawing_engine.geometry_engine import (
+    BaseBox,
+    CutBox,
+    GeometryEngine,
+    HoleArray,
+    SolidSpec,
+)
+from scanmaster_drawing_engine.instrumentation import Timings
+from scanmaster_drawing_engine.process_stats import current_rss_bytes, peak_rss_bytes
+
+from benchmarks.bench_fused_cuts import hole_grid_spec
+
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+#: Relative increase tolerated before a metric counts as a regression.
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    "build_s": 0.30,
+    "drawing_s": 0.30,
+    "peak_rss_delta": 0.30,
+    "python_peak": 0.30,
+    "boolean_ops": 0.0,
+    "step_bytes": 0.10,
+    "stl_bytes": 0.10,
+    "brep_bytes": 0.10,
+    "pdf_bytes": 0.10,
+}
+
+# Differences below these absolute amounts are ignored, so that tiny
+# cases do not flap on timer or allocator noise.
+_ABSOLUTE_SLACK: Dict[str, float] = {
+    "build_s": 0.02,
+    "drawing_s": 0.05,
+    "peak_rss_delta": 4 * 2**20,
+    "python_peak": 256 * 2**10,
+}
+
+
+# ----- Cases ---------------------------------------------------------------------
+
+
+def _ring_case() -> SolidSpec:
+    from examples_full_ring_fig1 import full_ring_solid_spec
+
+    return full_ring_solid_spec()
+
+
+def _block_case() -> SolidSpec:
+    from examples_calibration_block import calibration_block_solid_spec
+
+    return calibration_block_solid_spec()
+
+
+def _notched_block_case(notches: int = 40) -> SolidSpec:
+    """A long block with ``notches`` rectangular notches along its top."""
+
+    pitch = 6.0
+    length = notches * pitch
+    return SolidSpec(
+        id=f"notched-block-{notches}",
+        operations=[
+            BaseBox(width=length, depth=30.0, height=20.0, centered_xy=False),
+            *[
+                CutBox(
+                    width=2.0,
+                    depth=30.0,
+                    height=4.0,
+                    center=((i + 0.5) * pitch, 15.0, 19.0),
+                )
+                for i in range(notches)
+            ],
+        ],
+    )
+
+
+def _fbh_ladder_case() -> SolidSpec:
+    """A 20 x 10 grid of side-drilled holes expressed as one HoleArray."""
+
+    return SolidSpec(
+        id="sdh-grid-200",
+        operations=[
+            BaseBox(width=100.0, depth=50.0, height=30.0, centered_xy=False),
+            HoleArray(
+                radius=1.0,
+                depth=100.0,
+                count=10,
+                rows=20,
+                layout="grid",
+                axis="x",
+                origin=(50.0, 2.5, 2.0),
+                pitch=(0.0, 0.0, 2.8),
+                row_pitch=(0.0, 2.4, 0.0),
+            ),
+        ],
+    )
+
+
+CASES: Dict[str, Callable[[], SolidSpec]] = {
+    "ring": _ring_case,
+    "block": _block_case,
+    "holes_100": lambda: hole_grid_spec(100),
+    "notches_40": _notched_block_case,
+    "sdh_grid_200": _fbh_ladder_case,
+}
+
+
+# ----- Measurement -----------------------------------------------------------------
+
+
+def _freecad_available() -> Optional[str]:
+    """Return ``None`` if the drawing stage can run, else a skip reason."""
+
+    if not os.environ.get("FREECAD_PATH"):
+        return "FREECAD_PATH not set"
+    if not os.environ.get("TECHDRAW_TEMPLATE_PATH"):
+        return "TECHDRAW_TEMPLATE_PATH not set"
+    try:
+        from scanmaster_drawing_engine.drawing_engine import _import_freecad
+
+        _import_freecad()
+    except Exception as exc:  # pragma: no cover - depends on local install
+        return f"FreeCAD import failed: {exc}"
+    return None
+
+
+def _measure_drawing(solid: Any, out_dir: Path, metrics: Dict[str, Any]) -> None:
+    from scanmaster_drawing_engine.drawing_engine import (
+        DrawingSpec,
+        ViewSpec,
+        generate_drawing,
+    )
+
+    spec = DrawingSpec(
+        page_title="BENCH",
+        template_path=os.environ["TECHDRAW_TEMPLATE_PATH"],
+        views=[
+            ViewSpec(id="FRONT", direction=(0.0, -1.0, 0.0)),
+            ViewSpec(id="TOP", direction=(0.0, 0.0, 1.0)),
+            ViewSpec(id="ISO", direction=(1.0, -1.0, 1.0)),
+        ],
+        dimensions=[],
+    )
+    pdf_path = out_dir / "bench.pdf"
+    start = time.perf_counter()
+    generate_drawing(solid, spec, str(pdf_path))
+    metrics["drawing_s"] = time.perf_counter() - start
+    metrics["pdf_bytes"] = pdf_path.stat().st_size
+
+
+def measure_case(name: str, repeat: int) -> Dict[str, Any]:
+    """Measure one case. Runs inside a dedicated worker process."""
+
+    from scanmaster_drawing_engine.exporters import export_geometry
+
+    spec = CASES[name]()
+    engine = GeometryEngine()
+    # CadQuery/OCP are imported on the first build; do that outside the
+    # memory window so it measures the case, not the imports.
+    GeometryEngine().build_solid(
+        SolidSpec(id="warmup", operations=[BaseBox(width=1.0, depth=1.0, height=1.0)])
+    )
+
+    rss_before = current_rss_bytes() or 0
+    tracemalloc.start()
+    timings = Timings()
+    with timings.activate():
+        solid = engine.build_solid(spec)
+    python_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    peak_after = peak_rss_bytes() or 0
+
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.build_solid(spec)
+        best = min(best, time.perf_counter() - start)
+
+    cut_records = [r for r in timings.records if r.name == "geometry.cut"]
+    metrics: Dict[str, Any] = {
+        "operations": len(spec.operations),
+        "build_s": best,
+        "peak_rss_delta": max(peak_after - rss_before, 0),
+        "python_peak": python_peak,
+        "boolean_ops": len(cut_records),
+        "tools": sum(int(r.meta.get("tools", 0)) for r in cut_records),
+    }
+
+    with tempfile.TemporaryDirectory(prefix="scanmaster-bench-") as tmp:
+        out_dir = Path(tmp)
+        outputs = {fmt: str(out_dir / f"bench.{fmt}") for fmt in ("step", "stl", "brep")}
+        export_geometry(solid, outputs)
+        for fmt, path in outputs.items():
+            metrics[f"{fmt}_bytes"] = Path(path).stat().st_size
+
+        skip_reason = _freecad_available()
+        if skip_reason is None:
+            _measure_drawing(solid, out_dir, metrics)
+        else:
+            metrics["drawing_skipped"] = skip_reason
+
+    return metrics
+
+
+def run_cases(names: List[str], repeat: int) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        # One fresh process per case keeps peak-memory figures honest.
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+            results[name] = pool.submit(measure_case, name, repeat).result()
+        print(f"  {name:<14} build {results[name]['build_s']:.3f}s", file=sys.stderr)
+    return results
+
+
+# ----- Baseline comparison -----------------------------------------------------------
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    thresholds: Dict[str, float],
+) -> List[Dict[str, Any]]:
+    """Return one entry per metric that regressed beyond its threshold."""
+
+    regressions: List[Dict[str, Any]] = []
+    base_cases: Dict[str, Dict[str, Any]] = baseline.get("cases", {})
+
+    for name, metrics in results.items():
+        base = base_cases.get(name)
+        if base is None:
+            continue
+        for metric, limit in thresholds.items():
+            if metric not in metrics or metric not in base:
+                continue
+            current, previous = float(metrics[metric]), float(base[metric])
+            allowed = previous * (1.0 + limit) + _ABSOLUTE_SLACK.get(metric, 0.0)
+            if current > allowed:
+                regressions.append(
+                    {
+                        "case": name,
+                        "metric": metric,
+                        "baseline": previous,
+                        "current": current,
+                        "threshold": limit,
+                    }
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="ScanMaster drawing engine benchmarks")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="Build repetitions per case")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results as the new baseline instead of comparing",
+    )
+    parser.add_argument("--output", help="Also write the results JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = run_cases(args.cases, args.repeat)
+    report: Dict[str, Any] = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "cases": results,
+    }
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = {**report, "thresholds": DEFAULT_THRESHOLDS}
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf8")
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+    elif baseline_path.is_file():
+        baseline = json.loads(baseline_path.read_text(encoding="utf8"))
+        thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+        report["regressions"] = compare(results, baseline, thresholds)
+    else:
+        print(f"No baseline at {baseline_path}; nothing to compare", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf8")
+    print(text)
+
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,121 +17,392 @@ The idea is simple:
 This is what gives you the "מנוע גנרי שמתאים לכל צורה" בעולם האמיתי.
 """
 
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import io
 import json
+import os
+import socket
+import socketserver
 import sys
-from dataclasses import asdict
+import time
+import traceback
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
-
-import cadquery as cq
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+)
 
 from scanmaster_drawing_engine.geometry_engine import (
+    BooleanOptions,
+    CutBoxTable,
     GeometryEngine,
     SolidSpec,
-    SketchCircle,
-    Extrude,
-    BaseBox,
-    CutBox,
-    ThroughHole,
+    ThroughHoleTable,
+    configure_occt_threads,
+    occt_threads_from_env,
 )
 from scanmaster_drawing_engine.drawing_engine import (
     DrawingSpec,
-    ViewSpec,
-    DimensionSpec,
+    DocumentSession,
+    _ensure_freecad_on_path,
     generate_drawing,
 )
+from scanmaster_drawing_engine.spec_parsing import (
+    boolean_options_from_dict,
+    drawing_spec_from_dict,
+    solid_spec_from_dict,
+)
+from scanmaster_drawing_engine.job_codec import (
+    WIRE_FORMATS,
+    expand_outputs,
+    iter_unpack,
+    pack,
+)
+from scanmaster_drawing_engine.parametric import (
+    ParametricTemplate,
+    instantiate_row,
+    read_parameter_table,
+)
+from scanmaster_drawing_engine.solid_cache import SolidCache, solid_spec_key
+from scanmaster_drawing_engine.projection import ProjectionCache, project_views
+from scanmaster_drawing_engine.svg_backend import generate_svg_drawing
+from scanmaster_drawing_engine.artifact_cache import ArtifactStore, job_fingerprint
+from scanmaster_drawing_engine.instrumentation import Timings, stage
+from scanmaster_drawing_engine.validation import (
+    JobValidationError,
+    ensure_valid_job,
+    validate_job,
+)
+from scanmaster_drawing_engine.exporters import (
+    DEFAULT_STL_ANGULAR_TOLERANCE,
+    DEFAULT_STL_TOLERANCE,
+    DEFAULT_THUMBNAIL_SIZE,
+    GEOMETRY_FORMATS,
+    submit_geometry_exports,
+)
 
 
-# ----- JSON → Python spec helpers ----------------------------------------------
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import cadquery as cq
 
+# Heavy dependencies (CadQuery/OCP, FreeCAD) are only imported once a job
+# actually builds or draws something, so invalid jobs fail fast and the
+# worker modes can decide when to pay the import cost (see _warm_up).
+
+
+# ----- Job runner --------------------------------------------------------------
 
-def _solid_spec_from_dict(data: Dict[str, Any]) -> SolidSpec:
-    ops: List[Any] = []
-    for op in data.get("operations", []):
-        op_type = op.get("type")
-        if op_type == "SketchCircle":
-            ops.append(
-                SketchCircle(
-                    radius=float(op["radius"]),
-                    is_hole=bool(op.get("is_hole", False)),
-                )
-            )
-        elif op_type == "Extrude":
-            ops.append(Extrude(length=float(op["length"])))
-        elif op_type == "BaseBox":
-            ops.append(
-                BaseBox(
-                    width=float(op["width"]),
-                    depth=float(op["depth"]),
-                    height=float(op["height"]),
-                    centered_xy=bool(op.get("centered_xy", True)),
-                    centered_z=bool(op.get("centered_z", False)),
-                )
-            )
-        elif op_type == "CutBox":
-            ops.append(
-                CutBox(
-                    width=float(op["width"]),
-                    depth=float(op["depth"]),
-                    height=float(op["height"]),
-                    center=tuple(float(v) for v in op["center"]),
-                )
-            )
-        elif op_type == "ThroughHole":
-            ops.append(
-                ThroughHole(
-                    radius=float(op["radius"]),
-                    depth=float(op["depth"]),
-                    axis=str(op.get("axis", "z")),
-                    center=tuple(float(v) for v in op.get("center", [0.0, 0.0, 0.0])),
-                )
-            )
-        else:
-            raise ValueError(f"Unsupported operation type in JSON: {op_type!r}")
 
-    return SolidSpec(id=str(data["id"]), operations=ops)
+# One engine per process so that a long-lived worker keeps its solid
+# cache warm across jobs. Configured via SCANMASTER_SOLID_CACHE_MB /
+# SCANMASTER_SOLID_CACHE_DIR (see SolidCache.from_env). The base-solid
+# cache (SCANMASTER_BASE_CACHE_ENTRIES) lets variants that only differ in
+# their cuts share one base solid; the prefix cache
+# (SCANMASTER_PREFIX_CACHE_ENTRIES) serves "incremental" editor jobs.
+# OCCT boolean defaults come from SCANMASTER_BOOLEAN_* (see
+# BooleanOptions.from_env); jobs may override them with "boolean". The
+# process-wide OCCT thread pool is sized once from
+# SCANMASTER_BOOLEAN_THREADS, before any job runs.
+configure_occt_threads(occt_threads_from_env())
+_ENGINE = GeometryEngine(
+    cache=SolidCache.from_env(),
+    base_cache_entries=int(os.environ.get("SCANMASTER_BASE_CACHE_ENTRIES", "16")),
+    prefix_cache_entries=int(os.environ.get("SCANMASTER_PREFIX_CACHE_ENTRIES", "64")),
+    boolean=BooleanOptions.from_env(),
+)
+
+# Whole-job artifact store (SCANMASTER_ARTIFACT_CACHE_DIR). Identical
+# jobs are served from here without touching CadQuery or FreeCAD.
+_ARTIFACTS = ArtifactStore.from_env()
+
+# Hidden-line projections shared by every view and job of this process
+# (SCANMASTER_PROJECTION_CACHE_ENTRIES, see ProjectionCache.from_env).
+_PROJECTIONS = ProjectionCache.from_env()
+
+# One FreeCAD document per process, cleared after every job and
+# recycled every SCANMASTER_DOC_RECYCLE_JOBS jobs.
+_DOCUMENTS = DocumentSession(
+    recycle_after=int(os.environ.get("SCANMASTER_DOC_RECYCLE_JOBS", "100"))
+)
+
+# Threads writing STEP/STL/BREP/PNG exports while the drawing renders
+# (SCANMASTER_EXPORT_THREADS, default CPU count); 1 exports serially.
+_EXPORT_THREADS = int(
+    os.environ.get("SCANMASTER_EXPORT_THREADS") or os.cpu_count() or 1
+)
+
+
+@dataclass
+class _JobState:
+    """One job travelling through the prepare → build → render stages."""
+
+    job: Any
+    job_id: Any = None
+    wall_start: float = field(default_factory=time.perf_counter)
+    cpu_start: float = field(default_factory=time.process_time)
+    solid_spec: Optional[SolidSpec] = None
+    drawing_spec: Optional[DrawingSpec] = None
+    # Per-job OCCT boolean settings ("boolean"); None: engine defaults.
+    boolean: Optional[BooleanOptions] = None
+    # "techdraw" (FreeCAD) or "svg" (OCCT projection, no FreeCAD).
+    backend: str = "techdraw"
+    output_pdf: Optional[str] = None
+    output_svg: Optional[str] = None
+    geometry_outputs: Dict[str, str] = field(default_factory=dict)
+    fingerprint: Optional[str] = None
+    solid: Optional[cq.Workplane] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+    timings: Timings = field(default_factory=Timings)
+    # The drawing was served from the artifact store.
+    drawing_cached: bool = False
+    # Set once all outputs exist; later stages then skip the job.
+    done: bool = False
+    error: Optional[BaseException] = None
+
+
+def _prepare_job(state: _JobState) -> None:
+    """Validate the job, parse specs, resolve output paths and consult the
+    artifact store.
+
+    Validation runs first and reports every problem of the job at once
+    (see :func:`~scanmaster_drawing_engine.validation.validate_job`), so
+    a bad request fails before any CAD work.
+    """
 
+    job = state.job
+    if isinstance(job, dict) and "outputs" in job:
+        # The "outputs" list becomes the flat output_<format> keys.
+        with stage("job.expand_outputs"):
+            job = state.job = dict(job)
+            expand_outputs(job)
+    with stage("job.validate"):
+        ensure_valid_job(job)
 
-def _drawing_spec_from_dict(data: Dict[str, Any]) -> DrawingSpec:
-    views: List[ViewSpec] = []
-    for v in data.get("views", []):
-        direction = tuple(float(c) for c in v["direction"])
-        section_normal_raw = v.get("section_normal")
-        section_normal = (
-            tuple(float(c) for c in section_normal_raw)
-            if section_normal_raw is not None
-            else None
+    # Hole and cut-box columns map straight onto operation tables.
+    state.solid_spec = solid_spec_from_dict(job["solid"])
+    if job.get("drawing") is not None:
+        state.drawing_spec = drawing_spec_from_dict(job["drawing"])
+    if job.get("boolean") is not None:
+        state.boolean = boolean_options_from_dict(job["boolean"], _ENGINE.boolean)
+
+    state.geometry_outputs = {
+        fmt: str(Path(job[f"output_{fmt}"]).resolve())
+        for fmt in GEOMETRY_FORMATS
+        if job.get(f"output_{fmt}")
+    }
+
+    if state.drawing_spec is not None:
+        state.backend = job.get("backend", "techdraw")
+        # The SVG backend may produce an SVG only; TechDraw always needs
+        # output_pdf (enforced by validation).
+        for attr in ("output_pdf", "output_svg"):
+            raw = job.get(attr)
+            if raw:
+                path = Path(raw).resolve()
+                path.parent.mkdir(parents=True, exist_ok=True)
+                setattr(state, attr, str(path))
+
+    state.result = {"output_pdf": state.output_pdf, "output_svg": state.output_svg}
+    if job.get("echo_specs", True):
+        # Large specs make this the bulk of the result; clients that
+        # already hold the job send "echo_specs": false.
+        state.result["solid"] = _solid_echo(state.solid_spec)
+        state.result["drawing"] = (
+            asdict(state.drawing_spec) if state.drawing_spec else None
         )
-        views.append(
-            ViewSpec(
-                id=str(v["id"]),
-                direction=direction,
-                is_section=bool(v.get("is_section", False)),
-                section_normal=section_normal,
-                scale=float(v["scale"]) if v.get("scale") is not None else None,
+    for fmt, path in state.geometry_outputs.items():
+        state.result[f"output_{fmt}"] = path
+
+    store = _ARTIFACTS if job.get("use_cache", True) else None
+    if store is None or state.drawing_spec is None or state.output_pdf is None:
+        return
+
+    with_svg = state.output_svg is not None
+    state.fingerprint = job_fingerprint(
+        state.solid_spec,
+        state.drawing_spec,
+        with_svg,
+        backend=state.backend,
+        boolean=(state.boolean or _ENGINE.boolean).result_key(),
+    )
+    entry = store.lookup(state.fingerprint, with_svg=with_svg)
+    if entry is not None:
+        assert state.output_pdf is not None
+        store.materialise(entry, state.output_pdf, state.output_svg)
+        elapsed = time.perf_counter() - state.wall_start
+        state.result["cache_hit"] = True
+        state.result["time_saved_s"] = round(max(entry.elapsed_s - elapsed, 0.0), 6)
+        state.drawing_cached = True
+        # Geometry exports still need the solid.
+        state.done = not state.geometry_outputs
+
+
+def _solid_echo(spec: SolidSpec) -> Dict[str, Any]:
+    """``asdict(spec)`` with operation tables listed row by row."""
+
+    operations: List[Any] = []
+    for op in spec.operations:
+        if isinstance(op, (ThroughHoleTable, CutBoxTable)):
+            operations.extend(asdict(row) for row in op.rows())
+        else:
+            operations.append(asdict(op))
+    return {"id": spec.id, "operations": operations}
+
+
+def _build_job(state: _JobState) -> None:
+    """Build the CadQuery solid for the job.
+
+    ``"incremental": true`` (sent by the interactive editor) rebuilds
+    through the engine's operation-prefix cache and reports how many
+    operations were reused in ``result["rebuild"]``.
+    """
+
+    assert state.solid_spec is not None
+    if state.job.get("incremental"):
+        rebuilt = _ENGINE.rebuild(state.solid_spec, state.boolean)
+        state.solid = rebuilt.solid
+        state.result["rebuild"] = rebuilt.report()
+    else:
+        state.solid = _ENGINE.build_solid(state.solid_spec, state.boolean)
+
+
+def _shape_key(state: _JobState) -> str:
+    """Projection cache key of the job's solid (spec plus boolean options)."""
+
+    assert state.solid_spec is not None
+    key = solid_spec_key(state.solid_spec)
+    result_key = (state.boolean or _ENGINE.boolean).result_key()
+    return f"{key}:{result_key}" if result_key else key
+
+
+def _render_job(state: _JobState) -> None:
+    """Write geometry exports and draw/export the TechDraw page.
+
+    The geometry exports share no FreeCAD state with the drawing, so they
+    run on a thread pool while the page is drawn on this thread.
+    Geometry-only jobs (no ``drawing``) never import FreeCAD.
+    """
+
+    assert state.solid is not None
+
+    draw = state.drawing_spec is not None and not state.drawing_cached
+    pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    exports: Dict[str, concurrent.futures.Future] = {}
+    if state.geometry_outputs:
+        job = state.job
+        # The drawing counts as one more concurrent task.
+        if _EXPORT_THREADS > 1 and len(state.geometry_outputs) + int(draw) > 1:
+            pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(_EXPORT_THREADS, len(state.geometry_outputs)),
+                thread_name_prefix="export",
             )
+        exports = submit_geometry_exports(
+            pool,
+            state.solid,
+            state.geometry_outputs,
+            stl_tolerance=float(job.get("stl_tolerance", DEFAULT_STL_TOLERANCE)),
+            stl_angular_tolerance=float(
+                job.get("stl_angular_tolerance", DEFAULT_STL_ANGULAR_TOLERANCE)
+            ),
+            thumbnail_size=int(job.get("thumbnail_size", DEFAULT_THUMBNAIL_SIZE)),
+            projections=_PROJECTIONS,
+            shape_key=_shape_key(state),
         )
 
-    dims: List[DimensionSpec] = []
-    for d in data.get("dimensions", []):
-        dims.append(
-            DimensionSpec(
-                view_id=str(d["view_id"]),
-                kind=str(d["kind"]),
-                label=str(d["label"]),
-                edges=[str(e) for e in d.get("edges", [])],
-            )
+    try:
+        if draw:
+            _draw_job(state)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+    for future in exports.values():
+        future.result()
+
+    # The solid is not needed any more; do not keep it alive while the
+    # result travels on.
+    state.solid = None
+
+    if _ENGINE.cache is not None:
+        state.result["solid_cache"] = _ENGINE.cache.stats()
+
+
+def _draw_job(state: _JobState) -> None:
+    """Draw the page with the job's backend and store it as an artifact."""
+
+    assert state.solid is not None and state.drawing_spec is not None
+    if state.backend == "svg":
+        assert state.solid_spec is not None
+        projections = generate_svg_drawing(
+            solid=state.solid,
+            spec=state.drawing_spec,
+            output_svg=state.output_svg,
+            output_pdf=state.output_pdf,
+            projections=_PROJECTIONS,
+            shape_key=_shape_key(state),
+        )
+        state.result["views"] = [p.report() for p in projections]
+        if _PROJECTIONS is not None:
+            state.result["projection_cache"] = _PROJECTIONS.stats()
+    else:
+        assert state.output_pdf is not None
+        if state.job.get("project_views"):
+            _project_job_views(state)
+        generate_drawing(
+            solid=state.solid,
+            spec=state.drawing_spec,
+            output_pdf=state.output_pdf,
+            output_svg=state.output_svg,
+            session=_DOCUMENTS,
         )
 
-    return DrawingSpec(
-        page_title=str(data["page_title"]),
-        template_path=str(data["template_path"]),
-        views=views,
-        dimensions=dims,
-    )
+    if state.fingerprint is not None and _ARTIFACTS is not None:
+        assert state.output_pdf is not None
+        _ARTIFACTS.store(
+            state.fingerprint,
+            state.output_pdf,
+            state.output_svg,
+            elapsed_s=time.perf_counter() - state.wall_start,
+        )
+        state.result["cache_hit"] = False
+        state.result["time_saved_s"] = 0.0
 
 
-# ----- Job runner --------------------------------------------------------------
+def _project_job_views(state: _JobState) -> None:
+    """Run OCCT hidden-line projection for every view of the drawing.
+
+    All views share one HLR setup and, with ``_PROJECTIONS`` enabled,
+    directions already projected for the same solid (by content) are
+    served from the cache. The per-view report lands in
+    ``result["views"]``.
+    """
+
+    assert state.solid is not None and state.drawing_spec is not None
+    assert state.solid_spec is not None
+
+    with stage("projection"):
+        projections = project_views(
+            state.solid,
+            state.drawing_spec.views,
+            cache=_PROJECTIONS,
+            shape_key=_shape_key(state),
+        )
+    state.result["views"] = [p.report() for p in projections]
+    if _PROJECTIONS is not None:
+        state.result["projection_cache"] = _PROJECTIONS.stats()
 
 
 def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
@@ -143,36 +414,537 @@ def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
           "solid": { ...SolidSpec-like... },
           "drawing": { ...DrawingSpec-like... },
           "output_pdf": "path/to/file.pdf",
-          "output_svg": "optional/path/to/file.svg"  # optional
+          "output_svg": "optional/path/to/file.svg",  # optional
+          "use_cache": true,                            # optional
+          "project_views": false,                       # optional
+          "incremental": false,                         # optional
+          "echo_specs": true,                           # optional
+          "boolean": {"parallel": true, "fuzzy": 0.0},  # optional
+          "backend": "techdraw"                         # or "svg"
         }
 
-    Returns a small result dict with the resolved output paths.
+    ``drawing`` (and ``output_pdf``) may be omitted for geometry-only
+    jobs, which skip FreeCAD entirely. Any job can additionally request
+    ``output_step``, ``output_stl``, ``output_brep`` and/or
+    ``output_png`` (an isometric thumbnail, ``thumbnail_size`` pixels
+    square); STL tessellation is controlled by ``stl_tolerance`` and
+    ``stl_angular_tolerance``. These exports run on threads
+    (``SCANMASTER_EXPORT_THREADS``) while the drawing is rendered.
+
+    Instead of the ``output_*`` keys a job may send an ``outputs`` list,
+    e.g. ``[{"format": "pdf", "path": "a.pdf"}, {"format": "png", "path":
+    "a.png", "size": 128}]`` (see
+    :func:`~scanmaster_drawing_engine.job_codec.expand_outputs`); every
+    listed artifact comes from the one solid build.
+
+    ``"backend": "svg"`` renders the drawing with the FreeCAD-free SVG
+    backend (:mod:`scanmaster_drawing_engine.svg_backend`); there
+    ``output_pdf`` is optional (it needs ``cairosvg``) and ``output_svg``
+    alone is enough.
+
+    ``project_views`` additionally runs OCCT hidden-line projection for
+    every drawing view (see :mod:`scanmaster_drawing_engine.projection`)
+    and reports per view whether it came from the projection cache.
+
+    ``solid.columns`` may hold repeated operations in columnar form (see
+    :mod:`scanmaster_drawing_engine.job_codec`); ``"echo_specs": false``
+    leaves the parsed ``solid``/``drawing`` out of the result.
+
+    ``incremental`` rebuilds the solid through the operation-prefix
+    cache, replaying only the operations after the first edited one.
+
+    ``boolean`` overrides the engine's OCCT boolean settings for this
+    job, e.g. ``{"parallel": true, "fuzzy": 1e-5, "glue": "off"}`` (see
+    :class:`~scanmaster_drawing_engine.geometry_engine.BooleanOptions`).
+    The OCCT thread count is per process (``SCANMASTER_BOOLEAN_THREADS``),
+    not per job.
+
+    Returns a small result dict with the resolved output paths. When the
+    artifact store is enabled, ``cache_hit`` tells whether the outputs
+    were served from it and ``time_saved_s`` estimates the rendering
+    time that was skipped.
+    """
+
+    job_id = job.get("job_id") if isinstance(job, dict) else None
+    state = _JobState(job=job, job_id=job_id)
+    with state.timings.activate():
+        with state.timings.stage("prepare"):
+            _prepare_job(state)
+        if not state.done:
+            with state.timings.stage("build"):
+                _build_job(state)
+            with state.timings.stage("render"):
+                _render_job(state)
+    _finish_timings(state)
+    return state.result
+
+
+def _finish_timings(state: _JobState) -> None:
+    """Attach stage timings to the result and emit optional traces.
+
+    * ``trace_file`` in the job (or ``SCANMASTER_TRACE_DIR``) writes a
+      Chrome trace-event file for offline profiling.
+    * ``SCANMASTER_TIMINGS_LOG=1`` writes one structured JSON log line
+      per job to stderr.
     """
 
-    solid_spec = _solid_spec_from_dict(job["solid"])
-    drawing_spec = _drawing_spec_from_dict(job["drawing"])
+    timings = state.timings.to_dict()
+    state.result["timings"] = timings
+
+    job = state.job if isinstance(state.job, dict) else {}
+    trace_file = job.get("trace_file")
+    trace_dir = os.environ.get("SCANMASTER_TRACE_DIR")
+    if not trace_file and trace_dir:
+        name = state.job_id if state.job_id is not None else f"{os.getpid()}-{id(state)}"
+        trace_file = str(Path(trace_dir) / f"{name}.trace.json")
+    if trace_file:
+        state.timings.write_chrome_trace(str(trace_file))
+        state.result["trace_file"] = str(trace_file)
+
+    if os.environ.get("SCANMASTER_TIMINGS_LOG") == "1":
+        log_line = {
+            "event": "job_timings",
+            "job_id": state.job_id,
+            "ok": state.error is None,
+            "totals": timings["totals"],
+        }
+        print(json.dumps(log_line, separators=(",", ":")), file=sys.stderr)
 
-    engine = GeometryEngine()
-    solid: cq.Workplane = engine.build_solid(solid_spec)
 
-    output_pdf = Path(job["output_pdf"]).resolve()
-    output_svg_raw = job.get("output_svg")
-    output_svg = str(Path(output_svg_raw).resolve()) if output_svg_raw else None
+# ----- Streaming pipeline ------------------------------------------------------
+
+
+def _parse_lines(lines: Iterable[str]) -> Iterator[_JobState]:
+    """Decode one job per non-empty line, lazily."""
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        state = _JobState(job=None)
+        try:
+            state.job = json.loads(line)
+        except json.JSONDecodeError as exc:
+            state.error = exc
+        else:
+            if isinstance(state.job, dict):
+                state.job_id = state.job.get("job_id")
+        yield state
+
+
+def _stage(
+    states: Iterable[_JobState], name: str, func: Callable[[_JobState], None]
+) -> Iterator[_JobState]:
+    """Apply one pipeline stage, passing failed/finished jobs through.
+
+    Stages are plain generators, so the pipeline is pull-driven: a new
+    line is only parsed once the previous job has left the last stage.
+    Memory therefore stays bounded by a single job regardless of the
+    input size, and parsing can never run ahead of the expensive stages.
+    """
+
+    for state in states:
+        if state.error is None and not state.done:
+            try:
+                # FreeCAD and friends occasionally print to stdout; keep
+                # the result stream clean by sending that noise to stderr.
+                with contextlib.redirect_stdout(sys.stderr):
+                    with state.timings.activate(), state.timings.stage(name):
+                        func(state)
+            except Exception as exc:
+                state.error = exc
+                traceback.print_exc(file=sys.stderr)
+        yield state
+
+
+def _envelope(state: _JobState) -> Dict[str, Any]:
+    """Turn a finished job state into a worker result envelope."""
+
+    envelope: Dict[str, Any] = {"job_id": state.job_id}
+    if state.error is None:
+        envelope["ok"] = True
+        envelope["result"] = state.result
+    else:
+        envelope["ok"] = False
+        envelope["error"] = {
+            "type": type(state.error).__name__,
+            "message": str(state.error),
+        }
+        if isinstance(state.error, JobValidationError):
+            envelope["error"]["issues"] = [asdict(i) for i in state.error.issues]
+
+    envelope["timings"] = {
+        "wall_s": round(time.perf_counter() - state.wall_start, 6),
+        "cpu_s": round(time.process_time() - state.cpu_start, 6),
+    }
+    if state.error is not None:
+        # Successful jobs carry the full breakdown in result["timings"];
+        # for failures, show how far the job got.
+        envelope["timings"]["stages"] = state.timings.to_dict()["totals"]
+    envelope["documents"] = _DOCUMENTS.stats()
+    return envelope
+
+
+def _pipeline(states: Iterable[_JobState]) -> Iterator[Dict[str, Any]]:
+    states = _stage(states, "prepare", _prepare_job)
+    states = _stage(states, "build", _build_job)
+    states = _stage(states, "render", _render_job)
+    for state in states:
+        _finish_timings(state)
+        yield _envelope(state)
+
+
+def _decoded_states(messages: Iterator[Any]) -> Iterator[_JobState]:
+    """Wrap already-decoded jobs (e.g. msgpack maps), lazily.
+
+    A decoding error is reported as one failed job and ends the stream,
+    since a binary stream cannot be resynchronised.
+    """
+
+    while True:
+        state = _JobState(job=None)
+        try:
+            state.job = next(messages)
+        except StopIteration:
+            return
+        except ValueError as exc:
+            state.error = exc
+            yield state
+            return
+        if isinstance(state.job, dict):
+            state.job_id = state.job.get("job_id")
+        yield state
+
+
+def stream_jobs(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Run newline-delimited jobs lazily, yielding one envelope per job.
+
+    Each non-empty line is one job JSON object (optionally with a
+    ``job_id`` that is echoed back). Failures never stop the stream;
+    they are reported as ``{"ok": false, "error": ...}``.
+    """
+
+    return _pipeline(_parse_lines(lines))
 
-    output_pdf.parent.mkdir(parents=True, exist_ok=True)
 
-    generate_drawing(
-        solid=solid,
-        spec=drawing_spec,
-        output_pdf=str(output_pdf),
-        output_svg=output_svg,
+# ----- Worker mode -------------------------------------------------------------
+
+
+def _warm_up() -> None:
+    """Import CadQuery and FreeCAD/TechDraw once so later jobs skip the cost.
+
+    FreeCAD is optional here: if it cannot be imported the worker still
+    starts (geometry-only jobs work), and the affected drawing jobs
+    report the error individually.
+    """
+
+    import cadquery  # noqa: F401
+
+    try:
+        _ensure_freecad_on_path()
+        import FreeCAD  # type: ignore[import]  # noqa: F401
+        import TechDraw  # type: ignore[import]  # noqa: F401
+    except Exception as exc:  # pragma: no cover - depends on local install
+        print(f"job_runner: FreeCAD warm-up skipped: {exc}", file=sys.stderr)
+
+
+def _run_job_safely(job: Any) -> Dict[str, Any]:
+    """Run one job and wrap the outcome in a worker result envelope.
+
+    Never raises: failures are reported as ``{"ok": false, "error": ...}``
+    so that a long-lived worker can move on to the next job.
+    """
+
+    state = _JobState(job=job)
+    if isinstance(job, dict):
+        state.job_id = job.get("job_id")
+    return next(_pipeline([state]))
+
+
+def serve_stream(infile: TextIO, outfile: TextIO) -> int:
+    """Serve newline-delimited jobs from ``infile`` until EOF.
+
+    For every job exactly one compact JSON line is written to
+    ``outfile`` and flushed as soon as the job finishes (see
+    :func:`stream_jobs`).
+
+    Returns the number of jobs processed.
+    """
+
+    count = 0
+    for envelope in stream_jobs(infile):
+        outfile.write(json.dumps(envelope, separators=(",", ":")))
+        outfile.write("\n")
+        outfile.flush()
+        count += 1
+
+    return count
+
+
+def serve_msgpack(infile: BinaryIO, outfile: BinaryIO) -> int:
+    """Like :func:`serve_stream`, but jobs and results are msgpack maps.
+
+    Returns the number of jobs processed.
+    """
+
+    count = 0
+    for envelope in _pipeline(_decoded_states(iter_unpack(infile))):
+        outfile.write(pack(envelope))
+        outfile.flush()
+        count += 1
+
+    return count
+
+
+def _serve(fmt: str, infile: BinaryIO, outfile: BinaryIO) -> int:
+    """Serve binary ``infile``/``outfile`` in the wire format ``fmt``."""
+
+    if fmt == "msgpack":
+        return serve_msgpack(infile, outfile)
+    return serve_stream(
+        io.TextIOWrapper(infile, encoding="utf8"),
+        io.TextIOWrapper(outfile, encoding="utf8", write_through=True),
     )
 
+
+class _StreamHandler(socketserver.StreamRequestHandler):
+    # Wire format of every connection; set by serve_socket.
+    wire_format = "json"
+
+    def handle(self) -> None:
+        _serve(self.wire_format, self.rfile, self.wfile)
+
+
+def serve_socket(path: str, fmt: str = "json") -> None:
+    """Serve worker connections on a local Unix socket at ``path``.
+
+    Connections are handled one at a time (one CAD job at a time per
+    worker process); each connection speaks the same protocol as
+    :func:`serve_stream` (or :func:`serve_msgpack` for ``fmt="msgpack"``).
+    """
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Unix sockets are not available on this platform")
+
+    sock_path = Path(path)
+    if sock_path.exists():
+        sock_path.unlink()
+
+    handler = type("_Handler", (_StreamHandler,), {"wire_format": fmt})
+    with socketserver.UnixStreamServer(str(sock_path), handler) as server:
+        print(f"job_runner: listening on {sock_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            if sock_path.exists():
+                sock_path.unlink()
+
+
+# ----- Batch mode --------------------------------------------------------------
+
+
+def load_jobs(path: str) -> List[Any]:
+    """Load a list of jobs from a JSON array or a JSONL file.
+
+    ``"-"`` reads from stdin. The format is detected from the first
+    non-whitespace character.
+    """
+
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        text = Path(path).read_text(encoding="utf8")
+
+    if text.lstrip().startswith("["):
+        jobs = json.loads(text)
+    else:
+        jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return jobs
+
+
+def _batch_task(job: Any) -> Dict[str, Any]:
+    """Pool task: run one job and tag it with the worker's busy time."""
+
+    start = time.perf_counter()
+    envelope = _run_job_safely(job)
+    envelope["worker_pid"] = os.getpid()
+    envelope["worker_busy_s"] = time.perf_counter() - start
+    return envelope
+
+
+def _crash_envelope(job: Any, exc: BaseException) -> Dict[str, Any]:
     return {
-        "output_pdf": str(output_pdf),
-        "output_svg": output_svg,
-        "solid": asdict(solid_spec),
-        "drawing": asdict(drawing_spec),
+        "job_id": job.get("job_id") if isinstance(job, dict) else None,
+        "ok": False,
+        "error": {"type": type(exc).__name__, "message": str(exc)},
+    }
+
+
+def _batch_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_warm_up
+    )
+
+
+def _run_until_broken(
+    jobs: List[Any],
+    queue: Deque[int],
+    results: List[Optional[Dict[str, Any]]],
+    workers: int,
+) -> List[int]:
+    """Run the jobs in ``queue`` until it is empty or a worker dies.
+
+    At most ``workers`` jobs are submitted at a time, so every submitted
+    job is running. When a worker process dies the pool breaks and all
+    of them are lost; their indices are returned (empty if the pool
+    survived). Jobs never submitted stay in ``queue``.
+    """
+
+    lost: List[int] = []
+    broken = False
+    with _batch_pool(workers) as pool:
+        in_flight: Dict[concurrent.futures.Future, int] = {}
+        while in_flight or (queue and not broken):
+            while queue and not broken and len(in_flight) < workers:
+                index = queue.popleft()
+                try:
+                    in_flight[pool.submit(_batch_task, jobs[index])] = index
+                except BrokenProcessPool:
+                    queue.appendleft(index)
+                    broken = True
+            if not in_flight:
+                break
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                index = in_flight.pop(future)
+                try:
+                    results[index] = future.result()
+                except BrokenProcessPool:
+                    lost.append(index)
+                    broken = True
+                except Exception as exc:
+                    # E.g. a job that cannot be pickled: only its own fault.
+                    results[index] = _crash_envelope(jobs[index], exc)
+    return lost
+
+
+def _run_alone(job: Any) -> Dict[str, Any]:
+    """Run ``job`` in a pool of its own, charging a worker crash to it."""
+
+    with _batch_pool(1) as pool:
+        try:
+            return pool.submit(_batch_task, job).result()
+        except Exception as exc:
+            return _crash_envelope(job, exc)
+
+
+def run_batch(jobs: List[Any], workers: int | None = None) -> Dict[str, Any]:
+    """Run ``jobs`` over a pool of warm worker processes.
+
+    Each pool process imports FreeCAD once (see :func:`_warm_up`) and
+    keeps its own solid cache. Results are returned in input order and
+    a failing job only affects its own entry, even when it kills its
+    worker process (e.g. a crash inside OCCT): the pool is then
+    restarted, the jobs that were running next to it are re-run one at
+    a time to find the one that crashed, and the rest of the batch
+    continues. The summary reports throughput and the fraction of the
+    batch wall time each worker process spent running jobs.
+    """
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    start = time.perf_counter()
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    queue: Deque[int] = collections.deque(range(len(jobs)))
+    while queue:
+        for index in _run_until_broken(jobs, queue, results, workers):
+            results[index] = _run_alone(jobs[index])
+
+    wall_s = time.perf_counter() - start
+
+    per_worker: Dict[str, Dict[str, Any]] = {}
+    for envelope in results:
+        assert envelope is not None
+        pid = envelope.pop("worker_pid", None)
+        busy_s = envelope.pop("worker_busy_s", 0.0)
+        if pid is None:
+            continue
+        stats = per_worker.setdefault(str(pid), {"jobs": 0, "busy_s": 0.0})
+        stats["jobs"] += 1
+        stats["busy_s"] += busy_s
+
+    for stats in per_worker.values():
+        stats["utilisation"] = round(stats["busy_s"] / wall_s, 4) if wall_s else 0.0
+        stats["busy_s"] = round(stats["busy_s"], 6)
+
+    ok = sum(1 for r in results if r.get("ok"))
+    return {
+        "results": results,
+        "summary": {
+            "jobs": len(results),
+            "ok": ok,
+            "failed": len(results) - ok,
+            "pool_size": workers,
+            "wall_s": round(wall_s, 6),
+            "jobs_per_s": round(len(results) / wall_s, 4) if wall_s else 0.0,
+            "workers": per_worker,
+        },
+    }
+
+
+# ----- Parametric sweeps -------------------------------------------------------
+
+
+def _sweep_states(
+    template: ParametricTemplate, rows: Iterable[Dict[str, Any]]
+) -> Iterator[_JobState]:
+    """Instantiate one job per parameter row, lazily."""
+
+    for index, row in enumerate(rows):
+        state = _JobState(job=None, job_id=row.get("job_id", index))
+        try:
+            state.job = instantiate_row(template, row, index)
+        except ValueError as exc:
+            state.error = exc
+        else:
+            state.job_id = state.job["job_id"]
+        yield state
+
+
+def run_sweep(
+    template: ParametricTemplate, rows: Iterable[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Generate and run every variant of a parametric family in-process.
+
+    Variants go through the same streaming pipeline as ``--stream`` one
+    after the other, so they share this process's engine: base solids
+    are built once per distinct base (see ``base_cache_entries`` on
+    :class:`GeometryEngine`) and identical variants hit the solid cache.
+
+    Returns ``{"results": [...], "summary": {...}}`` with one envelope per
+    row in table order; a bad row only fails its own entry.
+    """
+
+    wall_start = time.perf_counter()
+    base_before = _ENGINE.base_cache_stats()
+    results = list(_pipeline(_sweep_states(template, rows)))
+    wall_s = time.perf_counter() - wall_start
+    base_after = _ENGINE.base_cache_stats()
+
+    ok = sum(1 for envelope in results if envelope["ok"])
+    return {
+        "results": results,
+        "summary": {
+            "variants": len(results),
+            "ok": ok,
+            "failed": len(results) - ok,
+            "wall_s": round(wall_s, 6),
+            "variants_per_s": round(len(results) / wall_s, 3) if wall_s > 0 else None,
+            "base_solids_built": base_after["misses"] - base_before["misses"],
+            "base_solids_reused": base_after["hits"] - base_before["hits"],
+        },
     }
 
 
@@ -186,17 +958,138 @@ def main(argv: list[str] | None = None) -> None:
 
         # Or specify an input file explicitly
         python job_runner.py job.json
+
+        # Long-lived worker: one job JSON per line on stdin, one result
+        # line per job on stdout. CadQuery/FreeCAD stay imported.
+        python job_runner.py --worker
+
+        # Same protocol, served over a local Unix socket
+        python job_runner.py --worker --socket /tmp/scanmaster-cad.sock
+
+        # Worker/stream with msgpack maps instead of JSON lines
+        python job_runner.py --worker --format msgpack
+
+        # Stream a JSONL file (or stdin) through the pipeline, writing one
+        # compact result line per job as soon as it finishes
+        python job_runner.py --stream jobs.jsonl > results.jsonl
+
+        # Batch: JSON array or JSONL file of jobs over a process pool
+        python job_runner.py --batch jobs.jsonl --workers 4
+
+        # Only validate a job (no CAD work); exit status 1 if invalid
+        python job_runner.py --validate job.json
+
+        # Parametric family: one variant per CSV row of the template
+        python job_runner.py --sweep ring_family.json --table sizes.csv
     """
 
-    argv = list(sys.argv[1:] if argv is None else argv)
+    parser = argparse.ArgumentParser(description="ScanMaster CAD job runner")
+    parser.add_argument("job", nargs="?", help="Path to a job JSON file")
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Keep running and process newline-delimited jobs",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="With --worker, listen on a Unix socket instead of stdin",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Treat the input (file or stdin) as JSONL and stream results",
+    )
+    parser.add_argument(
+        "--format",
+        choices=WIRE_FORMATS,
+        default="json",
+        help="With --worker/--stream, wire format of jobs and results",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="PATH",
+        help="Run a JSON array or JSONL file of jobs ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="With --batch, number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Only validate the job and print every issue found",
+    )
+    parser.add_argument(
+        "--sweep",
+        metavar="TEMPLATE",
+        help="Run every variant of a parametric template JSON file",
+    )
+    parser.add_argument(
+        "--table",
+        metavar="CSV",
+        help="With --sweep, parameter table with one row per variant",
+    )
+    args = parser.parse_args(list(sys.argv[1:] if argv is None else argv))
+
+    if args.sweep:
+        if not args.table:
+            parser.error("--sweep requires --table")
+        with Path(args.sweep).open("r", encoding="utf8") as f:
+            template = ParametricTemplate.from_dict(json.load(f))
+        sweep_result = run_sweep(template, read_parameter_table(args.table))
+        json.dump(sweep_result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+
+    if args.batch:
+        batch_result = run_batch(load_jobs(args.batch), workers=args.workers)
+        json.dump(batch_result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+
+    if args.worker:
+        _warm_up()
+        if args.socket:
+            serve_socket(args.socket, fmt=args.format)
+        elif args.format == "msgpack":
+            serve_msgpack(sys.stdin.buffer, sys.stdout.buffer)
+        else:
+            serve_stream(sys.stdin, sys.stdout)
+        return
 
-    if argv:
-        job_json_path = Path(argv[0])
+    if args.stream:
+        if args.format == "msgpack":
+            if args.job:
+                with Path(args.job).open("rb") as fb:
+                    serve_msgpack(fb, sys.stdout.buffer)
+            else:
+                serve_msgpack(sys.stdin.buffer, sys.stdout.buffer)
+        elif args.job:
+            with Path(args.job).open("r", encoding="utf8") as f:
+                serve_stream(f, sys.stdout)
+        else:
+            serve_stream(sys.stdin, sys.stdout)
+        return
+
+    if args.job:
+        job_json_path = Path(args.job)
         with job_json_path.open("r", encoding="utf8") as f:
             job_data = json.load(f)
     else:
         job_data = json.load(sys.stdin)
 
+    if args.validate:
+        issues = validate_job(job_data)
+        report = {"ok": not issues, "issues": [asdict(i) for i in issues]}
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        if issues:
+            raise SystemExit(1)
+        return
+
     result = run_job(job_data)
     json.dump(result, sys.stdout, indent=2)
     sys.stdout.write("\n")
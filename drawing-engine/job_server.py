@@ -0,0 +1,647 @@
+from __future__ import annotations
+
+"""Asyncio job service with bounded concurrency, queueing and timeouts.
+
+Instead of Node spawning one ``job_runner.py`` per request, a single
+``job_server.py`` owns a fixed pool of warm ``job_runner.py --worker``
+processes and queues incoming jobs for them. The pool size is the
+concurrency limit: a burst of requests waits in the queue instead of
+starting a FreeCAD process each.
+
+Clients connect to a local Unix socket (``--socket``) or TCP port
+(``--port``, bound to localhost by default) and speak newline-delimited
+JSON. Requests::
+
+    {"op": "run", "job_id": "a1", "job": {...run_job payload...}, "timeout_s": 60}
+    {"op": "cancel", "job_id": "a1"}
+    {"op": "metrics"}
+
+A bare job object (no ``op``) is treated as ``run``. For every job the
+server streams progress events back on the same connection::
+
+    {"event": "queued", "job_id": "a1", "queue_depth": 3}
+    {"event": "started", "job_id": "a1", "wait_s": 0.52, "worker_pid": 4711}
+    {"event": "result", "job_id": "a1", "ok": true, "result": {...}, ...}
+
+``result`` carries the usual worker envelope (see ``job_runner``).
+Timeouts and cancellations end with a ``result`` event whose ``error``
+type is ``TimeoutError`` or ``CancelledError``. A job that is already
+running is stopped by killing its worker, which is replaced by a fresh
+one. Closing the connection cancels its unfinished jobs.
+
+Identical jobs arriving while the first one is still queued or running
+(same :func:`~scanmaster_drawing_engine.artifact_cache.request_fingerprint`,
+i.e. same specs and options, any output paths) are coalesced: instead of
+``started`` they get ``{"event": "coalesced", "leader_job_id": ...}``,
+wait for the first job and receive its result, with the artifacts
+copied to their own output paths and ``coalesced_with`` set. If the
+first job is cancelled or times out, a waiting duplicate runs itself
+within what is left of its own timeout.
+
+Usage (from the ``drawing-engine`` folder)::
+
+    python job_server.py --socket /tmp/scanmaster-cad.sock --concurrency 4
+    python job_server.py --port 8765 --timeout 120
+"""
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from scanmaster_drawing_engine.artifact_cache import _copy_into_place, request_fingerprint
+from scanmaster_drawing_engine.job_codec import expand_outputs
+
+_JOB_RUNNER = str(Path(__file__).with_name("job_runner.py"))
+
+# Result lines can be large (full specs, per-stage timings).
+_LINE_LIMIT = 64 * 2**20
+
+# Wait/run time percentiles are computed over this many recent jobs.
+_METRICS_WINDOW = 1000
+
+
+def _error_envelope(job_id: Any, exc_type: str, message: str) -> Dict[str, Any]:
+    return {"job_id": job_id, "ok": False, "error": {"type": exc_type, "message": message}}
+
+
+def _materialise_outputs(result: Dict[str, Any], job: Dict[str, Any]) -> None:
+    """Copy the outputs listed in ``result`` to the paths ``job`` asked for
+    and point ``result`` at them.
+
+    Copies, not hard links: the leader's next job rewrites its output
+    paths in place and must not change a duplicate's files.
+    """
+
+    if "outputs" in job:
+        job = dict(job)
+        expand_outputs(job)
+    for key, src in list(result.items()):
+        if not key.startswith("output_") or not src or not job.get(key):
+            continue
+        dst = Path(job[key]).resolve()
+        if dst != Path(src):
+            _copy_into_place(Path(src), dst)
+        result[key] = str(dst)
+
+
+def _summary(samples: Deque[float]) -> Dict[str, Any]:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_s": round(statistics.fmean(ordered), 6),
+        "p50_s": round(ordered[len(ordered) // 2], 6),
+        "p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 6),
+        "max_s": round(ordered[-1], 6),
+    }
+
+
+# ----- Workers -----------------------------------------------------------------
+
+
+class _Worker:
+    """One ``job_runner.py --worker`` child process."""
+
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        self.process = process
+        self.jobs = 0
+
+    @classmethod
+    async def spawn(cls) -> "_Worker":
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            _JOB_RUNNER,
+            "--worker",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=_LINE_LIMIT,
+        )
+        return cls(process)
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    async def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        assert self.process.stdin is not None and self.process.stdout is not None
+        self.process.stdin.write(json.dumps(job, separators=(",", ":")).encode("utf8"))
+        self.process.stdin.write(b"\n")
+        await self.process.stdin.drain()
+        line = await self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(
+                f"worker {self.pid} exited with status {await self.process.wait()}"
+            )
+        self.jobs += 1
+        return json.loads(line)
+
+    async def kill(self) -> None:
+        with contextlib.suppress(ProcessLookupError):
+            self.process.kill()
+        await self.process.wait()
+
+    async def close(self) -> None:
+        if self.process.stdin is not None and not self.process.stdin.is_closing():
+            self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=10.0)
+        except asyncio.TimeoutError:
+            await self.kill()
+
+
+class JobServer:
+    """Queue of jobs in front of a fixed pool of warm worker processes.
+
+    Parameters
+    ----------
+    concurrency:
+        Number of worker processes, i.e. jobs running at the same time.
+    default_timeout_s:
+        Timeout applied to jobs that do not send their own
+        ``timeout_s``; ``None`` means no limit.
+    coalesce:
+        Serve concurrent identical jobs from one computation.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        default_timeout_s: Optional[float] = None,
+        coalesce: bool = True,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("JobServer.concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.default_timeout_s = default_timeout_s
+        self.coalesce = coalesce
+        # Request fingerprint -> (job id, future of its envelope) for
+        # every job that is queued or running.
+        self._in_flight: Dict[
+            str, Tuple[Any, "asyncio.Future[Optional[Dict[str, Any]]]"]
+        ] = {}
+        self._idle: "asyncio.Queue[_Worker]" = asyncio.Queue()
+        self._workers: List[_Worker] = []
+        self._tasks: Dict[Any, asyncio.Task[None]] = {}
+        self._job_ids = itertools.count(1)
+
+        self._waiting = 0
+        self._running = 0
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "timed_out": 0,
+            "coalesced": 0,
+            "worker_restarts": 0,
+        }
+        self._wait_s: Deque[float] = deque(maxlen=_METRICS_WINDOW)
+        self._run_s: Deque[float] = deque(maxlen=_METRICS_WINDOW)
+        self._started = time.monotonic()
+
+    @classmethod
+    def from_env(cls) -> "JobServer":
+        """Configure from ``SCANMASTER_SERVER_CONCURRENCY`` (default: CPU
+        count), ``SCANMASTER_JOB_TIMEOUT_S`` (default: no timeout) and
+        ``SCANMASTER_SERVER_COALESCE`` (``0`` disables coalescing)."""
+
+        concurrency = int(
+            os.environ.get("SCANMASTER_SERVER_CONCURRENCY") or os.cpu_count() or 1
+        )
+        timeout_raw = os.environ.get("SCANMASTER_JOB_TIMEOUT_S")
+        return cls(
+            concurrency,
+            float(timeout_raw) if timeout_raw else None,
+            coalesce=os.environ.get("SCANMASTER_SERVER_COALESCE", "1") != "0",
+        )
+
+    async def start(self) -> None:
+        workers = await asyncio.gather(*(_Worker.spawn() for _ in range(self.concurrency)))
+        for worker in workers:
+            self._workers.append(worker)
+            self._idle.put_nowait(worker)
+
+    async def close(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        await asyncio.gather(*(w.close() for w in self._workers))
+        self._workers.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "queue_depth": self._waiting,
+            "running": self._running,
+            "in_flight": len(self._in_flight),
+            **self._counters,
+            "wait": _summary(self._wait_s),
+            "run": _summary(self._run_s),
+            "workers": [{"pid": w.pid, "jobs": w.jobs} for w in self._workers],
+            "uptime_s": round(time.monotonic() - self._started, 3),
+        }
+
+    # -- job lifecycle -----------------------------------------------------------
+
+    def submit(
+        self,
+        job: Any,
+        job_id: Any,
+        timeout_s: Optional[float],
+        emit: "asyncio.Queue[Dict[str, Any]]",
+    ) -> Any:
+        """Queue ``job``; progress events are put on ``emit``.
+
+        Returns the job id (assigned when the request had none).
+        """
+
+        if job_id is None:
+            job_id = f"job-{next(self._job_ids)}"
+        if job_id in self._tasks:
+            emit.put_nowait(
+                {"event": "result", **_error_envelope(job_id, "ValueError", "duplicate job_id")}
+            )
+            return job_id
+        if isinstance(job, dict):
+            job = {**job, "job_id": job_id}
+
+        timeout = timeout_s if timeout_s is not None else self.default_timeout_s
+        self._counters["submitted"] += 1
+        task = asyncio.ensure_future(self._run(job, job_id, timeout, emit))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _t: self._tasks.pop(job_id, None))
+        return job_id
+
+    def cancel(self, job_id: Any) -> bool:
+        task = self._tasks.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def _run(
+        self,
+        job: Any,
+        job_id: Any,
+        timeout: Optional[float],
+        emit: "asyncio.Queue[Dict[str, Any]]",
+    ) -> None:
+        submitted = time.perf_counter()
+        envelope: Optional[Dict[str, Any]] = None
+        key: Optional[str] = None
+        if self.coalesce:
+            try:
+                # Validates and parses the whole job: off the event loop,
+                # so a huge job does not stall other connections.
+                key = await asyncio.to_thread(request_fingerprint, job)
+            except asyncio.CancelledError:
+                self._counters["cancelled"] += 1
+                envelope = _error_envelope(job_id, "CancelledError", "job was cancelled")
+
+        # Time spent waiting for an identical job counts against this
+        # job's timeout if it ends up running itself.
+        budget = timeout
+        while envelope is None and key is not None and key in self._in_flight:
+            leader_id, flight = self._in_flight[key]
+            waited = time.perf_counter()
+            envelope = await self._follow(
+                job, job_id, leader_id, flight, timeout, budget, emit
+            )
+            if budget is not None:
+                budget -= time.perf_counter() - waited
+
+        if envelope is None and budget is not None and budget <= 0:
+            self._counters["timed_out"] += 1
+            envelope = _error_envelope(
+                job_id, "TimeoutError", f"job exceeded its timeout of {timeout}s"
+            )
+
+        if envelope is None:
+            flight = None
+            if key is not None:
+                flight = asyncio.get_running_loop().create_future()
+                self._in_flight[key] = (job_id, flight)
+            try:
+                envelope = await self._execute(
+                    job, job_id, timeout, budget, submitted, emit
+                )
+            finally:
+                if flight is not None:
+                    del self._in_flight[key]
+                    flight.set_result(envelope)
+
+        envelope["queue_wait_s"] = round(time.perf_counter() - submitted, 6)
+        emit.put_nowait({"event": "result", **envelope})
+
+    async def _follow(
+        self,
+        job: Dict[str, Any],
+        job_id: Any,
+        leader_id: Any,
+        flight: "asyncio.Future[Optional[Dict[str, Any]]]",
+        timeout: Optional[float],
+        budget: Optional[float],
+        emit: "asyncio.Queue[Dict[str, Any]]",
+    ) -> Optional[Dict[str, Any]]:
+        """Wait up to ``budget`` seconds for the identical job ``leader_id``
+        and adopt its result.
+
+        Returns ``None`` when the leader was cancelled or timed out, so
+        that this job runs itself instead.
+        """
+
+        emit.put_nowait(
+            {"event": "coalesced", "job_id": job_id, "leader_job_id": leader_id}
+        )
+        try:
+            # Shielded: a cancelled duplicate must not cancel the leader.
+            leader = await asyncio.wait_for(asyncio.shield(flight), budget)
+        except asyncio.TimeoutError:
+            self._counters["timed_out"] += 1
+            return _error_envelope(
+                job_id, "TimeoutError", f"job exceeded its timeout of {timeout}s"
+            )
+        except asyncio.CancelledError:
+            self._counters["cancelled"] += 1
+            return _error_envelope(job_id, "CancelledError", "job was cancelled")
+
+        error_type = (leader or {}).get("error", {}).get("type")
+        if leader is None or error_type in ("CancelledError", "TimeoutError"):
+            return None
+
+        envelope = copy.deepcopy(leader)
+        envelope["job_id"] = job_id
+        envelope["coalesced_with"] = leader_id
+        envelope.pop("queue_wait_s", None)
+        if envelope.get("ok"):
+            try:
+                await asyncio.to_thread(_materialise_outputs, envelope["result"], job)
+            except OSError as exc:
+                envelope = _error_envelope(job_id, type(exc).__name__, str(exc))
+        self._counters["coalesced"] += 1
+        self._counters["completed" if envelope.get("ok") else "failed"] += 1
+        return envelope
+
+    async def _execute(
+        self,
+        job: Any,
+        job_id: Any,
+        timeout: Optional[float],
+        budget: Optional[float],
+        submitted: float,
+        emit: "asyncio.Queue[Dict[str, Any]]",
+    ) -> Dict[str, Any]:
+        """Run ``job`` on a pool worker; never raises, returns its envelope.
+
+        The run is limited to ``budget`` seconds, which is ``timeout``
+        less any time already spent waiting for an identical job.
+        """
+
+        worker: Optional[_Worker] = None
+        envelope: Dict[str, Any]
+
+        self._waiting += 1
+        emit.put_nowait({"event": "queued", "job_id": job_id, "queue_depth": self._waiting})
+        try:
+            try:
+                worker = await self._idle.get()
+            finally:
+                self._waiting -= 1
+
+            wait_s = time.perf_counter() - submitted
+            self._wait_s.append(wait_s)
+            emit.put_nowait(
+                {
+                    "event": "started",
+                    "job_id": job_id,
+                    "wait_s": round(wait_s, 6),
+                    "worker_pid": worker.pid,
+                }
+            )
+
+            self._running += 1
+            started = time.perf_counter()
+            try:
+                envelope = await asyncio.wait_for(worker.run(job), budget)
+            finally:
+                self._running -= 1
+                self._run_s.append(time.perf_counter() - started)
+
+            self._counters["completed" if envelope.get("ok") else "failed"] += 1
+            self._idle.put_nowait(worker)
+            worker = None
+        except asyncio.TimeoutError:
+            self._counters["timed_out"] += 1
+            envelope = _error_envelope(
+                job_id, "TimeoutError", f"job exceeded its timeout of {timeout}s"
+            )
+        except asyncio.CancelledError:
+            self._counters["cancelled"] += 1
+            envelope = _error_envelope(job_id, "CancelledError", "job was cancelled")
+        except Exception as exc:
+            # The worker died underneath the job (e.g. an OCCT crash).
+            self._counters["failed"] += 1
+            envelope = _error_envelope(job_id, type(exc).__name__, str(exc))
+        finally:
+            if worker is not None:
+                # Mid-job timeout/cancel/crash: the worker's state is
+                # unknown, so replace it with a fresh process.
+                await self._replace(worker)
+        return envelope
+
+    async def _replace(self, worker: _Worker) -> None:
+        await worker.kill()
+        self._workers.remove(worker)
+        fresh = await _Worker.spawn()
+        self._workers.append(fresh)
+        self._counters["worker_restarts"] += 1
+        self._idle.put_nowait(fresh)
+
+    # -- connections -------------------------------------------------------------
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection until it closes."""
+
+        events: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        pending: Dict[Any, bool] = {}
+
+        async def pump() -> None:
+            while True:
+                event = await events.get()
+                if event.get("event") == "result":
+                    pending.pop(event.get("job_id"), None)
+                writer.write(json.dumps(event, separators=(",", ":")).encode("utf8"))
+                writer.write(b"\n")
+                await writer.drain()
+
+        sender = asyncio.ensure_future(pump())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    events.put_nowait(
+                        {"event": "error", **_error_envelope(None, "JSONDecodeError", str(exc))}
+                    )
+                    continue
+                self._dispatch(request, events, pending)
+
+            # Input closed. A half-closed client still reads, so deliver the
+            # remaining results; once a write fails, the rest is cancelled.
+            while pending and not sender.done():
+                await asyncio.sleep(0.05)
+        finally:
+            for job_id in list(pending):
+                self.cancel(job_id)
+            # Let cancellation results drain before closing.
+            await asyncio.sleep(0)
+            sender.cancel()
+            with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+                await sender
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def _dispatch(
+        self,
+        request: Any,
+        events: "asyncio.Queue[Dict[str, Any]]",
+        pending: Dict[Any, bool],
+    ) -> None:
+        op = request.get("op", "run") if isinstance(request, dict) else "run"
+        if op == "metrics":
+            events.put_nowait({"event": "metrics", **self.metrics()})
+        elif op == "cancel":
+            found = self.cancel(request.get("job_id"))
+            if not found:
+                events.put_nowait(
+                    {
+                        "event": "error",
+                        **_error_envelope(
+                            request.get("job_id"), "KeyError", "no such queued or running job"
+                        ),
+                    }
+                )
+        elif op == "run":
+            if isinstance(request, dict) and "op" in request:
+                job = request.get("job")
+                job_id = request.get("job_id")
+                if job_id is None and isinstance(job, dict):
+                    job_id = job.get("job_id")
+                timeout_s = request.get("timeout_s")
+            else:
+                job = request
+                job_id = request.get("job_id") if isinstance(request, dict) else None
+                timeout_s = None
+            job_id = self.submit(
+                job, job_id, float(timeout_s) if timeout_s is not None else None, events
+            )
+            pending[job_id] = True
+        else:
+            events.put_nowait(
+                {"event": "error", **_error_envelope(None, "ValueError", f"unknown op {op!r}")}
+            )
+
+
+# ----- Entrypoint ----------------------------------------------------------------
+
+
+async def serve(
+    server: JobServer,
+    socket_path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+) -> None:
+    """Start ``server``'s workers and serve connections until cancelled."""
+
+    await server.start()
+    if socket_path is not None:
+        path = Path(socket_path)
+        if path.exists():
+            path.unlink()
+        listener = await asyncio.start_unix_server(
+            server.handle_connection, path=str(path), limit=_LINE_LIMIT
+        )
+        where = str(path)
+    else:
+        listener = await asyncio.start_server(
+            server.handle_connection, host=host, port=port, limit=_LINE_LIMIT
+        )
+        where = f"{host}:{port}"
+
+    print(
+        f"job_server: listening on {where} with {server.concurrency} workers",
+        file=sys.stderr,
+    )
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+        if socket_path is not None and Path(socket_path).exists():
+            Path(socket_path).unlink()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="ScanMaster CAD job server")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", metavar="PATH", help="Listen on a Unix socket")
+    where.add_argument("--port", type=int, help="Listen on a TCP port")
+    parser.add_argument("--host", default="127.0.0.1", help="With --port, bind address")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Worker processes / concurrent jobs (default: SCANMASTER_SERVER_CONCURRENCY "
+        "or CPU count)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Default per-job timeout in seconds (default: SCANMASTER_JOB_TIMEOUT_S)",
+    )
+    parser.add_argument(
+        "--no-coalesce",
+        action="store_true",
+        help="Run concurrent identical jobs separately (SCANMASTER_SERVER_COALESCE=0)",
+    )
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = JobServer.from_env()
+        if args.concurrency is not None:
+            server = JobServer(
+                args.concurrency, server.default_timeout_s, coalesce=server.coalesce
+            )
+        if args.timeout is not None:
+            server.default_timeout_s = args.timeout
+        if args.no_coalesce:
+            server.coalesce = False
+        await serve(server, socket_path=args.socket, host=args.host, port=args.port)
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run())
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation only
+    main()
@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+"""Prefork supervisor: import CadQuery/FreeCAD once, fork warm workers.
+
+A fresh ``job_runner.py --worker`` pays the full import cost of
+CadQuery, OCCT, FreeCAD and TechDraw before its first job, so adding
+workers after a traffic spike is slow. The supervisor pays it once:
+
+1. The parent imports CadQuery and FreeCAD/TechDraw (``_warm_up``),
+   preloads the SVG backend's drawing templates and binds a Unix
+   socket. TechDraw reads its template from disk for every page, so
+   template preloading only helps ``"backend": "svg"`` jobs.
+2. It ``fork()``\\ s the workers. Children share the parent's imported
+   modules copy-on-write and are ready within milliseconds.
+3. All children ``accept()`` on the shared socket and speak the same
+   line protocol as ``job_runner.py --worker --socket`` (one job JSON
+   per line in, one result line per job out).
+4. A child exits after ``--max-jobs`` jobs or once its RSS exceeds
+   ``--max-rss-mb``; the parent immediately forks a replacement. The
+   connection that hit the limit is closed after its result line, so
+   clients reconnect (jobs they pipelined behind it are not read). A
+   client that disconnects mid-stream only ends its own connection.
+
+The parent logs JSON lines to stderr: one per spawn and exit, plus a
+``prefork.stats`` line every ``--stats-interval`` seconds and on
+``SIGUSR1`` with warm-up time, spawn latency and per-worker RSS/PSS/USS
+(see :func:`~scanmaster_drawing_engine.process_stats.process_memory`).
+
+POSIX only. Usage (from the ``drawing-engine`` folder)::
+
+    python prefork.py --socket /tmp/scanmaster-cad.sock --workers 8 \\
+        --max-jobs 500 --max-rss-mb 1500 --template templates/A4.svg
+"""
+
+import argparse
+import json
+import os
+import select
+import signal
+import socket
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from scanmaster_drawing_engine.process_stats import current_rss_bytes, process_memory
+
+# Child exit statuses telling the parent why a worker stopped.
+_EXIT_MAX_JOBS = 3
+_EXIT_MAX_RSS = 4
+_EXIT_REASONS = {0: "stopped", _EXIT_MAX_JOBS: "max_jobs", _EXIT_MAX_RSS: "max_rss"}
+
+# A worker dying faster than this is respawned after a pause, so a
+# broken install does not turn into a fork loop.
+_CRASH_BACKOFF_S = 1.0
+
+
+def _log(event: str, **fields: Any) -> None:
+    line = json.dumps({"event": event, **fields}, separators=(",", ":"))
+    print(line, file=sys.stderr)
+
+
+@dataclass
+class _Child:
+    pid: int
+    slot: int
+    started: float
+    spawn_s: float
+
+
+class PreforkSupervisor:
+    """Fork and recycle warm ``job_runner`` workers on one Unix socket.
+
+    Parameters
+    ----------
+    socket_path:
+        Unix socket shared by all workers.
+    workers:
+        Number of worker processes kept alive.
+    max_jobs:
+        Jobs a worker serves before it is replaced (``0``: no limit).
+    max_rss_bytes:
+        Resident-memory ceiling checked after every job (``None``: no
+        limit).
+    templates:
+        SVG templates to read into memory before forking, for the SVG
+        backend (TechDraw loads its template from the file per page).
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        workers: int,
+        max_jobs: int = 0,
+        max_rss_bytes: Optional[int] = None,
+        templates: Optional[List[str]] = None,
+    ) -> None:
+        if not hasattr(os, "fork"):
+            raise RuntimeError("The prefork supervisor needs POSIX fork()")
+        if workers < 1:
+            raise ValueError("PreforkSupervisor.workers must be at least 1")
+        self.socket_path = socket_path
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.max_rss_bytes = max_rss_bytes
+        self.templates = list(templates or [])
+
+        self._children: Dict[int, _Child] = {}
+        self._listener: Optional[socket.socket] = None
+        self._wakeup: Optional[tuple[int, int]] = None
+        self._stopping = False
+        self._started = time.monotonic()
+        self._warm_up_s = 0.0
+        self._initial_spawn_s = 0.0
+        self._spawn_s: List[float] = []
+        self._exits: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls, socket_path: str) -> "PreforkSupervisor":
+        """Configure from ``SCANMASTER_PREFORK_WORKERS`` (default: CPU
+        count), ``SCANMASTER_WORKER_MAX_JOBS``, ``SCANMASTER_WORKER_MAX_RSS_MB``
+        and ``SCANMASTER_PRELOAD_TEMPLATES`` (``os.pathsep``-separated)."""
+
+        max_rss_mb = os.environ.get("SCANMASTER_WORKER_MAX_RSS_MB")
+        templates = os.environ.get("SCANMASTER_PRELOAD_TEMPLATES", "")
+        return cls(
+            socket_path,
+            workers=int(
+                os.environ.get("SCANMASTER_PREFORK_WORKERS") or os.cpu_count() or 1
+            ),
+            max_jobs=int(os.environ.get("SCANMASTER_WORKER_MAX_JOBS", "0")),
+            max_rss_bytes=int(float(max_rss_mb) * 2**20) if max_rss_mb else None,
+            templates=[t for t in templates.split(os.pathsep) if t],
+        )
+
+    # -- parent ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Warm up, preload templates, bind the socket and fork all workers."""
+
+        from job_runner import _warm_up
+        from scanmaster_drawing_engine.svg_backend import preload_templates
+
+        start = time.perf_counter()
+        _warm_up()
+        preload_templates(self.templates)
+        self._warm_up_s = time.perf_counter() - start
+
+        path = Path(self.socket_path)
+        if path.exists():
+            path.unlink()
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(str(path))
+        self._listener.listen(128)
+
+        # SIGCHLD/SIGTERM wake the select() in serve_forever via this pipe.
+        self._wakeup = os.pipe()
+        for fd in self._wakeup:
+            os.set_blocking(fd, False)
+        signal.set_wakeup_fd(self._wakeup[1])
+        signal.signal(signal.SIGCHLD, lambda *_: None)
+        signal.signal(signal.SIGUSR1, lambda *_: None)
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        start = time.perf_counter()
+        for slot in range(self.workers):
+            self._spawn(slot)
+        self._initial_spawn_s = time.perf_counter() - start
+        _log(
+            "prefork.ready",
+            socket=str(path),
+            workers=self.workers,
+            warm_up_s=round(self._warm_up_s, 3),
+            initial_spawn_s=round(self._initial_spawn_s, 4),
+        )
+
+    def serve_forever(self, stats_interval: float = 60.0) -> None:
+        """Respawn exiting workers until SIGTERM/SIGINT, then shut down."""
+
+        assert self._wakeup is not None
+        next_stats = time.monotonic() + stats_interval
+        try:
+            while not self._stopping:
+                timeout = max(0.0, next_stats - time.monotonic())
+                readable, _, _ = select.select([self._wakeup[0]], [], [], timeout)
+                signals = b""
+                if readable:
+                    try:
+                        signals = os.read(self._wakeup[0], 512)
+                    except BlockingIOError:
+                        pass
+                self._reap()
+                if signal.SIGUSR1 in signals or time.monotonic() >= next_stats:
+                    _log("prefork.stats", **self.stats())
+                    next_stats = time.monotonic() + stats_interval
+        finally:
+            self.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        """Startup and respawn latency plus memory per live worker."""
+
+        spawn_ms = [s * 1000 for s in self._spawn_s]
+        now = time.monotonic()
+        return {
+            "uptime_s": round(now - self._started, 3),
+            "warm_up_s": round(self._warm_up_s, 3),
+            "initial_spawn_s": round(self._initial_spawn_s, 4),
+            "spawns": len(spawn_ms),
+            "spawn_ms": {
+                "mean": round(statistics.fmean(spawn_ms), 3) if spawn_ms else None,
+                "max": round(max(spawn_ms), 3) if spawn_ms else None,
+                "last": round(spawn_ms[-1], 3) if spawn_ms else None,
+            },
+            "exits": dict(self._exits),
+            "workers": [
+                {
+                    "pid": child.pid,
+                    "age_s": round(now - child.started, 3),
+                    **process_memory(child.pid),
+                }
+                for child in self._children.values()
+            ],
+        }
+
+    def shutdown(self) -> None:
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self._children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self._children.clear()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            Path(self.socket_path).unlink(missing_ok=True)
+
+    def _request_stop(self, *_: Any) -> None:
+        self._stopping = True
+
+    def _spawn(self, slot: int) -> None:
+        ready_r, ready_w = os.pipe()
+        start = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            os.close(ready_r)
+            status = 1
+            try:
+                status = self._child_main(ready_w)
+            finally:
+                os._exit(status)
+
+        os.close(ready_w)
+        with os.fdopen(ready_r, "rb") as ready:
+            ready.read(1)
+        spawn_s = time.perf_counter() - start
+        self._spawn_s.append(spawn_s)
+        self._children[pid] = _Child(
+            pid=pid, slot=slot, started=time.monotonic(), spawn_s=spawn_s
+        )
+        _log("prefork.spawn", pid=pid, slot=slot, spawn_ms=round(spawn_s * 1000, 3))
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            child = self._children.pop(pid, None)
+            if child is None:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            reason = _EXIT_REASONS.get(code, "crashed")
+            self._exits[reason] = self._exits.get(reason, 0) + 1
+            lifetime = time.monotonic() - child.started
+            _log(
+                "prefork.exit",
+                pid=pid,
+                slot=child.slot,
+                reason=reason,
+                status=code,
+                lifetime_s=round(lifetime, 3),
+            )
+            if self._stopping:
+                continue
+            if reason == "crashed" and lifetime < _CRASH_BACKOFF_S:
+                time.sleep(_CRASH_BACKOFF_S)
+            self._spawn(child.slot)
+
+    # -- child -------------------------------------------------------------------
+
+    def _child_main(self, ready_fd: int) -> int:  # pragma: no cover - child only
+        """Serve connections until a recycle limit is hit; return the exit status."""
+
+        from job_runner import stream_jobs
+
+        signal.set_wakeup_fd(-1)
+        for signum in (signal.SIGCHLD, signal.SIGUSR1, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        assert self._wakeup is not None and self._listener is not None
+        for fd in self._wakeup:
+            os.close(fd)
+
+        os.write(ready_fd, b"1")
+        os.close(ready_fd)
+
+        jobs = 0
+        while True:
+            conn, _ = self._listener.accept()
+            status = 0
+            try:
+                with conn, conn.makefile(
+                    "r", encoding="utf8"
+                ) as infile, conn.makefile("w", encoding="utf8") as outfile:
+                    for envelope in stream_jobs(infile):
+                        jobs += 1
+                        status = self._limit_status(jobs)
+                        outfile.write(json.dumps(envelope, separators=(",", ":")))
+                        outfile.write("\n")
+                        outfile.flush()
+                        if status:
+                            break
+            except ConnectionError as exc:
+                # The client went away mid-stream (BrokenPipeError,
+                # ConnectionResetError); the worker itself is fine, so
+                # go back to accept() instead of exiting as "crashed".
+                _log("prefork.disconnect", pid=os.getpid(), error=type(exc).__name__)
+            if status:
+                return status
+
+    def _limit_status(self, jobs: int) -> int:  # pragma: no cover - child only
+        if self.max_jobs and jobs >= self.max_jobs:
+            return _EXIT_MAX_JOBS
+        if self.max_rss_bytes is not None:
+            rss = current_rss_bytes()
+            if rss is not None and rss > self.max_rss_bytes:
+                return _EXIT_MAX_RSS
+        return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="ScanMaster CAD prefork supervisor")
+    parser.add_argument("--socket", required=True, metavar="PATH")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: SCANMASTER_PREFORK_WORKERS or CPU count)",
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=None,
+        help="Recycle a worker after this many jobs (SCANMASTER_WORKER_MAX_JOBS)",
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=None,
+        help="Recycle a worker above this RSS (SCANMASTER_WORKER_MAX_RSS_MB)",
+    )
+    parser.add_argument(
+        "--template",
+        action="append",
+        default=[],
+        help="SVG template to preload for the SVG backend (repeatable; "
+        "SCANMASTER_PRELOAD_TEMPLATES)",
+    )
+    parser.add_argument("--stats-interval", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    supervisor = PreforkSupervisor.from_env(args.socket)
+    if args.workers is not None:
+        supervisor.workers = args.workers
+    if args.max_jobs is not None:
+        supervisor.max_jobs = args.max_jobs
+    if args.max_rss_mb is not None:
+        supervisor.max_rss_bytes = int(args.max_rss_mb * 2**20)
+    supervisor.templates += args.template
+
+    supervisor.start()
+    supervisor.serve_forever(stats_interval=args.stats_interval)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation only
+    main()
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+"""On-disk store of finished drawing artifacts keyed by job fingerprint.
+
+Generating a drawing involves building the solid, creating a FreeCAD
+document, laying out the TechDraw page and exporting it – several
+seconds of work for a result that is fully determined by the job's
+``solid`` and ``drawing`` specs. This module lets the job runner skip
+all of it when the same (normalised) job was already rendered: the
+cached PDF/SVG are copied to the requested outputs.
+
+Layout of the store::
+
+    <root>/<fp[:2]>/<fp>/drawing.pdf
+    <root>/<fp[:2]>/<fp>/drawing.svg     # only for jobs that asked for SVG
+    <root>/<fp[:2]>/<fp>/meta.json       # {"elapsed_s": ..., ...}
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from .drawing_engine import DrawingSpec
+from .geometry_engine import SolidSpec
+from .solid_cache import DEFAULT_TOLERANCE, _quantise, canonical_solid_spec
+
+
+_PDF_NAME = "drawing.pdf"
+_SVG_NAME = "drawing.svg"
+_META_NAME = "meta.json"
+
+
+def _template_identity(template_path: str) -> Dict[str, Any]:
+    """Identify a template by path *and* content stamp.
+
+    Editing the template file on the server must invalidate previously
+    rendered drawings, so size and modification time are part of the
+    fingerprint when the file exists.
+    """
+
+    identity: Dict[str, Any] = {"path": template_path}
+    try:
+        st = os.stat(template_path)
+    except OSError:
+        return identity
+    identity["size"] = st.st_size
+    identity["mtime_ns"] = st.st_mtime_ns
+    return identity
+
+
+def job_fingerprint(
+    solid_spec: SolidSpec,
+    drawing_spec: DrawingSpec,
+    with_svg: bool,
+    tolerance: float = DEFAULT_TOLERANCE,
+    backend: str = "techdraw",
+    boolean: Sequence[object] = (),
+) -> str:
+    """Return a SHA-256 fingerprint of a normalised drawing job.
+
+    Output paths are deliberately excluded (the server picks a fresh
+    path per request); only whether an SVG was requested matters. The
+    drawing ``backend`` is part of the fingerprint, since TechDraw and
+    the SVG backend produce different pages, and so are boolean options
+    that change the solid (``BooleanOptions.result_key()``).
+    """
+
+    drawing = asdict(drawing_spec)
+    drawing["template_path"] = _template_identity(drawing_spec.template_path)
+
+    payload = {
+        "solid": canonical_solid_spec(solid_spec, tolerance),
+        "drawing": _quantise(drawing, tolerance),
+        "svg": bool(with_svg),
+    }
+    if backend != "techdraw":
+        # Only added for other backends, so existing TechDraw entries
+        # keep their fingerprints.
+        payload["backend"] = backend
+    if boolean:
+        payload["boolean"] = list(boolean)
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf8")).hexdigest()
+
+
+# Job options that shape the outputs or the result envelope; requests
+# differing in any of them are not interchangeable.
+_RESULT_OPTIONS = (
+    "backend",
+    "boolean",
+    "echo_specs",
+    "incremental",
+    "project_views",
+    "stl_angular_tolerance",
+    "stl_tolerance",
+    "thumbnail_size",
+)
+
+
+def request_fingerprint(
+    job: Any, tolerance: float = DEFAULT_TOLERANCE
+) -> Optional[str]:
+    """Return a SHA-256 fingerprint of everything ``job`` produces.
+
+    Unlike :func:`job_fingerprint` this covers every kind of job
+    (geometry exports too) and the options that shape its result, but
+    still not the output paths or ``job_id``: two requests with the same
+    fingerprint produce the same artifacts, each at its own paths. Used
+    to coalesce concurrent duplicate requests.
+
+    Returns ``None`` for invalid jobs (they fail fast on their own) and
+    for jobs sent with ``"use_cache": false``.
+    """
+
+    from .job_codec import expand_outputs
+    from .spec_parsing import drawing_spec_from_dict, solid_spec_from_dict
+    from .validation import JobValidationError, validate_job
+
+    if not isinstance(job, dict) or job.get("use_cache", True) is False:
+        return None
+    if "outputs" in job:
+        job = dict(job)
+        try:
+            expand_outputs(job)
+        except JobValidationError:
+            return None
+    if validate_job(job):
+        return None
+
+    payload: Dict[str, Any] = {
+        "solid": canonical_solid_spec(solid_spec_from_dict(job["solid"]), tolerance),
+        "outputs": sorted(k for k in job if k.startswith("output_") and job[k]),
+        "options": {k: job[k] for k in _RESULT_OPTIONS if k in job},
+    }
+    if job.get("drawing") is not None:
+        drawing_spec = drawing_spec_from_dict(job["drawing"])
+        drawing = asdict(drawing_spec)
+        drawing["template_path"] = _template_identity(drawing_spec.template_path)
+        payload["drawing"] = _quantise(drawing, tolerance)
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf8")).hexdigest()
+
+
+@dataclass
+class ArtifactEntry:
+    """A cached rendering of one job."""
+
+    fingerprint: str
+    pdf_path: Path
+    svg_path: Optional[Path]
+    elapsed_s: float
+
+
+def _copy_into_place(src: Path, dst: Path) -> None:
+    """Copy ``src`` to ``dst`` through a temporary file and a rename.
+
+    Never a hard link: exporters truncate and rewrite their output paths
+    in place, so a later job rendering to ``dst`` would write through a
+    shared inode into the store entry. The rename also replaces any link
+    an older version left at ``dst`` instead of writing into it.
+    """
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{dst.name}.", suffix=".tmp", dir=dst.parent)
+    try:
+        with os.fdopen(fd, "wb") as out, open(src, "rb") as data:
+            shutil.copyfileobj(data, out)
+        shutil.copymode(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+class ArtifactStore:
+    """Content-addressed directory of rendered drawings."""
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["ArtifactStore"]:
+        """Return a store rooted at ``SCANMASTER_ARTIFACT_CACHE_DIR``, if set."""
+
+        root = os.environ.get("SCANMASTER_ARTIFACT_CACHE_DIR")
+        return cls(root) if root else None
+
+    def _entry_dir(self, fingerprint: str) -> Path:
+        return self.root / fingerprint[:2] / fingerprint
+
+    def lookup(self, fingerprint: str, with_svg: bool) -> Optional[ArtifactEntry]:
+        """Return the cached entry for ``fingerprint``, or ``None``."""
+
+        entry_dir = self._entry_dir(fingerprint)
+        pdf_path = entry_dir / _PDF_NAME
+        svg_path = entry_dir / _SVG_NAME
+        meta_path = entry_dir / _META_NAME
+
+        if not pdf_path.is_file() or not meta_path.is_file():
+            return None
+        if with_svg and not svg_path.is_file():
+            return None
+
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf8"))
+        except (OSError, ValueError):
+            return None
+
+        return ArtifactEntry(
+            fingerprint=fingerprint,
+            pdf_path=pdf_path,
+            svg_path=svg_path if with_svg else None,
+            elapsed_s=float(meta.get("elapsed_s", 0.0)),
+        )
+
+    def store(
+        self,
+        fingerprint: str,
+        pdf_path: str,
+        svg_path: Optional[str],
+        elapsed_s: float,
+    ) -> None:
+        """Add freshly rendered artifacts to the store.
+
+        Files are staged in a temporary directory and moved into place
+        with a single rename, so a concurrent reader either sees the
+        complete entry or nothing.
+        """
+
+        entry_dir = self._entry_dir(fingerprint)
+        if entry_dir.exists():
+            return
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=entry_dir.parent))
+        try:
+            shutil.copyfile(pdf_path, staging / _PDF_NAME)
+            if svg_path is not None:
+                shutil.copyfile(svg_path, staging / _SVG_NAME)
+            (staging / _META_NAME).write_text(
+                json.dumps({"fingerprint": fingerprint, "elapsed_s": elapsed_s}),
+                encoding="utf8",
+            )
+            try:
+                os.rename(staging, entry_dir)
+            except OSError:
+                # Another worker stored the same fingerprint first.
+                pass
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def materialise(
+        self,
+        entry: ArtifactEntry,
+        output_pdf: str,
+        output_svg: Optional[str],
+    ) -> None:
+        """Copy a cached entry to the requested outputs."""
+
+        _copy_into_place(entry.pdf_path, Path(output_pdf))
+        if output_svg is not None and entry.svg_path is not None:
+            _copy_into_place(entry.svg_path, Path(output_svg))
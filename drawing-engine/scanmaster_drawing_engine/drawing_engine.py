@@ -20,17 +20,23 @@ application, you must point ``FREECAD_PATH`` to its ``bin`` or ``lib``
 folder so that ``import FreeCAD`` and ``import TechDraw`` succeed.
 """
 
+import contextlib
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
-import cadquery as cq
+from .geometry_engine import _SLOTS
+from .instrumentation import stage
+from .process_stats import memory_stats
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import cadquery as cq
 
 
 # ----- Specs --------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ViewSpec:
     """Specification of a single view on the drawing page.
 
@@ -59,7 +65,7 @@ class ViewSpec:
     scale: Optional[float] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DimensionSpec:
     """Specification of one dimension tied to a view.
 
@@ -87,7 +93,7 @@ class DimensionSpec:
     edges: List[str]
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DrawingSpec:
     """High-level specification of an entire drawing page."""
 
@@ -122,11 +128,137 @@ def _ensure_freecad_on_path() -> None:
         sys.path.append(freecad_path)
 
 
+def _import_freecad() -> Any:
+    _ensure_freecad_on_path()
+
+    # Import FreeCAD lazily after the path was set up.
+    import FreeCAD as App  # type: ignore[import]
+    import TechDraw  # type: ignore[import]  # noqa: F401 - registers types
+
+    return App
+
+
+def _clear_document(doc: Any) -> None:
+    """Remove every object from ``doc``.
+
+    Objects are removed newest first so that dependents (dimensions,
+    views, pages) go before the objects they reference.
+    """
+
+    for obj in reversed(list(doc.Objects)):
+        # Removing a page may already have taken its views with it.
+        if doc.getObject(obj.Name) is not None:
+            doc.removeObject(obj.Name)
+    doc.recompute()
+
+
+class DocumentSession:
+    """Owns the FreeCAD document used by :func:`generate_drawing`.
+
+    A long-lived worker would otherwise create one document per drawing
+    and never close it. The session instead hands out a single
+    document, clears all objects after each job, and closes/recreates
+    the document every ``recycle_after`` jobs to release anything
+    FreeCAD keeps internally.
+
+    The session is not thread-safe (neither is FreeCAD); use one per
+    process.
+
+    Example::
+
+        session = DocumentSession()
+        generate_drawing(solid, spec, "a.pdf", session=session)
+        generate_drawing(solid, spec, "b.pdf", session=session)
+        session.close()
+    """
+
+    def __init__(self, recycle_after: int = 100, name: str = "ScanMasterDrawing") -> None:
+        if recycle_after <= 0:
+            raise ValueError("DocumentSession.recycle_after must be positive")
+        self.recycle_after = recycle_after
+        self.name = name
+
+        self._doc: Any = None
+        self._jobs_on_doc = 0
+        self._jobs = 0
+        self._documents_created = 0
+        self._documents_closed = 0
+
+    @contextlib.contextmanager
+    def document(self, label: Optional[str] = None) -> Iterator[Any]:
+        """Yield an empty document for one job and clean it up afterwards."""
+
+        App = _import_freecad()
+        if self._doc is None:
+            self._doc = App.newDocument(self.name)
+            # Undo history would otherwise grow with every job.
+            self._doc.UndoMode = 0
+            self._documents_created += 1
+
+        doc = self._doc
+        if label is not None:
+            doc.Label = label
+
+        try:
+            yield doc
+        finally:
+            self._jobs += 1
+            self._jobs_on_doc += 1
+            with stage("freecad.document_cleanup"):
+                if self._jobs_on_doc >= self.recycle_after:
+                    self.close()
+                else:
+                    try:
+                        _clear_document(doc)
+                    except Exception:
+                        # A document that cannot be cleared is not reused.
+                        self.close()
+
+    def close(self) -> None:
+        """Close the current document, if any."""
+
+        if self._doc is None:
+            return
+        App = _import_freecad()
+        App.closeDocument(self._doc.Name)
+        self._doc = None
+        self._jobs_on_doc = 0
+        self._documents_closed += 1
+
+    def __enter__(self) -> "DocumentSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job/document counters plus resident-memory figures."""
+
+        return {
+            "jobs": self._jobs,
+            "documents_created": self._documents_created,
+            "documents_closed": self._documents_closed,
+            "document_open": self._doc is not None,
+            **memory_stats(),
+        }
+
+
+@contextlib.contextmanager
+def _one_off_document(label: str) -> Iterator[Any]:
+    App = _import_freecad()
+    doc = App.newDocument(label)
+    try:
+        yield doc
+    finally:
+        App.closeDocument(doc.Name)
+
+
 def generate_drawing(
     solid: cq.Workplane,
     spec: DrawingSpec,
     output_pdf: str,
     output_svg: Optional[str] = None,
+    session: Optional[DocumentSession] = None,
 ) -> None:
     """Generate a CAD drawing from a CadQuery solid and a spec.
 
@@ -140,20 +272,37 @@ def generate_drawing(
         Target path for the generated PDF.
     output_svg:
         Optional path for an additional SVG export of the same page.
+    session:
+        Optional :class:`DocumentSession` to reuse a document across
+        calls. Without one, a fresh document is created and closed
+        again before returning.
     """
 
-    _ensure_freecad_on_path()
+    if session is not None:
+        doc_context = session.document(label=spec.page_title)
+    else:
+        doc_context = _one_off_document(spec.page_title)
 
-    # Import FreeCAD lazily after the path was set up.
-    import FreeCAD as App  # type: ignore[import]
-    import TechDraw  # type: ignore[import]
+    with stage("freecad.import"):
+        _import_freecad()
 
-    doc = App.newDocument(spec.page_title)
+    with doc_context as doc:
+        _populate_and_export(doc, solid, spec, output_pdf, output_svg)
 
+
+def _populate_and_export(
+    doc: Any,
+    solid: cq.Workplane,
+    spec: DrawingSpec,
+    output_pdf: str,
+    output_svg: Optional[str],
+) -> None:
     # Add the part solid to the document.
     part_obj = doc.addObject("Part::Feature", "Body")
-    part_obj.Shape = solid.val().toFreecad()
-    doc.recompute()
+    with stage("freecad.to_shape"):
+        part_obj.Shape = solid.val().toFreecad()
+    with stage("freecad.recompute", phase="body"):
+        doc.recompute()
 
     # Create a TechDraw page with an SVG template (e.g. A4 landscape).
     page = doc.addObject("TechDraw::DrawPage", "Page")
@@ -180,7 +329,8 @@ def generate_drawing(
         page.addView(view)
         view_objects[vspec.id] = view
 
-    doc.recompute()
+    with stage("freecad.recompute", phase="views", views=len(spec.views)):
+        doc.recompute()
 
     # Second pass: add dimensions.
     for dspec in spec.dimensions:
@@ -208,14 +358,17 @@ def generate_drawing(
         dim.FormatSpec = dspec.label
         page.addView(dim)
 
-    doc.recompute()
+    with stage("freecad.recompute", phase="dimensions", dimensions=len(spec.dimensions)):
+        doc.recompute()
 
     # Export:
     out_pdf_path = Path(output_pdf)
     out_pdf_path.parent.mkdir(parents=True, exist_ok=True)
-    page.exportPageAsPdf(str(out_pdf_path))
+    with stage("techdraw.export_pdf"):
+        page.exportPageAsPdf(str(out_pdf_path))
 
     if output_svg is not None:
         out_svg_path = Path(output_svg)
         out_svg_path.parent.mkdir(parents=True, exist_ok=True)
-        page.exportPageAsSvg(str(out_svg_path))
+        with stage("techdraw.export_svg"):
+            page.exportPageAsSvg(str(out_svg_path))
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+"""Direct 3D exports of CadQuery solids (no FreeCAD required).
+
+Callers that only need the model – for the 3D viewer or for downstream
+CAM/inspection software – do not need a TechDraw page. These helpers
+write STEP, STL and BREP files and PNG thumbnails straight from the
+solid produced by
+:class:`~scanmaster_drawing_engine.geometry_engine.GeometryEngine`.
+
+None of them touches FreeCAD, so :func:`submit_geometry_exports` can
+run them on worker threads while the caller draws the TechDraw page.
+The STL exporter meshes a private copy of the shape: meshing stores the
+triangulation on the shape, which would otherwise race with the other
+exporters (and end up in BREP files and the solid cache).
+"""
+
+import concurrent.futures
+import contextvars
+import struct
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence
+
+from .instrumentation import stage
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import cadquery as cq
+
+    from .projection import ProjectionCache
+
+
+DEFAULT_STL_TOLERANCE = 0.1
+DEFAULT_STL_ANGULAR_TOLERANCE = 0.1
+
+#: Edge length of PNG thumbnails, in pixels.
+DEFAULT_THUMBNAIL_SIZE = 256
+
+#: Isometric view direction of PNG thumbnails.
+THUMBNAIL_DIRECTION = (1.0, -1.0, 1.0)
+
+#: Supported geometry formats, in the order they are exported.
+GEOMETRY_FORMATS = ("step", "stl", "brep", "png")
+
+
+def _prepare(path: str) -> Path:
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    return out
+
+
+def export_step(solid: cq.Workplane, path: str) -> None:
+    """Write ``solid`` as a STEP file."""
+
+    import cadquery as cq
+
+    cq.exporters.export(solid, str(_prepare(path)), exportType="STEP")
+
+
+def export_stl(
+    solid: cq.Workplane,
+    path: str,
+    tolerance: float = DEFAULT_STL_TOLERANCE,
+    angular_tolerance: float = DEFAULT_STL_ANGULAR_TOLERANCE,
+) -> None:
+    """Write ``solid`` as a binary STL file.
+
+    Parameters
+    ----------
+    tolerance:
+        Maximum linear deviation of the tessellation from the true
+        surface, in model units. Smaller values give finer meshes.
+    angular_tolerance:
+        Maximum angular deviation between adjacent facets, in radians.
+    """
+
+    import cadquery as cq
+
+    if tolerance <= 0 or angular_tolerance <= 0:
+        raise ValueError("STL tolerances must be positive")
+    cq.exporters.export(
+        solid,
+        str(_prepare(path)),
+        exportType="STL",
+        tolerance=tolerance,
+        angularTolerance=angular_tolerance,
+    )
+
+
+def export_brep(solid: cq.Workplane, path: str) -> None:
+    """Write ``solid`` as an OCCT BREP file (lossless, fastest to write)."""
+
+    solid.val().exportBrep(str(_prepare(path)))
+
+
+def _raster_lines(
+    polylines: Sequence[Sequence[Sequence[float]]], size: int, margin: int
+) -> Any:
+    """Draw ``polylines`` (view coordinates, ``y`` up) black on white,
+    scaled to fit a ``size`` x ``size`` image."""
+
+    import numpy as np
+
+    image = np.full((size, size), 255, dtype=np.uint8)
+    segments = [
+        (a, b) for line in polylines for a, b in zip(line[:-1], line[1:])
+    ]
+    if not segments:
+        return image
+
+    ends = np.asarray(segments, dtype=float)  # (n, 2 points, 2 coords)
+    lower = ends.reshape(-1, 2).min(axis=0)
+    upper = ends.reshape(-1, 2).max(axis=0)
+    k = (size - 1 - 2 * margin) / (float((upper - lower).max()) or 1.0)
+    pixels = (ends - (lower + upper) / 2) * k + (size - 1) / 2
+    pixels[..., 1] = size - 1 - pixels[..., 1]
+
+    # Sample every segment at (at least) one point per pixel.
+    lengths = np.hypot(*(pixels[:, 1] - pixels[:, 0]).T)
+    steps = np.ceil(lengths).astype(int) + 1
+    t = np.concatenate([np.linspace(0.0, 1.0, n) for n in steps])
+    start = np.repeat(pixels[:, 0], steps, axis=0)
+    delta = np.repeat(pixels[:, 1] - pixels[:, 0], steps, axis=0)
+    points = np.rint(start + delta * t[:, None]).astype(int).clip(0, size - 1)
+    image[points[:, 1], points[:, 0]] = 0
+    return image
+
+
+def _write_png(path: Path, image: Any) -> None:
+    """Write a 2D ``uint8`` array as an 8-bit greyscale PNG."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    height, width = image.shape
+    # Each scanline starts with filter type 0 (none).
+    raw = b"".join(b"\x00" + row.tobytes() for row in image)
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def export_png(
+    solid: cq.Workplane,
+    path: str,
+    size: int = DEFAULT_THUMBNAIL_SIZE,
+    projections: Optional[ProjectionCache] = None,
+    shape_key: Optional[str] = None,
+) -> None:
+    """Write an isometric line-drawing thumbnail of ``solid`` as a PNG.
+
+    The visible edges come from the hidden-line projection of
+    :mod:`~scanmaster_drawing_engine.projection` (so ``projections`` and
+    ``shape_key`` let repeated thumbnails of a solid skip the HLR); the
+    image is rasterised and encoded here, without an imaging library.
+    """
+
+    from .drawing_engine import ViewSpec
+    from .projection import project_views
+
+    if size < 16:
+        raise ValueError("thumbnail size must be at least 16 pixels")
+    (view,) = project_views(
+        solid,
+        [ViewSpec(id="THUMBNAIL", direction=THUMBNAIL_DIRECTION)],
+        cache=projections,
+        shape_key=shape_key,
+    )
+    image = _raster_lines(view.projection.visible, size, margin=max(2, size // 32))
+    _write_png(_prepare(path), image)
+
+
+def _finished(fn: Callable[[], str]) -> concurrent.futures.Future:
+    """Run ``fn`` now and wrap its outcome in a completed future."""
+
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    try:
+        future.set_result(fn())
+    except BaseException as exc:  # noqa: BLE001 - re-raised by .result()
+        future.set_exception(exc)
+    return future
+
+
+def submit_geometry_exports(
+    executor: Optional[concurrent.futures.Executor],
+    solid: cq.Workplane,
+    outputs: Dict[str, str],
+    stl_tolerance: float = DEFAULT_STL_TOLERANCE,
+    stl_angular_tolerance: float = DEFAULT_STL_ANGULAR_TOLERANCE,
+    thumbnail_size: int = DEFAULT_THUMBNAIL_SIZE,
+    projections: Optional[ProjectionCache] = None,
+    shape_key: Optional[str] = None,
+) -> Dict[str, concurrent.futures.Future]:
+    """Start exporting ``solid`` to every format in ``outputs``.
+
+    ``outputs`` maps a format name from :data:`GEOMETRY_FORMATS` to a
+    target path. Each export is submitted to ``executor`` as its own
+    task (with ``executor=None`` they run right here, one after the
+    other). Returns one future per format, resolving to the written
+    path; ``export.<fmt>`` stages are recorded in the caller's timings.
+    """
+
+    import cadquery as cq
+
+    def stl(s: cq.Workplane, p: str) -> None:
+        private = cq.Workplane().add(s.val().copy())
+        export_stl(private, p, stl_tolerance, stl_angular_tolerance)
+
+    exporters: Dict[str, Callable[[cq.Workplane, str], None]] = {
+        "step": export_step,
+        "stl": stl,
+        "brep": export_brep,
+        "png": lambda s, p: export_png(s, p, thumbnail_size, projections, shape_key),
+    }
+    unknown = [fmt for fmt in outputs if fmt not in exporters]
+    if unknown:
+        raise ValueError(f"Unsupported geometry export format: {unknown[0]!r}")
+
+    def run(fmt: str, resolved: str) -> str:
+        with stage(f"export.{fmt}"):
+            exporters[fmt](solid, resolved)
+        return resolved
+
+    futures: Dict[str, concurrent.futures.Future] = {}
+    for fmt, path in outputs.items():
+        resolved = str(Path(path).resolve())
+        if executor is None:
+            futures[fmt] = _finished(lambda: run(fmt, resolved))
+        else:
+            # The context carries the active Timings into the worker.
+            context = contextvars.copy_context()
+            futures[fmt] = executor.submit(context.run, run, fmt, resolved)
+    return futures
+
+
+def export_geometry(
+    solid: cq.Workplane,
+    outputs: Dict[str, str],
+    stl_tolerance: float = DEFAULT_STL_TOLERANCE,
+    stl_angular_tolerance: float = DEFAULT_STL_ANGULAR_TOLERANCE,
+    thumbnail_size: int = DEFAULT_THUMBNAIL_SIZE,
+    max_workers: int = 1,
+) -> Dict[str, str]:
+    """Export ``solid`` to every format in ``outputs``.
+
+    ``outputs`` maps a format name from :data:`GEOMETRY_FORMATS` to a
+    target path. With ``max_workers > 1`` the formats are written
+    concurrently. Returns the same mapping with resolved paths.
+    """
+
+    options: Dict[str, Any] = dict(
+        stl_tolerance=stl_tolerance,
+        stl_angular_tolerance=stl_angular_tolerance,
+        thumbnail_size=thumbnail_size,
+    )
+    if max_workers <= 1 or len(outputs) <= 1:
+        futures = submit_geometry_exports(None, solid, outputs, **options)
+        return {fmt: future.result() for fmt, future in futures.items()}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(max_workers, len(outputs)), thread_name_prefix="export"
+    ) as pool:
+        futures = submit_geometry_exports(pool, solid, outputs, **options)
+        return {fmt: future.result() for fmt, future in futures.items()}
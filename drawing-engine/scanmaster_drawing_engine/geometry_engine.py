@@ -11,16 +11,47 @@ etc. Those should be expressed purely as ``SolidSpec`` instances built
 in higher-level code (or from JSON coming from your TypeScript side).
 """
 
-from dataclasses import dataclass
-from typing import List, Literal, Union, Optional
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-import cadquery as cq
+from .instrumentation import stage
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import cadquery as cq
+    import numpy as np
+
+    from .solid_cache import SolidCache
+    from .tool_prefilter import ToolPlacement, ToolPrefilterReport
+
+# CadQuery (and with it OCP/OCCT) and NumPy are imported inside the
+# functions that build geometry: importing this module, constructing
+# specs and validating them stays cheap.
+
+# Specs are slotted (no per-instance __dict__) where Python supports it,
+# which roughly halves their memory in specs with many operations.
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 # ----- sketch / operation specs -------------------------------------------------
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SketchCircle:
     """A circle in the XY sketch plane.
 
@@ -37,14 +68,14 @@ class SketchCircle:
     is_hole: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Extrude:
     """Extrusion along the +Z axis from the current sketch profile."""
 
     length: float
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class BaseBox:
     """Axis-aligned box primitive used as a base solid.
 
@@ -59,7 +90,7 @@ class BaseBox:
     centered_z: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CutBox:
     """Axis-aligned box that is *subtracted* (cut) from the current solid."""
 
@@ -69,12 +100,17 @@ class CutBox:
     center: tuple[float, float, float]
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ThroughHole:
     """Cylindrical through-hole cut into the current solid.
 
     The cylinder's axis is given by ``axis`` (one of "x", "y", "z") and
-    the cylinder is centred at ``center``.
+    it is ``4 * depth`` long, centred on the plane through the origin
+    normal to that axis. ``center`` positions it across the axis, in the
+    sketch plane of the axis (see
+    :meth:`GeometryEngine._through_hole_offset`): ``(cx, cy)`` for "z",
+    ``(cx, cz)`` for "y" and, for "x", ``y = cz`` and ``z = cy``; the
+    coordinate along the axis is not used.
     """
 
     radius: float
@@ -83,10 +119,237 @@ class ThroughHole:
     center: tuple[float, float, float] = (0.0, 0.0, 0.0)
 
 
-Operation = Union[SketchCircle, Extrude, BaseBox, CutBox, ThroughHole]
+@dataclass(**_SLOTS)
+class HoleArray:
+    """Pattern of identical cylindrical through-holes.
 
+    One ``HoleArray`` replaces a ladder of individual
+    :class:`ThroughHole` operations. Every hole has the given ``radius``,
+    ``depth`` and ``axis``; hole centres are generated from ``origin``
+    according to ``layout`` and each one places its hole exactly like
+    :attr:`ThroughHole.center`:
 
-@dataclass
+    ``"linear"``
+        ``count`` holes at ``origin + i * pitch``.
+    ``"grid"``
+        ``rows`` x ``count`` holes at
+        ``origin + r * row_pitch + i * pitch``.
+    ``"polar"``
+        ``count`` holes on a circle of radius ``pattern_radius`` around
+        ``origin``, in the plane perpendicular to ``axis``, starting at
+        ``start_angle`` degrees. A ``sweep_angle`` of 360 spaces them
+        evenly around the full circle; smaller sweeps include both ends.
+    """
+
+    radius: float
+    depth: float
+    count: int
+    layout: Literal["linear", "grid", "polar"] = "linear"
+    axis: Literal["x", "y", "z"] = "z"
+    origin: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    pitch: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    rows: int = 1
+    row_pitch: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    pattern_radius: float = 0.0
+    start_angle: float = 0.0
+    sweep_angle: float = 360.0
+
+
+def hole_array_centers(op: HoleArray) -> np.ndarray:
+    """Return the ``(N, 3)`` array of hole centres described by ``op``."""
+
+    import numpy as np
+
+    origin = np.asarray(op.origin, dtype=float)
+    index = np.arange(op.count, dtype=float)
+
+    if op.layout == "linear":
+        return origin + index[:, None] * np.asarray(op.pitch, dtype=float)
+
+    if op.layout == "grid":
+        row_index = np.arange(op.rows, dtype=float)
+        cols = index[None, :, None] * np.asarray(op.pitch, dtype=float)
+        rows = row_index[:, None, None] * np.asarray(op.row_pitch, dtype=float)
+        return (origin + rows + cols).reshape(-1, 3)
+
+    # "polar"
+    if op.sweep_angle >= 360.0 or op.count == 1:
+        step = op.sweep_angle / op.count
+    else:
+        step = op.sweep_angle / (op.count - 1)
+    angles = np.radians(op.start_angle + index * step)
+    u = op.pattern_radius * np.cos(angles)
+    v = op.pattern_radius * np.sin(angles)
+    zeros = np.zeros_like(u)
+    if op.axis == "z":
+        offsets = np.column_stack((u, v, zeros))
+    elif op.axis == "x":
+        offsets = np.column_stack((zeros, u, v))
+    else:  # "y"
+        offsets = np.column_stack((u, zeros, v))
+    return origin + offsets
+
+
+# ----- array-backed operation tables -------------------------------------------
+
+
+def _fingerprint_arrays(kind: str, *arrays: Any) -> str:
+    digest = hashlib.sha256(kind.encode("utf8"))
+    for array in arrays:
+        digest.update(f"{array.dtype}{array.shape}".encode("utf8"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+@dataclass(**_SLOTS)
+class ThroughHoleTable:
+    """Many :class:`ThroughHole` operations stored as NumPy columns.
+
+    Dense hole grids (FBH/SDH patterns with tens of thousands of holes)
+    are cheaper as one table than as one object per hole: a row costs
+    five float64 values plus one axis character.
+
+    Parameters
+    ----------
+    radius, depth:
+        Float arrays of shape ``(N,)``.
+    center:
+        Float array of shape ``(N, 3)``.
+    axis:
+        One of ``"x"``, ``"y"``, ``"z"`` for every hole, or a string
+        array of shape ``(N,)``.
+    """
+
+    radius: np.ndarray
+    depth: np.ndarray
+    center: np.ndarray
+    axis: Union[str, np.ndarray] = "z"
+
+    @classmethod
+    def from_operations(cls, holes: Sequence[ThroughHole]) -> "ThroughHoleTable":
+        import numpy as np
+
+        return cls(
+            radius=np.array([h.radius for h in holes], dtype=float),
+            depth=np.array([h.depth for h in holes], dtype=float),
+            center=np.array([h.center for h in holes], dtype=float).reshape(-1, 3),
+            axis=np.array([h.axis for h in holes], dtype="<U1"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.radius)
+
+    def axes(self) -> np.ndarray:
+        """Return the axis of every row as a string array."""
+
+        import numpy as np
+
+        return np.broadcast_to(np.asarray(self.axis, dtype="<U1"), (len(self),))
+
+    def rows(self) -> Iterator[ThroughHole]:
+        """Yield the table as individual :class:`ThroughHole` operations."""
+
+        for radius, depth, center, axis in zip(
+            self.radius.tolist(),
+            self.depth.tolist(),
+            self.center.tolist(),
+            self.axes().tolist(),
+        ):
+            yield ThroughHole(
+                radius=radius, depth=depth, axis=axis, center=tuple(center)
+            )
+
+    def validate(self) -> None:
+        import numpy as np
+
+        n = len(self)
+        if self.depth.shape != (n,) or self.center.shape != (n, 3):
+            raise ValueError(
+                "ThroughHoleTable columns must have shapes (N,), (N,), (N, 3)"
+            )
+        if n and (self.radius.min() <= 0 or self.depth.min() <= 0):
+            raise ValueError("ThroughHoleTable.radius/depth must be positive")
+        if not np.isin(self.axes(), ("x", "y", "z")).all():
+            raise ValueError("ThroughHoleTable.axis must be one of 'x', 'y', 'z'")
+
+    def fingerprint(self) -> str:
+        return _fingerprint_arrays(
+            "ThroughHoleTable", self.radius, self.depth, self.center, self.axes()
+        )
+
+
+@dataclass(**_SLOTS)
+class CutBoxTable:
+    """Many :class:`CutBox` operations stored as NumPy columns.
+
+    ``width``, ``depth`` and ``height`` are float arrays of shape
+    ``(N,)``, ``center`` a float array of shape ``(N, 3)``.
+    """
+
+    width: np.ndarray
+    depth: np.ndarray
+    height: np.ndarray
+    center: np.ndarray
+
+    @classmethod
+    def from_operations(cls, boxes: Sequence[CutBox]) -> "CutBoxTable":
+        import numpy as np
+
+        return cls(
+            width=np.array([b.width for b in boxes], dtype=float),
+            depth=np.array([b.depth for b in boxes], dtype=float),
+            height=np.array([b.height for b in boxes], dtype=float),
+            center=np.array([b.center for b in boxes], dtype=float).reshape(-1, 3),
+        )
+
+    def __len__(self) -> int:
+        return len(self.width)
+
+    def rows(self) -> Iterator[CutBox]:
+        """Yield the table as individual :class:`CutBox` operations."""
+
+        for width, depth, height, center in zip(
+            self.width.tolist(),
+            self.depth.tolist(),
+            self.height.tolist(),
+            self.center.tolist(),
+        ):
+            yield CutBox(width=width, depth=depth, height=height, center=tuple(center))
+
+    def validate(self) -> None:
+        n = len(self)
+        if (
+            self.depth.shape != (n,)
+            or self.height.shape != (n,)
+            or self.center.shape != (n, 3)
+        ):
+            raise ValueError(
+                "CutBoxTable columns must have shapes (N,), (N,), (N,), (N, 3)"
+            )
+        if n and min(self.width.min(), self.depth.min(), self.height.min()) <= 0:
+            raise ValueError("CutBoxTable dimensions must be positive")
+
+    def fingerprint(self) -> str:
+        return _fingerprint_arrays(
+            "CutBoxTable", self.width, self.depth, self.height, self.center
+        )
+
+
+OperationTable = Union[ThroughHoleTable, CutBoxTable]
+
+Operation = Union[
+    SketchCircle,
+    Extrude,
+    BaseBox,
+    CutBox,
+    ThroughHole,
+    HoleArray,
+    ThroughHoleTable,
+    CutBoxTable,
+]
+
+
+@dataclass(**_SLOTS)
 class SolidSpec:
     """Generic description of how to build one solid body.
 
@@ -100,7 +363,9 @@ class SolidSpec:
             * Use a single :class:`BaseBox` operation to define the base
                 solid directly.
         * Optionally apply one or more 3D modifier operations such as
-            :class:`CutBox` or :class:`ThroughHole` to remove material.
+            :class:`CutBox`, :class:`ThroughHole` or :class:`HoleArray` to
+            remove material. Large numbers of cut boxes or holes can be
+            given as one :class:`CutBoxTable` / :class:`ThroughHoleTable`.
 
     More operation types (rectangles, pockets, chamfers, etc.) can be
     added later without changing the overall structure.
@@ -110,21 +375,240 @@ class SolidSpec:
     operations: List[Operation]
 
 
+def validate_solid_spec(spec: SolidSpec) -> None:
+    """Check ``spec`` without building it.
+
+    Runs the same checks as :meth:`GeometryEngine.build_solid` and raises
+    the same ``ValueError``, but never imports CadQuery.
+    """
+
+    GeometryEngine()._bucket_operations(spec)
+
+
+@dataclass
+class _OperationBuckets:
+    """Operations of one spec, grouped by role (see ``_bucket_operations``)."""
+
+    sketch_circles: List[SketchCircle]
+    extrude_op: Optional[Extrude]
+    base_box: Optional[BaseBox]
+    cut_boxes: List[CutBox]
+    through_holes: List[ThroughHole]
+    hole_arrays: List[HoleArray]
+    tables: List[OperationTable]
+
+    def base_key(self) -> Tuple[object, ...]:
+        """Hashable identity of the base solid these operations produce."""
+
+        if self.base_box is not None:
+            bb = self.base_box
+            return ("box", bb.width, bb.depth, bb.height, bb.centered_xy, bb.centered_z)
+        radii = sorted(sc.radius for sc in self.sketch_circles if not sc.is_hole)
+        length = self.extrude_op.length if self.extrude_op is not None else None
+        return ("extrude", length, tuple(radii))
+
+    def base_count(self) -> int:
+        """Number of spec operations that make up the base solid."""
+
+        if self.base_box is not None:
+            return 1
+        return 1 + sum(1 for sc in self.sketch_circles if not sc.is_hole)
+
+
+def _is_modifier(op: Operation) -> bool:
+    if isinstance(op, SketchCircle):
+        return op.is_hole
+    return isinstance(
+        op, (CutBox, ThroughHole, HoleArray, ThroughHoleTable, CutBoxTable)
+    )
+
+
+def _step_identity(op: Operation) -> Tuple[str, object]:
+    if isinstance(op, (ThroughHoleTable, CutBoxTable)):
+        # repr() of large arrays is abbreviated; hash their contents.
+        return (type(op).__name__, op.fingerprint())
+    return (type(op).__name__, asdict(op))
+
+
+def _chain_key(previous: str, step: object) -> str:
+    return hashlib.sha256(f"{previous}|{step!r}".encode("utf8")).hexdigest()
+
+
+@dataclass
+class RebuildResult:
+    """Outcome of :meth:`GeometryEngine.rebuild`.
+
+    ``reused`` and ``recomputed`` count spec operations: the base
+    operations count as reused when the base solid came from the prefix
+    cache, each modifier when the shape after it did.
+    """
+
+    solid: cq.Workplane
+    operations: int
+    reused: int
+    recomputed: int
+
+    def report(self) -> Dict[str, int]:
+        return {
+            "operations": self.operations,
+            "reused": self.reused,
+            "recomputed": self.recomputed,
+        }
+
+
+_GLUE_MODES = ("off", "shift", "full")
+
+
+@dataclass(**_SLOTS)
+class BooleanOptions:
+    """OCCT settings for the boolean cuts of :class:`GeometryEngine`.
+
+    Parameters
+    ----------
+    parallel:
+        Run the boolean in OCCT's parallel mode (intersections of the
+        tools with the solid are computed on several threads). The
+        threads come from OCCT's process-wide pool, sized once with
+        :func:`configure_occt_threads`.
+    fuzzy:
+        Fuzzy tolerance: sub-shapes closer than this are treated as
+        coincident. Helps with tools that nearly touch faces of the
+        solid; ``0`` uses OCCT's default tolerances.
+    glue:
+        ``"shift"`` or ``"full"`` enable OCCT's gluing mode, a faster
+        path for arguments that only share coplanar or coincident faces
+        (e.g. abutting pockets) but do not otherwise intersect; ``"off"``
+        is the general algorithm.
+    """
+
+    parallel: bool = True
+    fuzzy: float = 0.0
+    glue: Literal["off", "shift", "full"] = "off"
+
+    @classmethod
+    def from_env(cls) -> "BooleanOptions":
+        """Read ``SCANMASTER_BOOLEAN_PARALLEL`` (``0``/``1``),
+        ``SCANMASTER_BOOLEAN_FUZZY`` and ``SCANMASTER_BOOLEAN_GLUE``;
+        unset variables keep the defaults."""
+
+        fuzzy = os.environ.get("SCANMASTER_BOOLEAN_FUZZY") or "0"
+        try:
+            fuzzy_value = float(fuzzy)
+        except ValueError:
+            raise ValueError(
+                f"SCANMASTER_BOOLEAN_FUZZY must be a number, got {fuzzy!r}"
+            ) from None
+        options = cls(
+            parallel=os.environ.get("SCANMASTER_BOOLEAN_PARALLEL", "1") != "0",
+            fuzzy=fuzzy_value,
+            glue=os.environ.get("SCANMASTER_BOOLEAN_GLUE", "off"),  # type: ignore[arg-type]
+        )
+        options.validate()
+        return options
+
+    def validate(self) -> None:
+        if self.fuzzy < 0:
+            raise ValueError("BooleanOptions.fuzzy must not be negative")
+        if self.glue not in _GLUE_MODES:
+            raise ValueError(
+                "BooleanOptions.glue must be one of 'off', 'shift', 'full'"
+            )
+
+    def result_key(self) -> Tuple[object, ...]:
+        """Options that can change the cut shape, for cache keys.
+
+        Empty for the defaults, so default builds keep their keys;
+        ``parallel`` only changes how fast OCCT gets there.
+        """
+
+        if self.fuzzy == 0 and self.glue == "off":
+            return ()
+        return ("boolean", self.fuzzy, self.glue)
+
+
 class GeometryEngine:
     """Builds CadQuery solids from :class:`SolidSpec` objects.
 
-    The engine knows how to interpret a minimal set of operations. It is
-    intentionally stateless and functional – you can create a new
-    instance per build, or keep one global instance.
+    The engine knows how to interpret a minimal set of operations. Apart
+    from the optional caches it is stateless and functional – you can
+    create a new instance per build, or keep one global instance (which
+    is what long-lived workers do to benefit from the caches).
+
+    Parameters
+    ----------
+    cache:
+        Optional :class:`~scanmaster_drawing_engine.solid_cache.SolidCache`.
+        When given, solids are looked up by the canonical hash of their
+        spec before any CadQuery work is done.
+    fuse_modifiers:
+        If ``True`` (the default), all subtractive tools (hole circles,
+        cut boxes, through-holes) are removed in a single multi-tool
+        boolean. Set to ``False`` to cut them one at a time.
+    base_cache_entries:
+        Number of base solids (``BaseBox`` or sketch + ``Extrude``) to
+        keep in memory. Specs that differ only in their modifiers, such
+        as members of a part family, then reuse the base solid instead
+        of rebuilding it. ``0`` disables the base cache.
+    prefix_cache_entries:
+        Number of intermediate shapes kept for :meth:`rebuild`, each the
+        result of the base plus the first *k* modifier operations.
+    prefilter_tools:
+        If ``True`` (the default), :meth:`build_solid` drops tools that
+        miss the base solid's bounding box, collapses duplicate tools and
+        merges abutting cut boxes before cutting (see
+        :mod:`~scanmaster_drawing_engine.tool_prefilter`).
+    tool_tolerance:
+        Distance below which the pre-pass treats tool bounds as equal.
+    boolean:
+        Default :class:`BooleanOptions` for the cuts; :meth:`build_solid`
+        and :meth:`rebuild` accept per-call overrides.
     """
 
-    def build_solid(self, spec: SolidSpec) -> cq.Workplane:
+    def __init__(
+        self,
+        cache: Optional["SolidCache"] = None,
+        fuse_modifiers: bool = True,
+        base_cache_entries: int = 0,
+        prefix_cache_entries: int = 64,
+        prefilter_tools: bool = True,
+        tool_tolerance: float = 1e-6,
+        boolean: Optional[BooleanOptions] = None,
+    ) -> None:
+        if base_cache_entries < 0:
+            raise ValueError("GeometryEngine.base_cache_entries must not be negative")
+        if prefix_cache_entries < 0:
+            raise ValueError("GeometryEngine.prefix_cache_entries must not be negative")
+        if tool_tolerance <= 0:
+            raise ValueError("GeometryEngine.tool_tolerance must be positive")
+        self.cache = cache
+        self.fuse_modifiers = fuse_modifiers
+        self.base_cache_entries = base_cache_entries
+        self._bases: "OrderedDict[Tuple[object, ...], cq.Workplane]" = OrderedDict()
+        self._base_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self.prefix_cache_entries = prefix_cache_entries
+        self._prefixes: "OrderedDict[str, cq.Workplane]" = OrderedDict()
+        self.boolean = boolean if boolean is not None else BooleanOptions()
+        self.boolean.validate()
+        self.prefilter_tools = prefilter_tools
+        self.tool_tolerance = tool_tolerance
+        self._prefilter_stats: Dict[str, int] = {
+            "builds": 0,
+            "tools_in": 0,
+            "booleans_avoided": 0,
+        }
+
+    def build_solid(
+        self, spec: SolidSpec, boolean: Optional[BooleanOptions] = None
+    ) -> cq.Workplane:
         """Build a CadQuery workplane representing the given solid.
 
         Parameters
         ----------
         spec:
             High-level description of the solid.
+        boolean:
+            OCCT boolean settings for this build (default: the engine's
+            ``boolean`` options).
 
         Returns
         -------
@@ -134,17 +618,157 @@ class GeometryEngine:
             ``solid.val().toFreecad()``.
         """
 
+        options = self._boolean_options(boolean)
+        if self.cache is None:
+            return self._build_solid(spec, options)
+
+        with stage("geometry.cache_lookup") as meta:
+            key = self.cache.key_for(spec)
+            if options.result_key():
+                key = _chain_key(key, options.result_key())
+            solid = self.cache.get(key)
+            meta["hit"] = solid is not None
+        if solid is None:
+            solid = self._build_solid(spec, options)
+            with stage("geometry.cache_store"):
+                self.cache.put(key, solid)
+        return solid
+
+    def rebuild(
+        self, spec: SolidSpec, boolean: Optional[BooleanOptions] = None
+    ) -> RebuildResult:
+        """Build ``spec`` incrementally, replaying only what changed.
+
+        Modifiers are applied one operation at a time, in spec order, and
+        the shape after every step is kept in a prefix cache keyed by a
+        hash chain over the operations so far. When an editor changes
+        operation *k* of a spec built before, the shape after operation
+        *k - 1* is found in the cache and only operations *k..n* are cut
+        again.
+
+        Unlike :meth:`build_solid`, modifiers are not fused into one
+        boolean, so a cold rebuild is slower; it pays off from the
+        second edit on.
+        """
+
+        options = self._boolean_options(boolean)
+        with stage("geometry.validate"):
+            ops = self._bucket_operations(spec)
+
+        modifiers = [op for op in spec.operations if _is_modifier(op)]
+        keys = [_chain_key("", ops.base_key() + options.result_key())]
+        for op in modifiers:
+            keys.append(_chain_key(keys[-1], _step_identity(op)))
+
+        # Longest cached prefix: index into ``keys`` (-1: nothing cached).
+        start = -1
+        for index in range(len(keys) - 1, -1, -1):
+            if keys[index] in self._prefixes:
+                start = index
+                break
+
+        base_count = ops.base_count()
+        total = base_count + len(modifiers)
+        with stage("geometry.rebuild", operations=total) as meta:
+            if start >= 0:
+                solid = self._prefixes[keys[start]]
+                self._prefixes.move_to_end(keys[start])
+                reused = base_count + start
+            else:
+                with stage("geometry.base") as base_meta:
+                    solid, base_meta["reused"] = self._base_solid(spec, ops)
+                self._remember_prefix(keys[0], solid)
+                start = 0
+                reused = base_count if base_meta["reused"] else 0
+
+            for index in range(start, len(modifiers)):
+                tools = self._tools_for(modifiers[index], ops)
+                solid = self._apply_cuts(solid, tools, options)
+                self._remember_prefix(keys[index + 1], solid)
+
+            meta["reused"] = reused
+            meta["recomputed"] = total - reused
+
+        return RebuildResult(
+            solid=solid, operations=total, reused=reused, recomputed=total - reused
+        )
+
+    def prefix_cache_stats(self) -> Dict[str, int]:
+        """Return the number of intermediate shapes kept for :meth:`rebuild`."""
+
+        return {"entries": len(self._prefixes), "max_entries": self.prefix_cache_entries}
+
+    def _remember_prefix(self, key: str, solid: cq.Workplane) -> None:
+        import cadquery as cq
+
+        if self.prefix_cache_entries == 0:
+            return
+        # A fresh workplane, so the entry does not keep the whole chain of
+        # parent workplanes (and their shapes) alive.
+        self._prefixes[key] = cq.Workplane("XY").newObject([solid.val()])
+        self._prefixes.move_to_end(key)
+        while len(self._prefixes) > self.prefix_cache_entries:
+            self._prefixes.popitem(last=False)
+
+    def _boolean_options(self, boolean: Optional[BooleanOptions]) -> BooleanOptions:
+        if boolean is None:
+            return self.boolean
+        boolean.validate()
+        return boolean
+
+    def _build_solid(self, spec: SolidSpec, options: BooleanOptions) -> cq.Workplane:
+        with stage("geometry.validate"):
+            ops = self._bucket_operations(spec)
+        with stage("geometry.base") as meta:
+            solid, meta["reused"] = self._base_solid(spec, ops)
+        with stage("geometry.tools") as meta:
+            placements = self._tool_placements(ops)
+            if self.prefilter_tools and placements:
+                placements, report = self._prefilter(solid, placements)
+                meta.update(report.to_dict())
+            tools = self._placed_tools(placements)
+            meta["tools"] = len(tools)
+        return self._apply_cuts(solid, tools, options)
+
+    def prefilter_stats(self) -> Dict[str, int]:
+        """Return tool pre-pass totals since the engine was created:
+        ``builds`` filtered, ``tools_in`` seen and ``booleans_avoided``."""
+
+        return dict(self._prefilter_stats)
+
+    def _prefilter(
+        self, solid: cq.Workplane, placements: List["ToolPlacement"]
+    ) -> Tuple[List["ToolPlacement"], "ToolPrefilterReport"]:
+        from .tool_prefilter import prefilter_tools
+
+        bounds = solid.val().BoundingBox()
+        placements, report = prefilter_tools(
+            placements,
+            (bounds.xmin, bounds.ymin, bounds.zmin),
+            (bounds.xmax, bounds.ymax, bounds.zmax),
+            tolerance=self.tool_tolerance,
+        )
+        self._prefilter_stats["builds"] += 1
+        self._prefilter_stats["tools_in"] += report.tools_in
+        self._prefilter_stats["booleans_avoided"] += report.booleans_avoided
+        return placements, report
+
+    def _bucket_operations(self, spec: SolidSpec) -> _OperationBuckets:
+        """Validate ``spec`` and sort its operations into buckets."""
+
         if not spec.operations:
             raise ValueError(f"SolidSpec '{spec.id}' contains no operations")
 
-        # First pass: collect operations into high-level buckets so that
-        # we can support both "sketch + extrude" and "BaseBox" styles,
-        # along with 3D modifiers.
+        # Collect operations into high-level buckets so that we can
+        # support both "sketch + extrude" and "BaseBox" styles, along
+        # with 3D modifiers.
         sketch_circles: List[SketchCircle] = []
         extrude_op: Optional[Extrude] = None
         base_box: Optional[BaseBox] = None
         cut_boxes: List[CutBox] = []
         through_holes: List[ThroughHole] = []
+        hole_arrays: List[HoleArray] = []
+        tables: List[OperationTable] = []
 
         for op in spec.operations:
             if isinstance(op, SketchCircle):
@@ -179,6 +803,21 @@ class GeometryEngine:
                 if op.axis not in ("x", "y", "z"):
                     raise ValueError("ThroughHole.axis must be one of 'x', 'y', 'z'")
                 through_holes.append(op)
+            elif isinstance(op, HoleArray):
+                if op.radius <= 0 or op.depth <= 0:
+                    raise ValueError("HoleArray.radius/depth must be positive")
+                if op.count < 1 or op.rows < 1:
+                    raise ValueError("HoleArray.count/rows must be at least 1")
+                if op.axis not in ("x", "y", "z"):
+                    raise ValueError("HoleArray.axis must be one of 'x', 'y', 'z'")
+                if op.layout not in ("linear", "grid", "polar"):
+                    raise ValueError(
+                        "HoleArray.layout must be one of 'linear', 'grid', 'polar'"
+                    )
+                hole_arrays.append(op)
+            elif isinstance(op, (ThroughHoleTable, CutBoxTable)):
+                op.validate()
+                tables.append(op)
             else:  # pragma: no cover - future-proofing
                 raise TypeError(f"Unsupported operation type: {type(op)!r}")
 
@@ -194,9 +833,54 @@ class GeometryEngine:
                 "operation with supporting sketch geometry."
             )
 
-        # Build the base solid.
-        if base_box is not None:
-            bb = base_box
+        return _OperationBuckets(
+            sketch_circles=sketch_circles,
+            extrude_op=extrude_op,
+            base_box=base_box,
+            cut_boxes=cut_boxes,
+            through_holes=through_holes,
+            hole_arrays=hole_arrays,
+            tables=tables,
+        )
+
+    def base_cache_stats(self) -> Dict[str, int]:
+        """Return base-solid reuse counters (``hits``, ``misses``, ``entries``)."""
+
+        return {**self._base_stats, "entries": len(self._bases)}
+
+    def _base_solid(
+        self, spec: SolidSpec, ops: _OperationBuckets
+    ) -> Tuple[cq.Workplane, bool]:
+        """Return the base solid and whether it came from the base cache.
+
+        Booleans never modify their operands, so one cached base can be
+        cut by any number of later specs.
+        """
+
+        if self.base_cache_entries == 0:
+            return self._build_base(spec, ops), False
+
+        key = ops.base_key()
+        solid = self._bases.get(key)
+        if solid is not None:
+            self._bases.move_to_end(key)
+            self._base_stats["hits"] += 1
+            return solid, True
+
+        solid = self._build_base(spec, ops)
+        self._bases[key] = solid
+        while len(self._bases) > self.base_cache_entries:
+            self._bases.popitem(last=False)
+        self._base_stats["misses"] += 1
+        return solid, False
+
+    def _build_base(self, spec: SolidSpec, ops: _OperationBuckets) -> cq.Workplane:
+        """Build the base solid (``BaseBox`` or sketch + ``Extrude``)."""
+
+        import cadquery as cq
+
+        if ops.base_box is not None:
+            bb = ops.base_box
             solid = (
                 cq.Workplane("XY")
                 .box(
@@ -211,7 +895,7 @@ class GeometryEngine:
             wp = cq.Workplane("XY")
 
             # First, draw all non-hole circles into a single sketch profile.
-            for sc in sketch_circles:
+            for sc in ops.sketch_circles:
                 if not sc.is_hole:
                     wp = wp.circle(sc.radius)
 
@@ -223,50 +907,311 @@ class GeometryEngine:
                     f"SolidSpec '{spec.id}' defines no positive geometry to extrude"
                 )
 
-            solid = wp.extrude(extrude_op.length)  # type: ignore[arg-type]
+            solid = wp.extrude(ops.extrude_op.length)  # type: ignore[arg-type]
+
+        return solid
 
-            # Then, cut hole circles as separate extruded tools.
-            for sc in sketch_circles:
-                if sc.is_hole:
-                    hole_wp = cq.Workplane("XY").circle(sc.radius)
-                    hole = hole_wp.extrude(extrude_op.length)  # type: ignore[arg-type]
-                    solid = solid.cut(hole)
+    def _modifier_tools(self, ops: _OperationBuckets) -> List[cq.Shape]:
+        """Return every subtractive tool body of the spec, unfiltered."""
 
-        # Apply 3D modifier operations.
-        for cb in cut_boxes:
-            cx, cy, cz = cb.center
-            tool = (
-                cq.Workplane("XY")
-                .center(cx, cy)
-                .box(cb.width, cb.depth, cb.height, centered=(True, True, True))
-            )
-            tool = tool.translate((0, 0, cz))
-            solid = solid.cut(tool)
-
-        for hole in through_holes:
-            cx, cy, cz = hole.center
-            if hole.axis == "z":
-                tool = (
-                    cq.Workplane("XY")
-                    .center(cx, cy)
-                    .circle(hole.radius)
-                    .extrude(hole.depth * 2, both=True)
+        return self._placed_tools(self._tool_placements(ops))
+
+    def _tool_placements(self, ops: _OperationBuckets) -> List["ToolPlacement"]:
+        """Describe every subtractive tool of the spec (see ``_placements_for``).
+
+        Hole circles come first, then cut boxes, through-holes, hole
+        arrays and tables.
+        """
+
+        placements: List["ToolPlacement"] = []
+        for group in (
+            [sc for sc in ops.sketch_circles if sc.is_hole],
+            ops.cut_boxes,
+            ops.through_holes,
+            ops.hole_arrays,
+            ops.tables,
+        ):
+            for op in group:
+                placements.extend(self._placements_for(op, ops))
+        return placements
+
+    def _tools_for(self, op: Operation, ops: _OperationBuckets) -> List[cq.Shape]:
+        """Return the tool bodies of the single modifier operation ``op``."""
+
+        return self._placed_tools(self._placements_for(op, ops))
+
+    @classmethod
+    def _placements_for(
+        cls, op: Operation, ops: _OperationBuckets
+    ) -> List["ToolPlacement"]:
+        """Describe the tools of one modifier as prototypes plus offsets.
+
+        Hole circles are extruded over the full length. Offsets mirror
+        where :meth:`_cut_box_tool` / :meth:`_through_hole_tool` put a
+        single operation; hole array and table rows sharing a size (and
+        axis) share one prototype.
+        """
+
+        from .tool_prefilter import bore_placement, box_placement, hole_placement
+
+        if isinstance(op, SketchCircle):
+            return [bore_placement(op.radius, ops.extrude_op.length)]  # type: ignore[union-attr]
+        if isinstance(op, CutBox):
+            return [box_placement(op.width, op.depth, op.height, tuple(op.center))]
+        if isinstance(op, ThroughHole):
+            offset = cls._through_hole_offset(op.axis, op.center)
+            return [hole_placement(op.radius, op.depth, op.axis, offset)]
+        if isinstance(op, HoleArray):
+            return [
+                hole_placement(
+                    op.radius,
+                    op.depth,
+                    op.axis,
+                    cls._through_hole_offset(op.axis, center),
                 )
-            elif hole.axis == "x":
-                tool = (
-                    cq.Workplane("YZ")
-                    .center(cz, cy)
-                    .circle(hole.radius)
-                    .extrude(hole.depth * 2, both=True)
+                for center in hole_array_centers(op).tolist()
+            ]
+        if isinstance(op, CutBoxTable):
+            return [
+                box_placement(width, depth, height, tuple(center))
+                for width, depth, height, center in zip(
+                    op.width.tolist(),
+                    op.depth.tolist(),
+                    op.height.tolist(),
+                    op.center.tolist(),
                 )
-            else:  # "y"
-                tool = (
-                    cq.Workplane("XZ")
-                    .center(cx, cz)
-                    .circle(hole.radius)
-                    .extrude(hole.depth * 2, both=True)
+            ]
+        return [
+            hole_placement(radius, depth, axis, cls._through_hole_offset(axis, center))
+            for radius, depth, center, axis in zip(
+                op.radius.tolist(),
+                op.depth.tolist(),
+                op.center.tolist(),
+                op.axes().tolist(),
+            )
+        ]
+
+    @staticmethod
+    def _through_hole_offset(
+        axis: str, center: Sequence[float]
+    ) -> Tuple[float, float, float]:
+        """Where :meth:`_through_hole_tool` moves its cylinder for ``center``."""
+
+        cx, cy, cz = center
+        if axis == "z":
+            return (cx, cy, 0.0)
+        if axis == "x":
+            return (0.0, cz, cy)
+        return (cx, 0.0, cz)
+
+    def _placed_tools(self, placements: List["ToolPlacement"]) -> List[cq.Shape]:
+        """Build one shape per placement, sharing one prototype per size.
+
+        Placing a prototype with :meth:`cq.Shape.moved` only changes its
+        location; the underlying geometry is built once.
+        """
+
+        import cadquery as cq
+
+        prototypes: Dict[Tuple[object, ...], cq.Shape] = {}
+        tools: List[cq.Shape] = []
+        for placement in placements:
+            prototype = prototypes.get(placement.prototype)
+            if prototype is None:
+                prototype = prototypes[placement.prototype] = self._prototype_tool(
+                    placement.prototype
                 )
+            tools.append(prototype.moved(cq.Location(cq.Vector(*placement.offset))))
+        return tools
 
-            solid = solid.cut(tool)
+    @classmethod
+    def _prototype_tool(cls, prototype: Tuple[object, ...]) -> cq.Shape:
+        import cadquery as cq
+
+        kind, *size = prototype
+        if kind == "box":
+            width, depth, height = size
+            return cls._cut_box_tool(CutBox(width, depth, height, (0.0, 0.0, 0.0)))
+        if kind == "hole":
+            radius, depth, axis = size
+            return cls._through_hole_tool(
+                ThroughHole(radius=radius, depth=depth, axis=axis)
+            )
+        radius, length = size  # "bore"
+        return cq.Workplane("XY").circle(radius).extrude(length).val()
 
+    # ----- modifier helpers -------------------------------------------------------
+
+    def _apply_cuts(
+        self, solid: cq.Workplane, tools: List[cq.Shape], options: BooleanOptions
+    ) -> cq.Workplane:
+        """Subtract ``tools`` from ``solid``.
+
+        With ``fuse_modifiers`` enabled all tools go into one
+        multi-argument OCCT boolean, so the base solid is intersected
+        once instead of once per tool against an ever more complex
+        intermediate shape.
+        """
+
+        if not tools:
+            return solid
+
+        threads = _occt_pool_threads() if options.parallel else 1
+        if self.fuse_modifiers:
+            with stage("geometry.cut", tools=len(tools), threads=threads):
+                return _boolean_cut(solid, tools, options)
+
+        for index, tool in enumerate(tools):
+            with stage("geometry.cut", tools=1, index=index, threads=threads):
+                solid = _boolean_cut(solid, [tool], options)
         return solid
+
+    @staticmethod
+    def _cut_box_tool(cb: CutBox) -> cq.Shape:
+        import cadquery as cq
+
+        cx, cy, cz = cb.center
+        tool = (
+            cq.Workplane("XY")
+            .center(cx, cy)
+            .box(cb.width, cb.depth, cb.height, centered=(True, True, True))
+        )
+        return tool.translate((0, 0, cz)).val()
+
+    @staticmethod
+    def _through_hole_tool(hole: ThroughHole) -> cq.Shape:
+        import cadquery as cq
+
+        cx, cy, cz = hole.center
+        if hole.axis == "z":
+            tool = (
+                cq.Workplane("XY")
+                .center(cx, cy)
+                .circle(hole.radius)
+                .extrude(hole.depth * 2, both=True)
+            )
+        elif hole.axis == "x":
+            tool = (
+                cq.Workplane("YZ")
+                .center(cz, cy)
+                .circle(hole.radius)
+                .extrude(hole.depth * 2, both=True)
+            )
+        else:  # "y"
+            tool = (
+                cq.Workplane("XZ")
+                .center(cx, cz)
+                .circle(hole.radius)
+                .extrude(hole.depth * 2, both=True)
+            )
+        return tool.val()
+
+
+# ----- OCCT booleans -------------------------------------------------------------
+
+
+# OCCT's default thread pool is shared by every boolean and mesh in the
+# process, and re-initialising it while another thread uses it is
+# unsafe. It is therefore sized once, on the first parallel cut, to the
+# size requested with configure_occt_threads (None = OCCT's default).
+_OCCT_POOL_LOCK = threading.Lock()
+_occt_pool_size: Optional[int] = None
+_occt_pool_ready = False
+
+
+def configure_occt_threads(threads: Optional[int]) -> None:
+    """Set the size of OCCT's process-wide thread pool.
+
+    Call once at process start, before the first cut; ``None`` keeps
+    OCCT's default of one thread per logical CPU. The pool is sized when
+    the first parallel boolean runs and is never resized afterwards, so
+    asking for a different size after that raises ``RuntimeError``.
+    """
+
+    global _occt_pool_size
+    if threads is not None and threads < 1:
+        raise ValueError("OCCT thread pool size must be at least 1")
+    with _OCCT_POOL_LOCK:
+        if _occt_pool_ready and threads != _occt_pool_size:
+            raise RuntimeError(
+                "OCCT's thread pool is already in use and cannot be resized"
+            )
+        _occt_pool_size = threads
+
+
+def occt_threads_from_env() -> Optional[int]:
+    """Read the OCCT thread pool size from ``SCANMASTER_BOOLEAN_THREADS``.
+
+    Returns ``None`` when the variable is unset or empty and raises a
+    ``ValueError`` naming the variable for anything but a positive
+    integer.
+    """
+
+    raw = os.environ.get("SCANMASTER_BOOLEAN_THREADS")
+    if not raw:
+        return None
+    try:
+        threads = int(raw)
+    except ValueError:
+        threads = 0
+    if threads < 1:
+        raise ValueError(
+            f"SCANMASTER_BOOLEAN_THREADS must be a positive integer, got {raw!r}"
+        )
+    return threads
+
+
+def _occt_pool_threads() -> int:
+    """Size OCCT's thread pool on first use; return its thread count."""
+
+    global _occt_pool_ready
+    from OCP.OSD import OSD_Parallel, OSD_ThreadPool
+
+    with _OCCT_POOL_LOCK:
+        pool = OSD_ThreadPool.DefaultPool_s()
+        if not _occt_pool_ready:
+            if _occt_pool_size is not None:
+                pool.Init(_occt_pool_size)
+                # With a TBB build OCCT would otherwise ignore the pool size.
+                OSD_Parallel.SetUseOcctThreads_s(True)
+            _occt_pool_ready = True
+        return pool.NbThreads()
+
+
+def _boolean_cut(
+    solid: cq.Workplane, tools: List[cq.Shape], options: BooleanOptions
+) -> cq.Workplane:
+    """``solid.cut(tools)`` with explicit OCCT parallel/fuzzy/glue settings.
+
+    Same result as :meth:`cq.Workplane.cut` (including ``clean()``),
+    which does not expose the gluing mode.
+    """
+
+    import cadquery as cq
+    from OCP.BOPAlgo import BOPAlgo_GlueFull, BOPAlgo_GlueOff, BOPAlgo_GlueShift
+    from OCP.BRepAlgoAPI import BRepAlgoAPI_Cut
+    from OCP.TopTools import TopTools_ListOfShape
+
+    glue = {
+        "off": BOPAlgo_GlueOff,
+        "shift": BOPAlgo_GlueShift,
+        "full": BOPAlgo_GlueFull,
+    }
+
+    arguments = TopTools_ListOfShape()
+    arguments.Append(solid.findSolid().wrapped)
+    tool_list = TopTools_ListOfShape()
+    for tool in tools:
+        tool_list.Append(tool.wrapped)
+
+    op = BRepAlgoAPI_Cut()
+    op.SetArguments(arguments)
+    op.SetTools(tool_list)
+    op.SetRunParallel(options.parallel)
+    if options.fuzzy > 0:
+        op.SetFuzzyValue(options.fuzzy)
+    op.SetGlue(glue[options.glue])
+    op.Build()
+    if not op.IsDone():
+        raise RuntimeError("OCCT boolean cut failed")
+    return solid.newObject([cq.Shape.cast(op.Shape()).clean()])
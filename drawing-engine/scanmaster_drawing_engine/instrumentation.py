@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+"""Lightweight per-stage timing for jobs.
+
+A :class:`Timings` recorder collects wall-clock and CPU time for named
+stages. Library code does not take a recorder argument; instead it
+wraps interesting sections in :func:`stage`, which records into the
+recorder activated for the current context (see
+:meth:`Timings.activate`) and is a near no-op when none is active::
+
+    timings = Timings()
+    with timings.activate():
+        with stage("build_solid"):
+            ...
+
+    timings.to_dict()           # summary for the job result
+    timings.to_chrome_trace()   # load in chrome://tracing or Perfetto
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageRecord:
+    """One timed section."""
+
+    name: str
+    start_s: float
+    wall_s: float
+    cpu_s: float
+    depth: int
+    meta: Dict[str, Any] = field(default_factory=dict)
+    #: Thread the stage ran on (its lane in Chrome traces).
+    thread_id: int = field(default_factory=threading.get_ident)
+
+
+class Timings:
+    """Collects :class:`StageRecord` entries for one job."""
+
+    def __init__(self) -> None:
+        self.records: List[StageRecord] = []
+        self._origin = time.perf_counter()
+        # Nesting depth per context, so that stages running on worker
+        # threads (with a copied context) nest under the stage that
+        # started them instead of under whatever runs concurrently.
+        self._depth: contextvars.ContextVar[int] = contextvars.ContextVar(
+            "scanmaster_stage_depth", default=0
+        )
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["Timings"]:
+        """Make this recorder the target of :func:`stage` calls."""
+
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **meta: Any) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block as ``name``.
+
+        Yields the record's ``meta`` dict so that callers can attach
+        values only known at the end (e.g. the number of tools cut).
+        """
+
+        record_meta: Dict[str, Any] = dict(meta)
+        depth = self._depth.get()
+        token = self._depth.set(depth + 1)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record_meta
+        finally:
+            wall_end = time.perf_counter()
+            self._depth.reset(token)
+            self.records.append(
+                StageRecord(
+                    name=name,
+                    start_s=wall_start - self._origin,
+                    wall_s=wall_end - wall_start,
+                    cpu_s=time.process_time() - cpu_start,
+                    depth=depth,
+                    meta=record_meta,
+                )
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return per-stage records (in start order) and per-name totals."""
+
+        stages = sorted(self.records, key=lambda r: r.start_s)
+        totals: Dict[str, Dict[str, Any]] = {}
+        for r in stages:
+            total = totals.setdefault(r.name, {"count": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            total["count"] += 1
+            total["wall_s"] += r.wall_s
+            total["cpu_s"] += r.cpu_s
+
+        return {
+            "stages": [
+                {
+                    "name": r.name,
+                    "start_s": round(r.start_s, 6),
+                    "wall_s": round(r.wall_s, 6),
+                    "cpu_s": round(r.cpu_s, 6),
+                    "depth": r.depth,
+                    **({"meta": r.meta} if r.meta else {}),
+                }
+                for r in stages
+            ],
+            "totals": {
+                name: {
+                    "count": t["count"],
+                    "wall_s": round(t["wall_s"], 6),
+                    "cpu_s": round(t["cpu_s"], 6),
+                }
+                for name, t in totals.items()
+            },
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Return the records in Chrome trace-event format."""
+
+        pid = os.getpid()
+        events = [
+            {
+                "name": r.name,
+                "ph": "X",
+                "ts": round(r.start_s * 1e6, 3),
+                "dur": round(r.wall_s * 1e6, 3),
+                "pid": pid,
+                "tid": r.thread_id,
+                "args": {"cpu_ms": round(r.cpu_s * 1e3, 3), **r.meta},
+            }
+            for r in sorted(self.records, key=lambda r: r.start_s)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(self.to_chrome_trace()), encoding="utf8")
+
+
+_current: contextvars.ContextVar[Optional[Timings]] = contextvars.ContextVar(
+    "scanmaster_timings", default=None
+)
+
+
+def current_timings() -> Optional[Timings]:
+    """Return the recorder active in this context, if any."""
+
+    return _current.get()
+
+
+@contextlib.contextmanager
+def stage(name: str, **meta: Any) -> Iterator[Dict[str, Any]]:
+    """Time a block into the active recorder (no-op without one)."""
+
+    timings = _current.get()
+    if timings is None:
+        yield dict(meta)
+        return
+    with timings.stage(name, **meta) as record_meta:
+        yield record_meta
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+"""Compact job encodings: columnar operations and msgpack framing.
+
+Jobs with large hole patterns are mostly repetition: thousands of
+``{"type": "ThroughHole", "radius": ..., "depth": ..., ...}`` objects
+that repeat the same keys over and over. Two independent measures cut
+their size and decode time:
+
+*Columnar operations.* Besides the ``operations`` list, a solid may
+carry ``columns``: one table per operation type, mapping each field to
+a list with one entry per operation::
+
+    "columns": {
+      "ThroughHole": {
+        "radius": [1.5, 1.5, 2.0],
+        "depth": 20,
+        "axis": "z",
+        "center": [[0, 0, 10], [5, 0, 10], [10, 0, 10]]
+      }
+    }
+
+Scalar (non-list) values apply to every row. Column operations come
+after the ``operations`` list, in table order. Validation checks
+``ThroughHole`` and ``CutBox`` tables column-wise and
+:func:`~scanmaster_drawing_engine.spec_parsing.solid_spec_from_dict`
+maps them onto a ``ThroughHoleTable`` / ``CutBoxTable``, so a large
+pattern never becomes one dict (or object) per hole.
+:func:`expand_columns` turns columns back into ordinary operation dicts
+for callers that want a single format.
+
+*Output lists.* Instead of one ``output_<format>`` key per artifact, a
+job may list what it wants from its one solid build::
+
+    "outputs": [
+      {"format": "pdf", "path": "out/part.pdf"},
+      {"format": "step", "path": "out/part.step"},
+      {"format": "stl", "path": "out/part.stl", "tolerance": 0.05},
+      {"format": "png", "path": "out/part.png", "size": 128}
+    ]
+
+:func:`expand_outputs` turns the list into the ``output_<format>`` keys
+(and ``stl_tolerance``, ``stl_angular_tolerance``, ``thumbnail_size``).
+
+*msgpack.* ``job_runner --format msgpack`` reads and writes a stream of
+msgpack maps instead of JSON lines. This needs the optional ``msgpack``
+package, imported only when the format is used.
+"""
+
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from .exporters import GEOMETRY_FORMATS
+from .spec_parsing import column_rows
+from .validation import JobValidationError, ValidationIssue
+
+WIRE_FORMATS = ("json", "msgpack")
+
+#: Formats an ``outputs`` entry may request: the drawing, then the
+#: direct exports of the solid.
+OUTPUT_FORMATS = ("pdf", "svg") + GEOMETRY_FORMATS
+
+# Per-format options of an ``outputs`` entry -> top-level job key.
+_OUTPUT_OPTIONS: Dict[str, Dict[str, str]] = {
+    "stl": {"tolerance": "stl_tolerance", "angular_tolerance": "stl_angular_tolerance"},
+    "png": {"size": "thumbnail_size"},
+}
+
+# Operation types that compact_operations moves into columns. Base
+# operations stay in the list: there is at most a handful of them.
+COLUMNAR_TYPES = ("CutBox", "ThroughHole", "HoleArray")
+
+_READ_SIZE = 64 * 1024
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack  # type: ignore[import]
+    except ImportError as exc:
+        raise RuntimeError(
+            "The msgpack job format needs the optional 'msgpack' package; "
+            "use JSON or install it."
+        ) from exc
+    return msgpack
+
+
+# ----- Columnar operations ----------------------------------------------------------
+
+
+def _column_length(
+    table: Dict[str, Any], path: str, issues: List[ValidationIssue]
+) -> Optional[int]:
+    lengths = {len(v) for v in table.values() if isinstance(v, list)}
+    if not lengths:
+        issues.append(ValidationIssue(path, "needs at least one list-valued field"))
+        return None
+    if len(lengths) > 1:
+        issues.append(
+            ValidationIssue(
+                path, f"list fields must have equal lengths (got {sorted(lengths)})"
+            )
+        )
+        return None
+    return lengths.pop()
+
+
+def expand_columns(solid: Dict[str, Any]) -> None:
+    """Append the operations of ``solid["columns"]`` to its ``operations``.
+
+    Modifies ``solid`` in place (the original ``operations`` list is
+    copied, not extended) and removes ``columns``. Malformed tables
+    raise :class:`~scanmaster_drawing_engine.validation.JobValidationError`
+    with JSON paths, like any other invalid job.
+    """
+
+    columns = solid.pop("columns", None)
+    if columns is None:
+        return
+
+    issues: List[ValidationIssue] = []
+    if not isinstance(columns, dict):
+        raise JobValidationError(
+            [ValidationIssue("$.solid.columns", "must be an object")]
+        )
+
+    operations = solid.get("operations", [])
+    if not isinstance(operations, list):
+        # Leave it alone; validation reports it.
+        return
+    operations = solid["operations"] = list(operations)
+
+    for op_type, table in columns.items():
+        path = f"$.solid.columns.{op_type}"
+        if not isinstance(table, dict):
+            issues.append(ValidationIssue(path, "must be an object"))
+            continue
+        count = _column_length(table, path, issues)
+        if count is None:
+            continue
+
+        operations.extend(column_rows(op_type, table, count))
+
+    if issues:
+        raise JobValidationError(issues)
+
+
+def compact_operations(solid: Dict[str, Any], min_rows: int = 2) -> Dict[str, Any]:
+    """Return a copy of ``solid`` with repeated modifiers moved to columns.
+
+    Operations of a type in :data:`COLUMNAR_TYPES` occurring at least
+    ``min_rows`` times go into ``columns``; fields that are identical for
+    every row are stored once as a scalar. Expanding the result with
+    :func:`expand_columns` yields the same operations, with the columnar
+    ones moved behind the others.
+    """
+
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for op in solid.get("operations", []):
+        if op.get("type") in COLUMNAR_TYPES:
+            by_type.setdefault(op["type"], []).append(op)
+    moved = {t for t, ops in by_type.items() if len(ops) >= min_rows}
+    if not moved:
+        return dict(solid)
+
+    columns: Dict[str, Dict[str, Any]] = {}
+    for op_type in sorted(moved):
+        ops = by_type[op_type]
+        names = sorted({k for op in ops for k in op if k != "type"})
+        table: Dict[str, Any] = {}
+        for name in names:
+            values = [op.get(name) for op in ops]
+            # Scalars are only stored once when they cannot be confused
+            # with a column (vectors are lists themselves).
+            first = values[0]
+            if not isinstance(first, list) and all(v == first for v in values):
+                table[name] = first
+            else:
+                table[name] = values
+        if not any(isinstance(v, list) for v in table.values()):
+            # Every field is constant: keep one column to carry the count.
+            table[names[0]] = [table[names[0]]] * len(ops)
+        columns[op_type] = table
+
+    compact = {k: v for k, v in solid.items() if k != "operations"}
+    compact["operations"] = [
+        op for op in solid.get("operations", []) if op.get("type") not in moved
+    ]
+    compact["columns"] = columns
+    return compact
+
+
+# ----- Output lists ----------------------------------------------------------------
+
+
+def expand_outputs(job: Dict[str, Any]) -> None:
+    """Turn ``job["outputs"]`` into ``output_<format>`` keys.
+
+    Modifies ``job`` in place and removes ``outputs``. Format options
+    (``tolerance``/``angular_tolerance`` for STL, ``size`` for PNG) become
+    the matching job-wide keys. A format or option requested twice, also
+    through the flat keys, is an error; malformed entries raise
+    :class:`~scanmaster_drawing_engine.validation.JobValidationError`.
+    """
+
+    outputs = job.pop("outputs", None)
+    if outputs is None:
+        return
+    if not isinstance(outputs, list):
+        raise JobValidationError([ValidationIssue("$.outputs", "must be a list")])
+
+    issues: List[ValidationIssue] = []
+    for index, entry in enumerate(outputs):
+        path = f"$.outputs[{index}]"
+        if not isinstance(entry, dict):
+            issues.append(ValidationIssue(path, "must be an object"))
+            continue
+        fmt = entry.get("format")
+        if fmt not in OUTPUT_FORMATS:
+            allowed = ", ".join(map(repr, OUTPUT_FORMATS))
+            issues.append(
+                ValidationIssue(f"{path}.format", f"must be one of {allowed}")
+            )
+            continue
+        target = entry.get("path")
+        if not isinstance(target, str) or not target:
+            issues.append(ValidationIssue(f"{path}.path", "must be a non-empty string"))
+            continue
+
+        options = _OUTPUT_OPTIONS.get(fmt, {})
+        unknown = sorted(set(entry) - {"format", "path", *options})
+        if unknown:
+            issues.append(
+                ValidationIssue(
+                    f"{path}.{unknown[0]}", f"is not an option of {fmt!r} outputs"
+                )
+            )
+        for name, key in (("path", f"output_{fmt}"), *options.items()):
+            if name not in entry:
+                continue
+            if job.get(key) is not None:
+                issues.append(
+                    ValidationIssue(
+                        f"{path}.{name}", f"{key} is already set for this job"
+                    )
+                )
+                continue
+            job[key] = entry[name]
+
+    if issues:
+        raise JobValidationError(issues)
+
+
+# ----- msgpack framing --------------------------------------------------------------
+
+
+def pack(obj: Any) -> bytes:
+    """Encode ``obj`` as one msgpack message."""
+
+    return _msgpack().packb(obj, use_bin_type=True)
+
+
+def unpack(data: bytes) -> Any:
+    """Decode one msgpack message."""
+
+    return _msgpack().unpackb(data, raw=False, strict_map_key=False)
+
+
+def iter_unpack(stream: BinaryIO) -> Iterator[Any]:
+    """Yield consecutive msgpack messages read from ``stream`` until EOF.
+
+    Messages are self-delimiting, so no extra framing is needed; a
+    message that cannot be decoded ends the stream with ``ValueError``.
+    Bytes are consumed as they arrive (``read1``), so a worker answers a
+    job without waiting for a full read buffer.
+    """
+
+    unpacker = _msgpack().Unpacker(raw=False, strict_map_key=False)
+    read = getattr(stream, "read1", stream.read)
+    while True:
+        chunk = read(_READ_SIZE)
+        if not chunk:
+            break
+        unpacker.feed(chunk)
+        try:
+            yield from unpacker
+        except Exception as exc:  # msgpack raises several unrelated types
+            raise ValueError(f"invalid msgpack stream: {exc}") from exc
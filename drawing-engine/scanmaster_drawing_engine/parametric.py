@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+"""Parametric job templates and family sweeps.
+
+Ring and block families differ only in a handful of sizes (OD, ID,
+length, hole depth, ...). Instead of sending one complete job per
+variant, a *parametric template* declares named parameters once and
+uses them throughout an ordinary job::
+
+    {
+      "parameters": {"od": 100, "id": 60, "length": 40,
+                     "wall": "=(od - id) / 2"},
+      "solid": {
+        "id": "ring_{od}x{id}x{length}",
+        "operations": [
+          {"type": "SketchCircle", "radius": "=od / 2"},
+          {"type": "SketchCircle", "radius": "=id / 2", "is_hole": true},
+          {"type": "Extrude", "length": "=length"}
+        ]
+      },
+      "output_step": "out/ring_{od}x{id}x{length}.step"
+    }
+
+Inside the template every string is resolved against the parameters:
+
+* a string starting with ``=`` is an arithmetic expression and becomes
+  a number (``+ - * / // % **``, parentheses, ``pi`` and the functions
+  in ``_FUNCTIONS``);
+* any other string is formatted with :meth:`str.format`, so ``{od}`` or
+  ``{od:g}`` insert parameter values into ids, paths and titles.
+
+Parameter defaults may be expressions over earlier parameters (``wall``
+above). A default of ``null`` makes the parameter required.
+
+:func:`expand_family` instantiates a template once per row of a
+parameter table, e.g. a CSV file with one column per parameter read by
+:func:`read_parameter_table`. Nothing here imports CadQuery.
+"""
+
+import ast
+import csv
+import functools
+import math
+import operator
+import re
+import string
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping
+
+# Templates come from clients, so evaluating them must stay cheap: no
+# integer power may exceed this many bits (``9**9**9`` would otherwise
+# keep a worker busy for minutes) ...
+_MAX_POWER_BITS = 4096
+# ... and no width or precision in a format spec may exceed this.
+_MAX_FORMAT_WIDTH = 100
+
+_FORMATTER = string.Formatter()
+
+
+def _power(base: Any, exponent: Any) -> Any:
+    if (
+        isinstance(base, int)
+        and isinstance(exponent, int)
+        and abs(base) > 1
+        and exponent > 0
+        and abs(base).bit_length() * exponent > _MAX_POWER_BITS
+    ):
+        raise OverflowError("power too large")
+    return operator.pow(base, exponent)
+
+
+_BINARY_OPS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _power,
+}
+
+_UNARY_OPS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+    "int": int,
+    "sqrt": math.sqrt,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "radians": math.radians,
+    "degrees": math.degrees,
+}
+
+_CONSTANTS: Dict[str, float] = {"pi": math.pi}
+
+# Table column naming a variant rather than setting a parameter.
+_ROW_JOB_ID = "job_id"
+
+
+# ----- Expressions ---------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expression(source: str) -> ast.expr:
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"invalid expression {source!r}: {exc.msg}") from None
+    return tree.body
+
+
+def _evaluate(node: ast.expr, names: Mapping[str, Any], source: str) -> Any:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.Name):
+        if node.id in names:
+            return names[node.id]
+        if node.id in _CONSTANTS:
+            return _CONSTANTS[node.id]
+        raise ValueError(f"unknown parameter {node.id!r} in {source!r}")
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return _BINARY_OPS[type(node.op)](
+            _number(node.left, names, source), _number(node.right, names, source)
+        )
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_number(node.operand, names, source))
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _FUNCTIONS
+        and not node.keywords
+    ):
+        args = [_evaluate(arg, names, source) for arg in node.args]
+        return _FUNCTIONS[node.func.id](*args)
+    raise ValueError(f"unsupported syntax in expression {source!r}")
+
+
+def _number(node: ast.expr, names: Mapping[str, Any], source: str) -> Any:
+    """Evaluate an operand of an arithmetic operator, which must be a
+    number (a string parameter times a huge count is not arithmetic)."""
+
+    value = _evaluate(node, names, source)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"non-numeric operand {value!r} in {source!r}")
+    return value
+
+
+def evaluate_expression(source: str, names: Mapping[str, Any]) -> Any:
+    """Evaluate the arithmetic expression ``source`` over ``names``.
+
+    Only numbers, parameter names, ``pi``, arithmetic operators and the
+    whitelisted functions are allowed; anything else raises
+    ``ValueError``.
+    """
+
+    try:
+        return _evaluate(_parse_expression(source), names, source)
+    except (ArithmeticError, TypeError) as exc:
+        raise ValueError(f"cannot evaluate {source!r}: {exc}") from None
+
+
+def _check_format(template: str) -> None:
+    """Allow only ``{name}`` / ``{name:spec}`` fields with small, literal specs.
+
+    Attribute and index access (``{od.__class__}``, ``{od[0]}``) would
+    reach into Python objects, and huge widths allocate huge strings.
+    """
+
+    for _, field_name, spec, _ in _FORMATTER.parse(template):
+        if field_name is None:
+            continue
+        if not field_name.isidentifier():
+            raise ValueError(
+                f"only plain parameter names may be formatted, got {{{field_name}}}"
+            )
+        if "{" in spec:
+            raise ValueError(f"nested fields in format spec {spec!r} are not supported")
+        if any(int(n) > _MAX_FORMAT_WIDTH for n in re.findall(r"\d+", spec)):
+            raise ValueError(f"format spec {spec!r} is too wide")
+
+
+def _resolve(value: Any, names: Mapping[str, Any], path: str) -> Any:
+    """Resolve all expressions and format strings inside ``value``."""
+
+    if isinstance(value, str):
+        try:
+            if value.startswith("="):
+                return evaluate_expression(value[1:], names)
+            if "{" in value:
+                _check_format(value)
+                return value.format_map(names)
+        except (KeyError, IndexError) as exc:
+            raise ValueError(f"{path}: unknown parameter {exc} in {value!r}") from None
+        except ValueError as exc:
+            raise ValueError(f"{path}: {exc}") from None
+        return value
+    if isinstance(value, list):
+        return [_resolve(v, names, f"{path}[{i}]") for i, v in enumerate(value)]
+    if isinstance(value, dict):
+        return {k: _resolve(v, names, f"{path}.{k}") for k, v in value.items()}
+    return value
+
+
+# ----- Templates -----------------------------------------------------------------
+
+
+@dataclass
+class ParametricTemplate:
+    """A job template with named parameters.
+
+    Parameters
+    ----------
+    parameters:
+        Parameter names mapped to defaults (numbers, strings, ``=``
+        expressions over earlier parameters, or ``None`` for required
+        parameters). Declaration order is evaluation order.
+    body:
+        The job itself, with expressions and format strings anywhere.
+    """
+
+    parameters: Dict[str, Any]
+    body: Dict[str, Any]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ParametricTemplate":
+        """Split a template JSON object into parameters and job body."""
+
+        if not isinstance(data, dict):
+            raise ValueError("parametric template must be a JSON object")
+        parameters = data.get("parameters", {})
+        if not isinstance(parameters, dict):
+            raise ValueError("$.parameters: must be an object")
+        body = {k: v for k, v in data.items() if k != "parameters"}
+        return cls(parameters=dict(parameters), body=body)
+
+    def bind(self, values: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return every parameter's value for one variant.
+
+        ``values`` overrides defaults; parameters that are neither given
+        nor defaulted raise ``ValueError``, as do unknown names.
+        """
+
+        unknown = sorted(set(values) - set(self.parameters))
+        if unknown:
+            raise ValueError(f"unknown parameter(s): {', '.join(unknown)}")
+
+        bound: Dict[str, Any] = {}
+        for name, default in self.parameters.items():
+            if name in values:
+                bound[name] = values[name]
+            elif default is None:
+                raise ValueError(f"parameter {name!r} is required")
+            else:
+                bound[name] = _resolve(default, bound, f"$.parameters.{name}")
+        return bound
+
+    def instantiate(self, values: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return the plain job dict for the variant given by ``values``."""
+
+        return _resolve(self.body, self.bind(values), "$")
+
+
+def _table_value(raw: str) -> Any:
+    raw = raw.strip()
+    for convert in (int, float):
+        try:
+            return convert(raw)
+        except ValueError:
+            pass
+    return raw
+
+
+def read_parameter_table(path: str) -> List[Dict[str, Any]]:
+    """Read a CSV parameter table: one column per parameter, one row per
+    variant.
+
+    Numeric cells become ``int``/``float``; empty cells are left out so
+    that the parameter's default applies. An optional ``job_id`` column
+    names the variants.
+    """
+
+    with open(path, newline="", encoding="utf8") as handle:
+        return [
+            {
+                name.strip(): _table_value(cell)
+                for name, cell in row.items()
+                if name is not None and cell is not None and cell.strip() != ""
+            }
+            for row in csv.DictReader(handle)
+        ]
+
+
+def instantiate_row(
+    template: ParametricTemplate, row: Mapping[str, Any], index: int = 0
+) -> Dict[str, Any]:
+    """Return the job for one parameter-table row.
+
+    The job carries a ``job_id`` (the row's ``job_id`` column, else the
+    template's formatted ``job_id``, else ``index``) and a
+    ``parameters`` block echoing the bound values.
+    """
+
+    values = {k: v for k, v in row.items() if k != _ROW_JOB_ID}
+    try:
+        parameters = template.bind(values)
+        job = _resolve(template.body, parameters, "$")
+    except ValueError as exc:
+        raise ValueError(f"parameter row {index}: {exc}") from None
+    job[_ROW_JOB_ID] = row.get(_ROW_JOB_ID, job.get(_ROW_JOB_ID, index))
+    job["parameters"] = parameters
+    return job
+
+
+def expand_family(
+    template: ParametricTemplate, rows: Iterable[Mapping[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Yield one job per parameter row, lazily (see :func:`instantiate_row`)."""
+
+    for index, row in enumerate(rows):
+        yield instantiate_row(template, row, index)
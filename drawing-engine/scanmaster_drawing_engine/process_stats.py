@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+"""Small, dependency-free helpers for process memory statistics.
+
+``psutil`` is used when installed; otherwise we fall back to
+``/proc/self/statm`` (Linux) and :mod:`resource` (POSIX). Functions
+return ``None`` when a value is not available on the current platform.
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Return the current resident set size of this process in bytes."""
+
+    try:
+        import psutil  # type: ignore[import]
+
+        return int(psutil.Process().memory_info().rss)
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process in bytes."""
+
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows without psutil
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def process_memory(pid: int) -> Dict[str, Optional[int]]:
+    """Return ``rss_bytes``, ``pss_bytes`` and ``uss_bytes`` of process ``pid``.
+
+    PSS splits shared pages evenly between the processes mapping them
+    and USS counts only private pages, so for forked workers sharing
+    copy-on-write memory they show the real per-worker cost. Linux only
+    (``/proc/<pid>/smaps_rollup``); other platforms get ``None`` values.
+    """
+
+    fields = {"Rss:": "rss_bytes", "Pss:": "pss_bytes"}
+    stats: Dict[str, Optional[int]] = dict.fromkeys(
+        ("rss_bytes", "pss_bytes", "uss_bytes")
+    )
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r", encoding="ascii") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return stats
+
+    private = 0
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        if parts[0] in fields:
+            stats[fields[parts[0]]] = int(parts[1]) * 1024
+        elif parts[0] in ("Private_Clean:", "Private_Dirty:"):
+            private += int(parts[1]) * 1024
+    stats["uss_bytes"] = private
+    return stats
+
+
+def memory_stats() -> Dict[str, Optional[int]]:
+    return {
+        "rss_bytes": current_rss_bytes(),
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
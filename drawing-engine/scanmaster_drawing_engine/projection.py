@@ -0,0 +1,537 @@
+from __future__ import annotations
+
+"""Hidden-line projections of solids, shared across views and jobs.
+
+TechDraw runs a complete hidden-line removal (HLR) per ``DrawViewPart``:
+front, top and isometric views of the same body each load, index and
+project the shape from scratch, and nothing survives the job. This
+module projects with OCCT's ``HLRBRep_Algo`` directly instead:
+
+* all directions of one drawing go through a *single* HLR setup – the
+  shape is loaded once and only the projector changes per view, and
+* finished projections are kept in a :class:`ProjectionCache` keyed on
+  ``(shape key, direction, scale)``, so later jobs drawing the same
+  solid from the same direction skip the HLR entirely.
+
+The result of a projection is a :class:`ProjectedView`: visible and
+hidden edges as 2D polylines in drawing units (model units times the
+view scale), ready to be rendered or sent to a 2D preview. Section views
+(``ViewSpec.is_section``) project the solid cut in half through its
+centre and also return the outlines of the cut faces for hatching.
+"""
+
+import hashlib
+import io
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from .instrumentation import stage
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import cadquery as cq
+
+    from .drawing_engine import ViewSpec
+
+
+#: Maximum chordal deviation when discretising curved edges, in model
+#: units (before scaling).
+DEFAULT_DEFLECTION = 0.05
+
+DEFAULT_MAX_ENTRIES = 256
+
+Point2D = Tuple[float, float]
+Polyline = List[Point2D]
+Direction = Tuple[float, float, float]
+Circle = Tuple[float, float, float]
+
+
+@dataclass
+class ProjectedView:
+    """Hidden-line projection of a shape along one direction.
+
+    Coordinates are in the view plane: ``x`` to the right, ``y`` up,
+    already multiplied by ``scale``.
+    """
+
+    direction: Direction
+    scale: float
+    visible: List[Polyline]
+    hidden: List[Polyline]
+    #: ``(xmin, ymin, xmax, ymax)`` of all edges.
+    bounds: Tuple[float, float, float, float]
+    #: Wall time the HLR and discretisation took when computed.
+    compute_s: float = 0.0
+    #: ``(cx, cy, r)`` of visible circular edges seen along their axis.
+    circles: List[Circle] = field(default_factory=list)
+    #: Closed outlines of the cut faces of a section view.
+    section: List[Polyline] = field(default_factory=list)
+
+    def size_estimate(self) -> int:
+        """Approximate number of stored points (used for cache stats)."""
+
+        return sum(len(p) for p in self.visible) + sum(len(p) for p in self.hidden)
+
+
+@dataclass
+class ViewProjection:
+    """One requested view, with how its projection was obtained."""
+
+    view_id: str
+    projection: ProjectedView
+    cached: bool
+    elapsed_s: float
+
+    def report(self) -> Dict[str, Any]:
+        """Per-view summary for job results.
+
+        ``speedup`` compares the original HLR time with the time this
+        lookup took; it is ``1.0`` for freshly computed views.
+        """
+
+        compute_s = self.projection.compute_s
+        speedup = compute_s / self.elapsed_s if self.cached and self.elapsed_s else 1.0
+        return {
+            "id": self.view_id,
+            "cached": self.cached,
+            "compute_s": round(compute_s, 6),
+            "elapsed_s": round(self.elapsed_s, 6),
+            "saved_s": round(max(compute_s - self.elapsed_s, 0.0), 6)
+            if self.cached
+            else 0.0,
+            "speedup": round(speedup, 2),
+            "visible_edges": len(self.projection.visible),
+            "hidden_edges": len(self.projection.hidden),
+        }
+
+
+# ----- Cache -----------------------------------------------------------------------
+
+
+def _normalise_direction(direction: Sequence[float]) -> Direction:
+    x, y, z = (float(c) for c in direction)
+    length = math.sqrt(x * x + y * y + z * z)
+    if length == 0.0:
+        raise ValueError("Projection direction must not be the zero vector")
+    return (x / length, y / length, z / length)
+
+
+def _cache_key(shape_key: str, direction: Direction, scale: float) -> Tuple[Any, ...]:
+    # Rounded so that (1, -1, 1) and (0.577.., -0.577.., 0.577..) share
+    # an entry.
+    return (
+        shape_key,
+        tuple(round(c, 9) for c in direction),
+        round(scale, 9),
+    )
+
+
+def shape_content_key(shape: cq.Shape) -> str:
+    """Return a SHA-256 of the shape's BREP serialisation.
+
+    Used when the caller has no cheaper content key (such as the solid
+    cache key of the spec the shape was built from).
+    """
+
+    buf = io.BytesIO()
+    shape.exportBrep(buf)
+    return hashlib.sha256(buf.getvalue()).hexdigest()
+
+
+@dataclass
+class ProjectionCacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    points: int = 0
+    saved_s: float = 0.0
+
+
+class ProjectionCache:
+    """In-memory LRU of :class:`ProjectedView` objects.
+
+    Parameters
+    ----------
+    max_entries:
+        Number of projections kept; least recently used ones are
+        evicted beyond that.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries <= 0:
+            raise ValueError("ProjectionCache.max_entries must be positive")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], ProjectedView]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = ProjectionCacheStats()
+
+    @classmethod
+    def from_env(cls) -> Optional["ProjectionCache"]:
+        """Build a cache from ``SCANMASTER_PROJECTION_CACHE_ENTRIES``.
+
+        Returns ``None`` when the variable is unset or ``0``.
+        """
+
+        raw = os.environ.get("SCANMASTER_PROJECTION_CACHE_ENTRIES")
+        if not raw or int(raw) <= 0:
+            return None
+        return cls(max_entries=int(raw))
+
+    def get(
+        self, shape_key: str, direction: Direction, scale: float
+    ) -> Optional[ProjectedView]:
+        key = _cache_key(shape_key, direction, scale)
+        with self._lock:
+            view = self._entries.get(key)
+            if view is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            self._stats.saved_s += view.compute_s
+            return view
+
+    def put(self, shape_key: str, view: ProjectedView) -> None:
+        key = _cache_key(shape_key, view.direction, view.scale)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._stats.points -= previous.size_estimate()
+            self._entries[key] = view
+            self._stats.points += view.size_estimate()
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._stats.points -= evicted.size_estimate()
+                self._stats.evictions += 1
+            self._stats.entries = len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.points = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self._stats
+            return {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "evictions": stats.evictions,
+                "entries": stats.entries,
+                "points": stats.points,
+                "saved_s": round(stats.saved_s, 6),
+            }
+
+
+# ----- HLR -------------------------------------------------------------------------
+
+
+def _view_axes(direction: Direction) -> Direction:
+    """Return the view's ``x`` axis so that model +Z points up on paper.
+
+    Views looking along Z (top/bottom) use model +Y as "up" instead.
+    """
+
+    dx, dy, dz = direction
+    up = (0.0, 0.0, 1.0) if abs(dz) < 0.999999 else (0.0, 1.0, 0.0)
+    # x = up × direction
+    x = (
+        up[1] * dz - up[2] * dy,
+        up[2] * dx - up[0] * dz,
+        up[0] * dy - up[1] * dx,
+    )
+    length = math.sqrt(sum(c * c for c in x))
+    return (x[0] / length, x[1] / length, x[2] / length)
+
+
+def _cross(a: Sequence[float], b: Sequence[float]) -> Direction:
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _edge_polylines(
+    compound: Any,
+    scale: float,
+    deflection: float,
+    circles: Optional[List[Circle]] = None,
+) -> List[Polyline]:
+    """Discretise every edge of an HLR result compound into a polyline.
+
+    When ``circles`` is given, circular edges are also recorded there
+    (HLR output lies in the view plane, so these are circles seen along
+    their axis; tilted ones come out as ellipses).
+    """
+
+    from OCP.BRepAdaptor import BRepAdaptor_Curve
+    from OCP.GCPnts import GCPnts_QuasiUniformDeflection
+    from OCP.GeomAbs import GeomAbs_Circle, GeomAbs_Line
+    from OCP.TopAbs import TopAbs_EDGE
+    from OCP.TopExp import TopExp_Explorer
+    from OCP.TopoDS import TopoDS
+
+    polylines: List[Polyline] = []
+    if compound is None or compound.IsNull():
+        return polylines
+
+    explorer = TopExp_Explorer(compound, TopAbs_EDGE)
+    while explorer.More():
+        curve = BRepAdaptor_Curve(TopoDS.Edge_s(explorer.Current()))
+        explorer.Next()
+        first, last = curve.FirstParameter(), curve.LastParameter()
+
+        curve_type = curve.GetType()
+        if curve_type == GeomAbs_Circle and circles is not None:
+            circ = curve.Circle()
+            centre = circ.Location()
+            circles.append(
+                (centre.X() * scale, centre.Y() * scale, circ.Radius() * scale)
+            )
+
+        if curve_type == GeomAbs_Line:
+            params = [first, last]
+        else:
+            sampler = GCPnts_QuasiUniformDeflection(curve, deflection, first, last)
+            if not sampler.IsDone() or sampler.NbPoints() < 2:
+                params = [first, last]
+            else:
+                params = [sampler.Parameter(i) for i in range(1, sampler.NbPoints() + 1)]
+
+        points: Polyline = []
+        for t in params:
+            p = curve.Value(t)
+            points.append((p.X() * scale, p.Y() * scale))
+        polylines.append(points)
+    return polylines
+
+
+def _bounds(polylines: Sequence[Polyline]) -> Tuple[float, float, float, float]:
+    xs = [x for line in polylines for x, _ in line]
+    ys = [y for line in polylines for _, y in line]
+    if not xs:
+        return (0.0, 0.0, 0.0, 0.0)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _section_shape(shape: cq.Shape, normal: Direction) -> Tuple[cq.Shape, Any]:
+    """Cut ``shape`` through its bounding-box centre, normal to ``normal``.
+
+    The half on the ``+normal`` side (towards the viewer of a section
+    view looking along ``normal``) is removed. Returns the remaining
+    shape and the cutting plane as a ``cq.Plane``.
+    """
+
+    import cadquery as cq
+
+    bb = shape.BoundingBox()
+    size = 2.0 * bb.DiagonalLength + 1.0
+    plane = cq.Plane(origin=bb.center, xDir=_view_axes(normal), normal=normal)
+    half_space = cq.Workplane(plane).rect(size, size).extrude(size).val()
+    return shape.cut(half_space), plane
+
+
+def _section_outlines(
+    shape: cq.Shape,
+    plane: Any,
+    direction: Direction,
+    scale: float,
+    deflection: float,
+) -> List[Polyline]:
+    """Return the wires of the faces lying on ``plane``, in view coordinates."""
+
+    from OCP.BRepAdaptor import BRepAdaptor_Curve
+    from OCP.GCPnts import GCPnts_QuasiUniformDeflection
+    from OCP.TopAbs import TopAbs_REVERSED
+
+    origin = plane.origin.toTuple()
+    normal = plane.zDir.toTuple()
+    x_axis = _view_axes(direction)
+    y_axis = _cross(direction, x_axis)
+    tolerance = 1e-6 * (1.0 + shape.BoundingBox().DiagonalLength)
+
+    outlines: List[Polyline] = []
+    for face in shape.Faces():
+        if face.geomType() != "PLANE":
+            continue
+        offset = [c - o for c, o in zip(face.Center().toTuple(), origin)]
+        if abs(abs(_dot(face.normalAt().toTuple(), normal)) - 1.0) > 1e-9:
+            continue
+        if abs(_dot(offset, normal)) > tolerance:
+            continue
+        for wire in face.Wires():
+            points: Polyline = []
+            for edge in wire.Edges():
+                curve = BRepAdaptor_Curve(edge.wrapped)
+                first, last = curve.FirstParameter(), curve.LastParameter()
+                sampler = GCPnts_QuasiUniformDeflection(curve, deflection, first, last)
+                params = [first, last]
+                if sampler.IsDone() and sampler.NbPoints() >= 2:
+                    params = [
+                        sampler.Parameter(i) for i in range(1, sampler.NbPoints() + 1)
+                    ]
+                if edge.wrapped.Orientation() == TopAbs_REVERSED:
+                    params.reverse()
+                for t in params:
+                    p = curve.Value(t)
+                    xyz = (p.X(), p.Y(), p.Z())
+                    points.append(
+                        (_dot(xyz, x_axis) * scale, _dot(xyz, y_axis) * scale)
+                    )
+            outlines.append(points)
+    return outlines
+
+
+class _SharedHLR:
+    """One ``HLRBRep_Algo`` loaded with a shape, reused for every view."""
+
+    def __init__(
+        self, shape: cq.Shape, deflection: float, section_plane: Any = None
+    ) -> None:
+        from OCP.HLRBRep import HLRBRep_Algo
+
+        self.shape = shape
+        self.deflection = deflection
+        self.section_plane = section_plane
+        self._algo = HLRBRep_Algo()
+        self._algo.Add(shape.wrapped)
+
+    def project(self, direction: Direction, scale: float) -> ProjectedView:
+        from OCP.gp import gp_Ax2, gp_Dir, gp_Pnt
+        from OCP.HLRAlgo import HLRAlgo_Projector
+        from OCP.HLRBRep import HLRBRep_HLRToShape
+
+        start = time.perf_counter()
+        axes = gp_Ax2(
+            gp_Pnt(0.0, 0.0, 0.0), gp_Dir(*direction), gp_Dir(*_view_axes(direction))
+        )
+        self._algo.Projector(HLRAlgo_Projector(axes))
+        self._algo.Update()
+        self._algo.Hide()
+
+        extractor = HLRBRep_HLRToShape(self._algo)
+        visible: List[Polyline] = []
+        hidden: List[Polyline] = []
+        circles: List[Circle] = []
+        # Sharp edges, smooth (tangent) edges and silhouettes of curved
+        # faces, each visible and hidden.
+        for getter, target, found in (
+            (extractor.VCompound, visible, circles),
+            (extractor.Rg1LineVCompound, visible, None),
+            (extractor.OutLineVCompound, visible, None),
+            (extractor.HCompound, hidden, None),
+            (extractor.OutLineHCompound, hidden, None),
+        ):
+            target.extend(_edge_polylines(getter(), scale, self.deflection, found))
+
+        section: List[Polyline] = []
+        if self.section_plane is not None:
+            section = _section_outlines(
+                self.shape, self.section_plane, direction, scale, self.deflection
+            )
+
+        return ProjectedView(
+            direction=direction,
+            scale=scale,
+            visible=visible,
+            hidden=hidden,
+            bounds=_bounds(visible + hidden),
+            compute_s=time.perf_counter() - start,
+            # Full circles come out of HLR as two arcs.
+            circles=sorted({tuple(round(v, 6) for v in c) for c in circles}),
+            section=section,
+        )
+
+
+def project_views(
+    solid: cq.Workplane,
+    views: Sequence[ViewSpec],
+    cache: Optional[ProjectionCache] = None,
+    shape_key: Optional[str] = None,
+    deflection: float = DEFAULT_DEFLECTION,
+) -> List[ViewProjection]:
+    """Project ``solid`` along the direction of every view in ``views``.
+
+    Parameters
+    ----------
+    solid:
+        CadQuery workplane whose current object is the solid body.
+    views:
+        View specs; ``direction``, ``scale`` (default ``1``) and the
+        section settings are used. Section views cut the solid through
+        its bounding-box centre, normal to ``section_normal`` (or the
+        view direction when unset).
+    cache:
+        Optional :class:`ProjectionCache`. Views already in the cache
+        are returned without running HLR; new ones are stored.
+    shape_key:
+        Content key of the solid, e.g. the solid cache key of its spec.
+        Computed from the BREP when omitted and a cache is given.
+    deflection:
+        Chordal tolerance for discretising curved edges.
+
+    Returns one :class:`ViewProjection` per view, in order.
+    """
+
+    shape = solid.val()
+    if cache is not None and shape_key is None:
+        shape_key = shape_content_key(shape)
+
+    # One HLR setup for the full solid plus one per distinct section.
+    setups: Dict[Optional[Direction], _SharedHLR] = {}
+    results: List[ViewProjection] = []
+    for vspec in views:
+        direction = _normalise_direction(vspec.direction)
+        scale = float(vspec.scale) if vspec.scale is not None else 1.0
+        section_normal: Optional[Direction] = None
+        view_key = shape_key
+        if vspec.is_section:
+            section_normal = _normalise_direction(vspec.section_normal or direction)
+            normal_text = ",".join(f"{c:.9f}" for c in section_normal)
+            view_key = f"{shape_key}|section:{normal_text}"
+
+        with stage("projection.view", view=vspec.id) as meta:
+            start = time.perf_counter()
+            projected = (
+                cache.get(view_key, direction, scale)  # type: ignore[arg-type]
+                if cache is not None
+                else None
+            )
+            cached = projected is not None
+            if projected is None:
+                hlr = setups.get(section_normal)
+                if hlr is None:
+                    with stage("projection.load", section=section_normal is not None):
+                        if section_normal is None:
+                            hlr = _SharedHLR(shape, deflection)
+                        else:
+                            cut, plane = _section_shape(shape, section_normal)
+                            hlr = _SharedHLR(cut, deflection, section_plane=plane)
+                    setups[section_normal] = hlr
+                projected = hlr.project(direction, scale)
+                if cache is not None:
+                    cache.put(view_key, projected)  # type: ignore[arg-type]
+            meta["cached"] = cached
+
+        results.append(
+            ViewProjection(
+                view_id=vspec.id,
+                projection=projected,
+                cached=cached,
+                elapsed_s=time.perf_counter() - start,
+            )
+        )
+    return results
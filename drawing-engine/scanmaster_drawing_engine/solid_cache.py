@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+"""Content-addressed cache for solids built by :class:`GeometryEngine`.
+
+Identical :class:`~scanmaster_drawing_engine.geometry_engine.SolidSpec`
+instances (same operations, same dimensions up to a small tolerance)
+always produce the same solid, so there is no need to redo the boolean
+cuts every time an operator regenerates a calibration block or ring.
+
+The cache has two tiers:
+
+* an in-memory LRU of built shapes, bounded by an approximate byte size
+  (the size of the shape's BREP serialisation), and
+* an optional on-disk tier storing BREP files, so hits survive worker
+  restarts.
+
+Keys are SHA-256 hashes of a *canonical* form of the spec, see
+:func:`canonical_solid_spec`.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .geometry_engine import (
+    BaseBox,
+    CutBoxTable,
+    Extrude,
+    SketchCircle,
+    SolidSpec,
+    ThroughHoleTable,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import cadquery as cq
+
+
+DEFAULT_TOLERANCE = 1e-6
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+# ----- Canonical form ------------------------------------------------------------
+
+
+def _quantise(value: Any, tolerance: float) -> Any:
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        # Integers of quanta avoid float repr differences such as
+        # 10.0 vs 10.000000000001 producing different hashes.
+        return int(round(float(value) / tolerance))
+    if isinstance(value, (list, tuple)):
+        return [_quantise(v, tolerance) for v in value]
+    if isinstance(value, dict):
+        return {k: _quantise(v, tolerance) for k, v in value.items()}
+    raise TypeError(f"Cannot canonicalise value of type {type(value)!r}")
+
+
+def canonical_solid_spec(
+    spec: SolidSpec, tolerance: float = DEFAULT_TOLERANCE
+) -> Dict[str, Any]:
+    """Return a canonical, JSON-serialisable form of ``spec``.
+
+    * The spec ``id`` is ignored – it does not affect the geometry.
+    * Floats are quantised to multiples of ``tolerance``.
+    * Base operations (sketch circles, extrude, base box) and modifier
+      operations (cuts) are each sorted, since their order does not
+      change the resulting solid.
+    * Operation tables contribute one entry per row, so a table and the
+      equivalent individual operations share a key.
+    """
+
+    base: List[Dict[str, Any]] = []
+    modifiers: List[Dict[str, Any]] = []
+
+    for spec_op in spec.operations:
+        if isinstance(spec_op, (ThroughHoleTable, CutBoxTable)):
+            rows: Any = spec_op.rows()
+        else:
+            rows = (spec_op,)
+        for op in rows:
+            entry = {"type": type(op).__name__, **_quantise(asdict(op), tolerance)}
+            if isinstance(op, (SketchCircle, Extrude, BaseBox)):
+                base.append(entry)
+            else:
+                modifiers.append(entry)
+
+    def sort_key(entry: Dict[str, Any]) -> str:
+        return json.dumps(entry, sort_keys=True)
+
+    return {
+        "base": sorted(base, key=sort_key),
+        "modifiers": sorted(modifiers, key=sort_key),
+    }
+
+
+def solid_spec_key(spec: SolidSpec, tolerance: float = DEFAULT_TOLERANCE) -> str:
+    """Return the SHA-256 hex digest of the canonical form of ``spec``."""
+
+    payload = json.dumps(
+        canonical_solid_spec(spec, tolerance), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+# ----- Cache ---------------------------------------------------------------------
+
+
+@dataclass
+class SolidCacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+def _shape_to_brep(shape: cq.Shape) -> bytes:
+    buf = io.BytesIO()
+    shape.exportBrep(buf)
+    return buf.getvalue()
+
+
+def _shape_from_brep(data: bytes) -> cq.Shape:
+    import cadquery as cq
+
+    return cq.Shape.importBrep(io.BytesIO(data))
+
+
+class SolidCache:
+    """LRU cache of built solids with an optional on-disk BREP tier.
+
+    Parameters
+    ----------
+    max_bytes:
+        Upper bound on the summed BREP size of all in-memory entries.
+        Least recently used entries are evicted once it is exceeded.
+    disk_dir:
+        Optional directory for the persistent tier. Entries are stored
+        as ``<key>.brep`` and are never evicted automatically.
+    tolerance:
+        Quantisation step used when canonicalising specs.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        disk_dir: Optional[str] = None,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("SolidCache.max_bytes must be positive")
+        if tolerance <= 0:
+            raise ValueError("SolidCache.tolerance must be positive")
+
+        self.max_bytes = max_bytes
+        self.tolerance = tolerance
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[str, Tuple[cq.Shape, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = SolidCacheStats()
+
+    @classmethod
+    def from_env(cls) -> Optional["SolidCache"]:
+        """Build a cache from environment variables, or return ``None``.
+
+        ``SCANMASTER_SOLID_CACHE_MB`` enables the in-memory tier with the
+        given size bound (``0`` disables caching entirely) and
+        ``SCANMASTER_SOLID_CACHE_DIR`` enables the on-disk tier.
+        """
+
+        size_mb_raw = os.environ.get("SCANMASTER_SOLID_CACHE_MB")
+        disk_dir = os.environ.get("SCANMASTER_SOLID_CACHE_DIR") or None
+        if size_mb_raw is None and disk_dir is None:
+            return None
+
+        size_mb = float(size_mb_raw) if size_mb_raw else DEFAULT_MAX_BYTES / 2**20
+        if size_mb <= 0:
+            return None
+        return cls(max_bytes=int(size_mb * 2**20), disk_dir=disk_dir)
+
+    def key_for(self, spec: SolidSpec) -> str:
+        return solid_spec_key(spec, self.tolerance)
+
+    def get(self, key: str) -> Optional[cq.Workplane]:
+        """Return the cached solid for ``key`` or ``None`` on a miss."""
+
+        import cadquery as cq
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return cq.Workplane("XY").newObject([entry[0]])
+
+        data = self._read_disk(key)
+        if data is None:
+            with self._lock:
+                self._stats.misses += 1
+            return None
+
+        shape = _shape_from_brep(data)
+        with self._lock:
+            self._stats.disk_hits += 1
+            self._insert(key, shape, len(data))
+        return cq.Workplane("XY").newObject([shape])
+
+    def put(self, key: str, solid: cq.Workplane) -> None:
+        """Store ``solid`` under ``key`` in memory (and on disk if enabled)."""
+
+        shape = solid.val()
+        data = _shape_to_brep(shape)
+        with self._lock:
+            self._insert(key, shape, len(data))
+        self._write_disk(key, data)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries. The disk tier is left untouched."""
+
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return asdict(self._stats)
+
+    # -- internals -------------------------------------------------------------
+
+    def _insert(self, key: str, shape: cq.Shape, size: int) -> None:
+        # Caller holds the lock.
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._stats.bytes -= previous[1]
+
+        self._entries[key] = (shape, size)
+        self._stats.bytes += size
+
+        # Always keep the newest entry, even if it alone exceeds the bound.
+        while self._stats.bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._stats.bytes -= evicted_size
+            self._stats.evictions += 1
+
+        self._stats.entries = len(self._entries)
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / f"{key}.brep"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        if path is None or not path.is_file():
+            return None
+        return path.read_bytes()
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        path = self._disk_path(key)
+        if path is None or path.exists():
+            return
+        # A unique temp file per write: threads of one process (and other
+        # workers) storing the same key must not share a temp name.
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+        )
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(data)
+            # Atomic on both POSIX and Windows, so concurrent workers never
+            # observe half-written files.
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
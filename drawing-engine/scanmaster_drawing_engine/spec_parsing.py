@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+"""JSON → spec conversion, usable without CadQuery or FreeCAD.
+
+These helpers turn the plain dicts sent by the Node/TypeScript side into
+:class:`~scanmaster_drawing_engine.geometry_engine.SolidSpec` and
+:class:`~scanmaster_drawing_engine.drawing_engine.DrawingSpec`
+instances. Importing this module (and the spec modules it depends on)
+does not pull in any CAD kernel, so request parsing and validation can
+run in lightweight processes and fail fast before any CAD work.
+"""
+
+import dataclasses
+from typing import Any, Dict, Iterator, List, Optional
+
+from .drawing_engine import DimensionSpec, DrawingSpec, ViewSpec
+from .geometry_engine import (
+    BaseBox,
+    BooleanOptions,
+    CutBox,
+    Extrude,
+    HoleArray,
+    SketchCircle,
+    SolidSpec,
+    ThroughHole,
+    ThroughHoleTable,
+    CutBoxTable,
+)
+
+
+def solid_spec_from_dict(data: Dict[str, Any]) -> SolidSpec:
+    """Build a :class:`SolidSpec` from its JSON representation.
+
+    ``ThroughHole`` and ``CutBox`` tables in ``columns`` (see
+    :mod:`~scanmaster_drawing_engine.job_codec`) become one
+    :class:`ThroughHoleTable` / :class:`CutBoxTable` each, without an
+    object per row; other column tables are parsed row by row.
+    """
+
+    ops: List[Any] = [_operation_from_dict(op) for op in data.get("operations", [])]
+    for op_type, table in data.get("columns", {}).items():
+        count = column_count(table)
+        if op_type == "ThroughHole":
+            ops.append(
+                ThroughHoleTable(
+                    radius=_float_column(table["radius"], count),
+                    depth=_float_column(table["depth"], count),
+                    center=_vector_column(table.get("center"), count),
+                    axis=_axis_column(table.get("axis", "z")),
+                )
+            )
+        elif op_type == "CutBox":
+            ops.append(
+                CutBoxTable(
+                    width=_float_column(table["width"], count),
+                    depth=_float_column(table["depth"], count),
+                    height=_float_column(table["height"], count),
+                    center=_vector_column(table["center"], count),
+                )
+            )
+        else:
+            ops.extend(
+                _operation_from_dict(op) for op in column_rows(op_type, table, count)
+            )
+
+    return SolidSpec(id=str(data["id"]), operations=ops)
+
+
+def _operation_from_dict(op: Dict[str, Any]) -> Any:
+    op_type = op.get("type")
+    if op_type == "SketchCircle":
+        return SketchCircle(
+            radius=float(op["radius"]),
+            is_hole=bool(op.get("is_hole", False)),
+        )
+    if op_type == "Extrude":
+        return Extrude(length=float(op["length"]))
+    if op_type == "BaseBox":
+        return BaseBox(
+            width=float(op["width"]),
+            depth=float(op["depth"]),
+            height=float(op["height"]),
+            centered_xy=bool(op.get("centered_xy", True)),
+            centered_z=bool(op.get("centered_z", False)),
+        )
+    if op_type == "CutBox":
+        return CutBox(
+            width=float(op["width"]),
+            depth=float(op["depth"]),
+            height=float(op["height"]),
+            center=tuple(float(v) for v in op["center"]),
+        )
+    if op_type == "ThroughHole":
+        return ThroughHole(
+            radius=float(op["radius"]),
+            depth=float(op["depth"]),
+            axis=str(op.get("axis", "z")),
+            center=tuple(float(v) for v in op.get("center", [0.0, 0.0, 0.0])),
+        )
+    if op_type == "HoleArray":
+        return HoleArray(
+            radius=float(op["radius"]),
+            depth=float(op["depth"]),
+            count=int(op["count"]),
+            layout=str(op.get("layout", "linear")),
+            axis=str(op.get("axis", "z")),
+            origin=tuple(float(v) for v in op.get("origin", [0.0, 0.0, 0.0])),
+            pitch=tuple(float(v) for v in op.get("pitch", [0.0, 0.0, 0.0])),
+            rows=int(op.get("rows", 1)),
+            row_pitch=tuple(float(v) for v in op.get("row_pitch", [0.0, 0.0, 0.0])),
+            pattern_radius=float(op.get("pattern_radius", 0.0)),
+            start_angle=float(op.get("start_angle", 0.0)),
+            sweep_angle=float(op.get("sweep_angle", 360.0)),
+        )
+    raise ValueError(f"Unsupported operation type in JSON: {op_type!r}")
+
+
+# ----- Columnar operations ----------------------------------------------------------
+#
+# A ``columns`` table maps each field to a list with one entry per row or
+# to a scalar shared by all rows; ``None`` entries mark a field the row
+# does not set. Validation has checked the tables before they get here.
+
+
+def column_count(table: Dict[str, Any]) -> int:
+    """Number of rows of a (valid) ``columns`` table."""
+
+    return max(len(value) for value in table.values() if isinstance(value, list))
+
+
+def column_rows(
+    op_type: str, table: Dict[str, Any], count: int
+) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a ``columns`` table as operation dicts."""
+
+    fields = [
+        (name, value if isinstance(value, list) else [value] * count)
+        for name, value in table.items()
+    ]
+    names = [name for name, _ in fields]
+    for row in zip(*(values for _, values in fields)):
+        op = {name: value for name, value in zip(names, row) if value is not None}
+        op["type"] = op_type
+        yield op
+
+
+def _float_column(value: Any, count: int) -> Any:
+    import numpy as np
+
+    if isinstance(value, list):
+        return np.array(value, dtype=float)
+    return np.full(count, float(value))
+
+
+def _vector_column(value: Any, count: int) -> Any:
+    import numpy as np
+
+    if value is None:
+        return np.zeros((count, 3))
+    if None in value:
+        value = [(0.0, 0.0, 0.0) if v is None else v for v in value]
+    return np.array(value, dtype=float).reshape(count, 3)
+
+
+def _axis_column(value: Any) -> Any:
+    import numpy as np
+
+    if not isinstance(value, list):
+        return str(value)
+    if None in value:
+        value = ["z" if v is None else v for v in value]
+    return np.array(value, dtype="<U1")
+
+
+def drawing_spec_from_dict(data: Dict[str, Any]) -> DrawingSpec:
+    """Build a :class:`DrawingSpec` from its JSON representation."""
+
+    views: List[ViewSpec] = []
+    for v in data.get("views", []):
+        direction = tuple(float(c) for c in v["direction"])
+        section_normal_raw = v.get("section_normal")
+        section_normal = (
+            tuple(float(c) for c in section_normal_raw)
+            if section_normal_raw is not None
+            else None
+        )
+        views.append(
+            ViewSpec(
+                id=str(v["id"]),
+                direction=direction,
+                is_section=bool(v.get("is_section", False)),
+                section_normal=section_normal,
+                scale=float(v["scale"]) if v.get("scale") is not None else None,
+            )
+        )
+
+    dims: List[DimensionSpec] = []
+    for d in data.get("dimensions", []):
+        dims.append(
+            DimensionSpec(
+                view_id=str(d["view_id"]),
+                kind=str(d["kind"]),
+                label=str(d["label"]),
+                edges=[str(e) for e in d.get("edges", [])],
+            )
+        )
+
+    return DrawingSpec(
+        page_title=str(data["page_title"]),
+        template_path=str(data["template_path"]),
+        views=views,
+        dimensions=dims,
+    )
+
+
+def boolean_options_from_dict(
+    data: Dict[str, Any], base: Optional[BooleanOptions] = None
+) -> BooleanOptions:
+    """Build :class:`BooleanOptions` from a job's ``boolean`` object.
+
+    Keys that are not given keep their value from ``base`` (usually the
+    engine's defaults).
+    """
+
+    fields: Dict[str, Any] = {}
+    if "parallel" in data:
+        fields["parallel"] = bool(data["parallel"])
+    if "fuzzy" in data:
+        fields["fuzzy"] = float(data["fuzzy"] or 0.0)
+    if "glue" in data:
+        fields["glue"] = str(data["glue"])
+    return dataclasses.replace(base or BooleanOptions(), **fields)
@@ -0,0 +1,542 @@
+from __future__ import annotations
+
+"""FreeCAD-free drawing backend: OCCT projections rendered to SVG.
+
+:func:`generate_svg_drawing` takes the same :class:`DrawingSpec` as
+:func:`~scanmaster_drawing_engine.drawing_engine.generate_drawing` but
+needs only CadQuery/OCP. Views are projected with
+:func:`~scanmaster_drawing_engine.projection.project_views` (one shared
+HLR setup, optional projection cache), laid out in a grid on the SVG
+template and annotated with simple dimensions. PDF output is optional
+and uses ``cairosvg`` when it is installed.
+
+Dimensions cannot use TechDraw's edge names here. Instead the first
+number in a dimension's ``label`` is matched against the measurable
+features of its view – overall extents, distances between straight
+vertical/horizontal edges and circle centres (``"linear"``), circle
+diameters and symmetric widths (``"diameter"``) – and the dimension is
+drawn on the best match. Labels without a matching feature fall back to
+the view's overall width/height or largest circle.
+"""
+
+import io
+import math
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from .instrumentation import stage
+from .projection import ProjectedView, ProjectionCache, ViewProjection, project_views
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import cadquery as cq
+
+    from .drawing_engine import DimensionSpec, DrawingSpec
+
+
+SVG_NS = "http://www.w3.org/2000/svg"
+FREECAD_NS = "http://www.freecadweb.org/wiki/index.php?title=Svg_Namespace"
+
+#: Page used when the template does not state its size (A4 landscape).
+DEFAULT_PAGE_MM = (297.0, 210.0)
+PAGE_MARGIN_MM = 10.0
+#: Band at the bottom of the page kept free for the template's title block.
+TITLE_BLOCK_MM = 50.0
+#: Share of a layout cell that auto-scaled views may fill; the rest is
+#: left for dimensions.
+VIEW_FILL = 0.6
+
+DIM_OFFSET_MM = 8.0
+DIM_SPACING_MM = 7.0
+
+_STYLE = """
+.visible { fill: none; stroke: #000; stroke-width: 0.35; stroke-linecap: round; }
+.hidden { fill: none; stroke: #000; stroke-width: 0.18; stroke-dasharray: 2,1; }
+.section { fill: url(#hatch); stroke: none; fill-rule: evenodd; }
+.dim { fill: none; stroke: #000; stroke-width: 0.18; }
+.dimtext { font-family: osifont, sans-serif; font-size: 3.5px; fill: #000; }
+"""
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+
+
+# ----- Template --------------------------------------------------------------------
+
+
+def _length_mm(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    match = re.match(r"\s*([0-9.]+)\s*(mm|cm|in|px)?\s*$", value)
+    if match is None:
+        return None
+    number = float(match.group(1))
+    factor = {"mm": 1.0, "cm": 10.0, "in": 25.4, "px": 25.4 / 96.0, None: 1.0}
+    return number * factor[match.group(2)]
+
+
+# Template file contents by (path, mtime_ns, size). Filled on first use
+# or upfront by preload_templates, e.g. in a prefork parent so that all
+# forked workers share the bytes.
+_TEMPLATE_SOURCES: Dict[Tuple[str, int, int], bytes] = {}
+
+
+def _template_source(path: str) -> bytes:
+    template = Path(path)
+    if not template.is_file():
+        raise FileNotFoundError(f"Drawing template not found: {path}")
+
+    info = template.stat()
+    key = (str(template.resolve()), info.st_mtime_ns, info.st_size)
+    source = _TEMPLATE_SOURCES.get(key)
+    if source is None:
+        source = _TEMPLATE_SOURCES[key] = template.read_bytes()
+    return source
+
+
+def preload_templates(paths: Sequence[str]) -> int:
+    """Read the given SVG templates into the in-process template cache.
+
+    Only this backend reads the cache; TechDraw loads its template from
+    the file for every page.
+
+    Edited template files are picked up again (the cache key includes
+    the modification time). Returns the number of templates loaded.
+    """
+
+    for path in paths:
+        _template_source(path)
+    return len(paths)
+
+
+def _load_template(path: str, title: str) -> Tuple[ET.ElementTree, float, float, float]:
+    """Parse the SVG template and fill in the drawing title.
+
+    Returns the tree, the page size in mm and the number of SVG user
+    units per mm.
+    """
+
+    source = _template_source(path)
+
+    # Keep the template's own namespace prefixes when writing it back.
+    for _, (prefix, uri) in ET.iterparse(io.BytesIO(source), events=("start-ns",)):
+        ET.register_namespace(prefix, uri)
+    tree = ET.ElementTree(ET.fromstring(source))
+    root = tree.getroot()
+
+    width = _length_mm(root.get("width")) or DEFAULT_PAGE_MM[0]
+    height = _length_mm(root.get("height")) or DEFAULT_PAGE_MM[1]
+    units_per_mm = 1.0
+    view_box = root.get("viewBox")
+    if view_box:
+        box = [float(v) for v in view_box.replace(",", " ").split()]
+        if len(box) == 4 and box[2] > 0:
+            units_per_mm = box[2] / width
+
+    for element in root.iter(f"{{{SVG_NS}}}text"):
+        if element.get(f"{{{FREECAD_NS}}}editable") in ("DrawingTitle", "Title"):
+            tspans = list(element.iter(f"{{{SVG_NS}}}tspan"))
+            (tspans[0] if tspans else element).text = title
+
+    return tree, width, height, units_per_mm
+
+
+# ----- Dimension candidates ----------------------------------------------------------
+
+
+@dataclass
+class _Feature:
+    """A measurable feature of a view, in view coordinates."""
+
+    kind: str  # "h" (horizontal span), "v" (vertical span) or "circle"
+    a: float
+    b: float
+    value: float  # in model units
+    circle: Optional[Tuple[float, float, float]] = None
+
+
+def _distinct(values: Sequence[float], tolerance: float) -> List[float]:
+    result: List[float] = []
+    for v in sorted(values):
+        if not result or v - result[-1] > tolerance:
+            result.append(v)
+    return result
+
+
+def _view_features(view: ProjectedView) -> List[_Feature]:
+    xmin, ymin, xmax, ymax = view.bounds
+    tolerance = 1e-6 * (1.0 + max(xmax - xmin, ymax - ymin))
+
+    xs = [xmin, xmax] + [c[0] for c in view.circles]
+    ys = [ymin, ymax] + [c[1] for c in view.circles]
+    for line in view.visible + view.section:
+        for (x0, y0), (x1, y1) in zip(line, line[1:]):
+            if abs(x1 - x0) <= tolerance:
+                xs.append(x0)
+            if abs(y1 - y0) <= tolerance:
+                ys.append(y0)
+
+    features: List[_Feature] = []
+    for kind, coords in (("h", _distinct(xs, tolerance)), ("v", _distinct(ys, tolerance))):
+        # Keep the pair search bounded on very busy views.
+        coords = coords[:200]
+        for i, a in enumerate(coords):
+            for b in coords[i + 1 :]:
+                features.append(_Feature(kind, a, b, (b - a) / view.scale))
+    for circle in view.circles:
+        features.append(
+            _Feature("circle", 0.0, 0.0, 2.0 * circle[2] / view.scale, circle=circle)
+        )
+    return features
+
+
+def _nominal(label: str) -> Optional[float]:
+    match = _NUMBER.search(label)
+    return float(match.group(0).replace(",", ".")) if match else None
+
+
+def _is_extent(feature: _Feature, view: ProjectedView) -> bool:
+    xmin, ymin, xmax, ymax = view.bounds
+    if feature.kind == "h":
+        return (feature.a, feature.b) == (xmin, xmax)
+    if feature.kind == "v":
+        return (feature.a, feature.b) == (ymin, ymax)
+    return False
+
+
+def _pick_feature(
+    dim: DimensionSpec, view: ProjectedView, features: List[_Feature], used: List[_Feature]
+) -> Optional[_Feature]:
+    diameter = dim.kind.lower() in {"diameter", "radial", "radius"}
+    kinds = ("circle", "h", "v") if diameter else ("h", "v")
+    candidates = [f for f in features if f.kind in kinds and f not in used]
+    if not candidates:
+        return None
+
+    nominal = _nominal(dim.label)
+    if nominal is not None:
+        if dim.kind.lower() == "radius":
+            nominal *= 2.0
+        tolerance = max(1e-3, 0.005 * nominal)
+        matches = [f for f in candidates if abs(f.value - nominal) <= tolerance]
+        if matches:
+            # Prefer circles for diameters, then the closest value, then
+            # overall extents over inner spans.
+            return min(
+                matches,
+                key=lambda f: (
+                    diameter and f.kind != "circle",
+                    round(abs(f.value - nominal), 6),
+                    not _is_extent(f, view),
+                    -(f.b - f.a),
+                ),
+            )
+
+    # No usable number in the label: fall back to the overall extents.
+    if diameter and view.circles:
+        return max(
+            (f for f in candidates if f.kind == "circle"),
+            key=lambda f: f.value,
+            default=None,
+        )
+    return next((f for f in candidates if _is_extent(f, view)), None)
+
+
+# ----- SVG output --------------------------------------------------------------------
+
+
+def _sub(parent: ET.Element, tag: str, **attrs: object) -> ET.Element:
+    return ET.SubElement(
+        parent,
+        f"{{{SVG_NS}}}{tag}",
+        {k.rstrip("_").replace("_", "-"): str(v) for k, v in attrs.items()},
+    )
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.3f}".rstrip("0").rstrip(".")
+
+
+class _Placement:
+    """Maps view coordinates to page millimetres for one view."""
+
+    def __init__(self, view: ProjectedView, centre: Tuple[float, float], k: float):
+        xmin, ymin, xmax, ymax = view.bounds
+        self.mx, self.my = (xmin + xmax) / 2.0, (ymin + ymax) / 2.0
+        self.cx, self.cy = centre
+        self.k = k
+
+    def point(self, x: float, y: float) -> Tuple[float, float]:
+        return self.cx + (x - self.mx) * self.k, self.cy - (y - self.my) * self.k
+
+    def path(self, polylines: Sequence[Sequence[Tuple[float, float]]], close: bool) -> str:
+        parts: List[str] = []
+        for line in polylines:
+            if len(line) < 2:
+                continue
+            points = [self.point(x, y) for x, y in line]
+            parts.append(
+                "M" + " L".join(f"{_fmt(px)},{_fmt(py)}" for px, py in points)
+                + (" Z" if close else "")
+            )
+        return " ".join(parts)
+
+
+def _defs(root: ET.Element) -> None:
+    defs = _sub(root, "defs")
+    style = _sub(defs, "style")
+    style.text = _STYLE
+    hatch = _sub(
+        defs,
+        "pattern",
+        id="hatch",
+        patternUnits="userSpaceOnUse",
+        width=2,
+        height=2,
+        patternTransform="rotate(45)",
+    )
+    _sub(hatch, "line", x1=0, y1=0, x2=0, y2=2, stroke="#000", stroke_width=0.13)
+    arrow = _sub(
+        defs,
+        "marker",
+        id="arrow",
+        viewBox="0 0 10 10",
+        refX=10,
+        refY=5,
+        markerWidth=3,
+        markerHeight=3,
+        markerUnits="userSpaceOnUse",
+        orient="auto-start-reverse",
+    )
+    _sub(arrow, "path", d="M0,2 L10,5 L0,8 Z", fill="#000")
+
+
+def _text(group: ET.Element, x: float, y: float, label: str, rotate: bool = False) -> None:
+    attrs = {"x": _fmt(x), "y": _fmt(y), "class_": "dimtext", "text_anchor": "middle"}
+    if rotate:
+        attrs["transform"] = f"rotate(-90 {_fmt(x)} {_fmt(y)})"
+    _sub(group, "text", **attrs).text = label
+
+
+def _draw_dimension(
+    group: ET.Element,
+    feature: _Feature,
+    label: str,
+    place: _Placement,
+    view: ProjectedView,
+    slot: int,
+) -> None:
+    xmin, ymin, xmax, ymax = view.bounds
+    offset = DIM_OFFSET_MM + slot * DIM_SPACING_MM
+
+    if feature.circle is not None:
+        cx, cy, r = feature.circle
+        px, py = place.point(cx, cy)
+        pr = r * place.k
+        edge = (px + pr * math.cos(math.pi / 4), py - pr * math.sin(math.pi / 4))
+        far = (px - pr * math.cos(math.pi / 4), py + pr * math.sin(math.pi / 4))
+        knee = (edge[0] + DIM_OFFSET_MM, edge[1] - DIM_OFFSET_MM - slot * DIM_SPACING_MM)
+        _sub(
+            group,
+            "path",
+            class_="dim",
+            d=f"M{_fmt(far[0])},{_fmt(far[1])} L{_fmt(edge[0])},{_fmt(edge[1])} "
+            f"L{_fmt(knee[0])},{_fmt(knee[1])} h{_fmt(len(label) * 2.0)}",
+            marker_start="url(#arrow)",
+        )
+        _text(group, knee[0] + len(label), knee[1] - 1.0, label)
+        return
+
+    if feature.kind == "h":
+        (x0, y_edge), (x1, _) = place.point(feature.a, ymin), place.point(feature.b, ymin)
+        y = y_edge + offset
+        _sub(
+            group,
+            "path",
+            class_="dim",
+            d=f"M{_fmt(x0)},{_fmt(y_edge + 1)} V{_fmt(y + 1.5)} "
+            f"M{_fmt(x1)},{_fmt(y_edge + 1)} V{_fmt(y + 1.5)}",
+        )
+        _sub(
+            group,
+            "line",
+            class_="dim",
+            x1=_fmt(x0),
+            y1=_fmt(y),
+            x2=_fmt(x1),
+            y2=_fmt(y),
+            marker_start="url(#arrow)",
+            marker_end="url(#arrow)",
+        )
+        _text(group, (x0 + x1) / 2.0, y - 1.0, label)
+    else:
+        (x_edge, y0), (_, y1) = place.point(xmax, feature.a), place.point(xmax, feature.b)
+        x = x_edge + offset
+        _sub(
+            group,
+            "path",
+            class_="dim",
+            d=f"M{_fmt(x_edge + 1)},{_fmt(y0)} H{_fmt(x + 1.5)} "
+            f"M{_fmt(x_edge + 1)},{_fmt(y1)} H{_fmt(x + 1.5)}",
+        )
+        _sub(
+            group,
+            "line",
+            class_="dim",
+            x1=_fmt(x),
+            y1=_fmt(y0),
+            x2=_fmt(x),
+            y2=_fmt(y1),
+            marker_start="url(#arrow)",
+            marker_end="url(#arrow)",
+        )
+        _text(group, x - 1.0, (y0 + y1) / 2.0, label, rotate=True)
+
+
+def _layout(
+    projections: Sequence[ViewProjection],
+    auto_scaled: Sequence[bool],
+    page: Tuple[float, float],
+) -> List[_Placement]:
+    """Place views on a row-major grid over the free area of the page."""
+
+    width, height = page
+    area_w = width - 2 * PAGE_MARGIN_MM
+    area_h = height - 2 * PAGE_MARGIN_MM - TITLE_BLOCK_MM
+    count = max(len(projections), 1)
+    cols = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / cols)
+    cell_w, cell_h = area_w / cols, area_h / rows
+
+    # Views without an explicit scale share one scale that fits them all.
+    fit = math.inf
+    for projection, auto in zip(projections, auto_scaled):
+        if not auto:
+            continue
+        xmin, ymin, xmax, ymax = projection.projection.bounds
+        if xmax > xmin:
+            fit = min(fit, VIEW_FILL * cell_w / (xmax - xmin))
+        if ymax > ymin:
+            fit = min(fit, VIEW_FILL * cell_h / (ymax - ymin))
+    if not math.isfinite(fit):
+        fit = 1.0
+
+    placements: List[_Placement] = []
+    for index, (projection, auto) in enumerate(zip(projections, auto_scaled)):
+        row, col = divmod(index, cols)
+        centre = (
+            PAGE_MARGIN_MM + (col + 0.5) * cell_w,
+            PAGE_MARGIN_MM + (row + 0.5) * cell_h,
+        )
+        placements.append(_Placement(projection.projection, centre, fit if auto else 1.0))
+    return placements
+
+
+def _svg_to_pdf(svg_path: Path, pdf_path: Path) -> None:
+    try:
+        import cairosvg  # type: ignore[import]
+    except (ImportError, OSError) as exc:  # OSError: cairo library missing
+        raise RuntimeError(
+            "PDF output from the SVG backend needs the optional 'cairosvg' "
+            "package and the cairo library; request only an SVG or install them."
+        ) from exc
+    cairosvg.svg2pdf(url=str(svg_path), write_to=str(pdf_path))
+
+
+def generate_svg_drawing(
+    solid: cq.Workplane,
+    spec: DrawingSpec,
+    output_svg: Optional[str] = None,
+    output_pdf: Optional[str] = None,
+    projections: Optional[ProjectionCache] = None,
+    shape_key: Optional[str] = None,
+    show_hidden: bool = False,
+) -> List[ViewProjection]:
+    """Render a drawing page as SVG (and optionally PDF) without FreeCAD.
+
+    Parameters
+    ----------
+    solid:
+        CadQuery workplane whose current object is the solid body.
+    spec:
+        Drawing specification, as for ``generate_drawing``.
+    output_svg / output_pdf:
+        Target paths; at least one is required. PDF conversion needs
+        ``cairosvg``; when only a PDF is requested the SVG is written
+        next to it with the same stem.
+    projections / shape_key:
+        Optional projection cache and content key of ``solid``, passed
+        to :func:`~scanmaster_drawing_engine.projection.project_views`.
+    show_hidden:
+        Also draw hidden edges (dashed). Off by default, like TechDraw.
+
+    Returns the per-view projections, e.g. for reporting cache use.
+    """
+
+    if output_svg is None and output_pdf is None:
+        raise ValueError("generate_svg_drawing needs output_svg and/or output_pdf")
+
+    with stage("svg.template"):
+        tree, page_w, page_h, units_per_mm = _load_template(
+            spec.template_path, spec.page_title
+        )
+
+    with stage("svg.project", views=len(spec.views)):
+        views = project_views(solid, spec.views, cache=projections, shape_key=shape_key)
+
+    with stage("svg.layout"):
+        root = tree.getroot()
+        _defs(root)
+        drawing = _sub(root, "g", id="scanmaster-views")
+        if units_per_mm != 1.0:
+            drawing.set("transform", f"scale({_fmt(units_per_mm)})")
+
+        placements = _layout(
+            views, [v.scale is None for v in spec.views], (page_w, page_h)
+        )
+        by_id: Dict[str, Tuple[ProjectedView, _Placement]] = {}
+        for vspec, projection, place in zip(spec.views, views, placements):
+            view = projection.projection
+            by_id[vspec.id] = (view, place)
+            group = _sub(drawing, "g", id=f"view-{vspec.id}")
+            if view.section:
+                _sub(group, "path", class_="section", d=place.path(view.section, True))
+            if show_hidden and view.hidden:
+                _sub(group, "path", class_="hidden", d=place.path(view.hidden, False))
+            _sub(group, "path", class_="visible", d=place.path(view.visible, False))
+
+        features: Dict[str, List[_Feature]] = {}
+        used: Dict[str, List[_Feature]] = {}
+        slots: Dict[Tuple[str, str], int] = {}
+        for dspec in spec.dimensions:
+            if dspec.view_id not in by_id:
+                raise KeyError(
+                    f"DimensionSpec refers to unknown view_id '{dspec.view_id}'"
+                )
+            view, place = by_id[dspec.view_id]
+            if dspec.view_id not in features:
+                features[dspec.view_id] = _view_features(view)
+            view_used = used.setdefault(dspec.view_id, [])
+            feature = _pick_feature(dspec, view, features[dspec.view_id], view_used)
+            if feature is None:
+                continue
+            view_used.append(feature)
+            slot_key = (dspec.view_id, feature.kind)
+            slot = slots.get(slot_key, 0)
+            slots[slot_key] = slot + 1
+            group = _sub(drawing, "g", class_="dimension")
+            _draw_dimension(group, feature, dspec.label, place, view, slot)
+
+    svg_path = Path(output_svg) if output_svg else Path(output_pdf).with_suffix(".svg")  # type: ignore[arg-type]
+    svg_path.parent.mkdir(parents=True, exist_ok=True)
+    with stage("svg.write"):
+        tree.write(str(svg_path), encoding="utf-8", xml_declaration=True)
+
+    if output_pdf is not None:
+        pdf_path = Path(output_pdf)
+        pdf_path.parent.mkdir(parents=True, exist_ok=True)
+        with stage("svg.export_pdf"):
+            _svg_to_pdf(svg_path, pdf_path)
+
+    return views
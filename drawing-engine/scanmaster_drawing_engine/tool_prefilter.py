@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+"""Bounding-box pre-pass over subtractive tools before the boolean cut.
+
+Every tool handed to OCCT costs boolean work, even when it cannot change
+the result. Before cutting, :class:`GeometryEngine` describes each tool
+by a :class:`ToolPlacement` (what to build and where, plus its
+axis-aligned bounds) and :func:`prefilter_tools` removes the ones that
+are redundant:
+
+* tools whose bounds do not overlap the base solid's bounds (they miss
+  the body entirely),
+* exact and near duplicates: tools of the same kind whose bounds agree
+  within ``tolerance`` (found through a grid hash of their corners),
+* abutting or overlapping axis-aligned boxes with the same cross
+  section, which are merged into one box.
+
+Only tools that provably do not change the result are dropped, so a
+spec cuts the same solid with or without the pre-pass (up to
+``tolerance`` for near duplicates). Nothing here imports CadQuery.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from .geometry_engine import _SLOTS
+
+DEFAULT_TOLERANCE = 1e-6
+
+_AXES = ("x", "y", "z")
+
+Vector = Tuple[float, float, float]
+
+
+@dataclass(**_SLOTS)
+class ToolPlacement:
+    """One subtractive tool: a prototype shape moved by ``offset``.
+
+    Parameters
+    ----------
+    kind:
+        ``"box"`` for axis-aligned boxes (their bounds *are* the tool, so
+        they may be merged) or ``"cylinder_<axis>"`` for holes.
+    prototype:
+        Hashable description of the tool at the origin; placements with
+        the same prototype share one OCCT shape.
+    offset:
+        Translation applied to the prototype.
+    lower, upper:
+        Axis-aligned bounds of the placed tool.
+    """
+
+    kind: str
+    prototype: Tuple[object, ...]
+    offset: Vector
+    lower: Vector
+    upper: Vector
+
+
+@dataclass
+class ToolPrefilterReport:
+    """What :func:`prefilter_tools` removed; every removed tool is one
+    boolean (or boolean argument) OCCT does not have to process."""
+
+    tools_in: int = 0
+    outside: int = 0
+    duplicates: int = 0
+    merged: int = 0
+
+    @property
+    def tools_out(self) -> int:
+        return self.tools_in - self.booleans_avoided
+
+    @property
+    def booleans_avoided(self) -> int:
+        return self.outside + self.duplicates + self.merged
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "tools_in": self.tools_in,
+            "tools_out": self.tools_out,
+            "outside": self.outside,
+            "duplicates": self.duplicates,
+            "merged": self.merged,
+            "booleans_avoided": self.booleans_avoided,
+        }
+
+
+@dataclass
+class _Cells:
+    """Uniform grid hash of tool corners, for near-duplicate lookups.
+
+    Cells are ``2 * tolerance`` wide, so every point within
+    ``tolerance`` of a query lies in one of at most two cells per axis.
+    """
+
+    tolerance: float
+    cells: Dict[Tuple[object, ...], List[int]] = field(default_factory=dict)
+
+    def _span(self, value: float) -> Sequence[int]:
+        size = 2 * self.tolerance
+        low = math.floor((value - self.tolerance) / size)
+        high = math.floor((value + self.tolerance) / size)
+        return (low,) if low == high else (low, high)
+
+    def near(self, kind: str, point: Vector) -> Iterator[int]:
+        x, y, z = (self._span(v) for v in point)
+        for i in x:
+            for j in y:
+                for k in z:
+                    yield from self.cells.get((kind, i, j, k), ())
+
+    def add(self, kind: str, point: Vector, index: int) -> None:
+        size = 2 * self.tolerance
+        cell = (kind, *(math.floor(v / size) for v in point))
+        self.cells.setdefault(cell, []).append(index)
+
+
+def _overlaps(tool: ToolPlacement, lower: Vector, upper: Vector, tol: float) -> bool:
+    return all(
+        tool.lower[a] < upper[a] - tol and tool.upper[a] > lower[a] + tol
+        for a in range(3)
+    )
+
+
+def _close(a: Vector, b: Vector, tol: float) -> bool:
+    return all(abs(u - v) <= tol for u, v in zip(a, b))
+
+
+def _placed(
+    kind: str,
+    prototype: Tuple[object, ...],
+    offset: Vector,
+    lower: Vector,
+    upper: Vector,
+) -> ToolPlacement:
+    return ToolPlacement(
+        kind=kind,
+        prototype=prototype,
+        offset=offset,
+        lower=tuple(o + v for o, v in zip(offset, lower)),  # type: ignore[arg-type]
+        upper=tuple(o + v for o, v in zip(offset, upper)),  # type: ignore[arg-type]
+    )
+
+
+def box_placement(
+    width: float, depth: float, height: float, center: Vector
+) -> ToolPlacement:
+    """Return the placement of an axis-aligned box centred on ``center``."""
+
+    half = (width / 2, depth / 2, height / 2)
+    return _placed(
+        "box",
+        ("box", width, depth, height),
+        center,
+        (-half[0], -half[1], -half[2]),
+        half,
+    )
+
+
+def hole_placement(
+    radius: float, depth: float, axis: str, offset: Vector
+) -> ToolPlacement:
+    """Return the placement of a through-hole cylinder moved by ``offset``.
+
+    The prototype is the one of ``GeometryEngine._through_hole_tool``: a
+    cylinder centred on the origin, ``4 * depth`` long along ``axis``.
+    """
+
+    half = [radius, radius, radius]
+    half[_AXES.index(axis)] = 2 * depth
+    return _placed(
+        f"cylinder_{axis}",
+        ("hole", radius, depth, axis),
+        offset,
+        (-half[0], -half[1], -half[2]),
+        (half[0], half[1], half[2]),
+    )
+
+
+def bore_placement(radius: float, length: float) -> ToolPlacement:
+    """Return the placement of a hole circle extruded from ``z = 0``."""
+
+    return _placed(
+        "cylinder_z",
+        ("bore", radius, length),
+        (0.0, 0.0, 0.0),
+        (-radius, -radius, 0.0),
+        (radius, radius, length),
+    )
+
+
+def _dedupe(
+    tools: List[ToolPlacement], tolerance: float
+) -> Tuple[List[ToolPlacement], int]:
+    cells = _Cells(tolerance)
+    kept: List[ToolPlacement] = []
+    for tool in tools:
+        if any(
+            _close(kept[i].lower, tool.lower, tolerance)
+            and _close(kept[i].upper, tool.upper, tolerance)
+            for i in cells.near(tool.kind, tool.lower)
+        ):
+            continue
+        cells.add(tool.kind, tool.lower, len(kept))
+        kept.append(tool)
+    return kept, len(tools) - len(kept)
+
+
+def _merge_boxes(
+    boxes: List[ToolPlacement], tolerance: float
+) -> Tuple[List[ToolPlacement], int]:
+    """Merge boxes that touch or overlap along one axis and share the
+    cross section on the other two; repeat until nothing merges."""
+
+    merged = 0
+    changed = True
+    while changed and len(boxes) > 1:
+        changed = False
+        for axis in range(3):
+            others = [a for a in range(3) if a != axis]
+            rows: Dict[Tuple[int, ...], List[ToolPlacement]] = {}
+            for box in boxes:
+                section = tuple(
+                    round(bound[a] / tolerance)
+                    for a in others
+                    for bound in (box.lower, box.upper)
+                )
+                rows.setdefault(section, []).append(box)
+
+            result: List[ToolPlacement] = []
+            for row in rows.values():
+                row.sort(key=lambda b: b.lower[axis])
+                run, end = [row[0]], row[0].upper[axis]
+                for box in row[1:]:
+                    if box.lower[axis] <= end + tolerance:
+                        run.append(box)
+                        end = max(end, box.upper[axis])
+                        continue
+                    result.append(_bounding_box(run))
+                    run, end = [box], box.upper[axis]
+                result.append(_bounding_box(run))
+            merged += len(boxes) - len(result)
+            changed = changed or len(result) < len(boxes)
+            boxes = result
+    return boxes, merged
+
+
+def _bounding_box(run: List[ToolPlacement]) -> ToolPlacement:
+    if len(run) == 1:
+        return run[0]
+    lower = [min(b.lower[a] for b in run) for a in range(3)]
+    upper = [max(b.upper[a] for b in run) for a in range(3)]
+    width, depth, height = (u - l for l, u in zip(lower, upper))
+    center = tuple((l + u) / 2 for l, u in zip(lower, upper))
+    return box_placement(width, depth, height, center)  # type: ignore[arg-type]
+
+
+def prefilter_tools(
+    tools: Sequence[ToolPlacement],
+    lower: Vector,
+    upper: Vector,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Tuple[List[ToolPlacement], ToolPrefilterReport]:
+    """Drop, deduplicate and merge ``tools`` against the base bounds.
+
+    Parameters
+    ----------
+    tools:
+        Placements of every subtractive tool, in spec order.
+    lower, upper:
+        Axis-aligned bounds of the solid the tools are cut from.
+    tolerance:
+        Distance below which bounds count as equal (duplicates, abutting
+        boxes) and overlaps as touching (tools grazing the base).
+
+    Returns
+    -------
+    (tools, report)
+        The placements still to cut (holes first, in spec order, then
+        the boxes) and a :class:`ToolPrefilterReport`.
+    """
+
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    report = ToolPrefilterReport(tools_in=len(tools))
+
+    inside = [tool for tool in tools if _overlaps(tool, lower, upper, tolerance)]
+    report.outside = len(tools) - len(inside)
+
+    kept, report.duplicates = _dedupe(inside, tolerance)
+
+    holes = [tool for tool in kept if tool.kind != "box"]
+    boxes, report.merged = _merge_boxes(
+        [tool for tool in kept if tool.kind == "box"], tolerance
+    )
+    return holes + boxes, report
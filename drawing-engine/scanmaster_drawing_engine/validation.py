@@ -0,0 +1,832 @@
+from __future__ import annotations
+
+"""Upfront validation of complete job JSON objects.
+
+:func:`validate_job` checks a job exactly as it arrives from the
+Node/TypeScript side – solid, drawing and output paths – before any
+spec object is built, let alone any CadQuery or FreeCAD work is done.
+It never raises on bad input; instead it collects *every* problem as a
+:class:`ValidationIssue` carrying a JSON path such as
+``$.solid.operations[3].radius``, so that callers can report them all
+at once.
+
+Besides structural checks (required keys, types, enums, positive
+sizes) it rejects geometry that is well-formed but degenerate, e.g. a
+bore at least as large as the outer diameter, or a cut that lies
+entirely outside the base solid. Only plain Python arithmetic is used:
+a typical job validates in well under a millisecond. ``ThroughHole``
+and ``CutBox`` tables in ``solid.columns`` are checked column-wise with
+NumPy instead, so ten thousand holes cost a few milliseconds.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .exporters import GEOMETRY_FORMATS
+from .geometry_engine import GeometryEngine
+from .spec_parsing import column_rows
+from .tool_prefilter import hole_placement
+
+
+@dataclass
+class ValidationIssue:
+    """One problem found in a job, located by a JSON path."""
+
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+class JobValidationError(ValueError):
+    """Raised for a job that failed :func:`validate_job`.
+
+    ``issues`` holds every problem found, not just the first one.
+    """
+
+    def __init__(self, issues: List[ValidationIssue]) -> None:
+        self.issues = list(issues)
+        summary = "; ".join(str(issue) for issue in self.issues)
+        super().__init__(f"Invalid job ({len(self.issues)} issue(s)): {summary}")
+
+
+_AXES = ("x", "y", "z")
+_LAYOUTS = ("linear", "grid", "polar")
+_BACKENDS = ("techdraw", "svg")
+
+# Upper bound on the tool bodies one solid may cut (CutBox, ThroughHole
+# and every hole of every HoleArray). Centre arrays and tool lists grow
+# with it in the worker, so larger client input is rejected here.
+_MAX_TOOLS = 100_000
+
+# Bounding boxes are ((xmin, ymin, zmin), (xmax, ymax, zmax)).
+_Box = Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+
+
+class _Checker:
+    """Collects issues while walking one job."""
+
+    def __init__(self) -> None:
+        self.issues: List[ValidationIssue] = []
+
+    def fail(self, path: str, message: str) -> None:
+        self.issues.append(ValidationIssue(path, message))
+
+    # -- typed field access ----------------------------------------------------
+    #
+    # Each helper returns the value when it is valid and ``None`` (after
+    # recording an issue) otherwise, so callers can keep going.
+
+    def obj(self, data: Any, path: str) -> Optional[Dict[str, Any]]:
+        if not isinstance(data, dict):
+            self.fail(path, "must be an object")
+            return None
+        return data
+
+    def number(
+        self,
+        data: Dict[str, Any],
+        key: str,
+        path: str,
+        *,
+        required: bool = True,
+        default: Optional[float] = None,
+        positive: bool = False,
+    ) -> Optional[float]:
+        field_path = f"{path}.{key}"
+        if key not in data or data[key] is None:
+            if required:
+                self.fail(field_path, "is required")
+            return default
+        value = data[key]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            self.fail(field_path, "must be a number")
+            return None
+        if not math.isfinite(value):
+            self.fail(field_path, "must be finite")
+            return None
+        if positive and value <= 0:
+            self.fail(field_path, "must be positive")
+            return None
+        return float(value)
+
+    def integer(
+        self,
+        data: Dict[str, Any],
+        key: str,
+        path: str,
+        *,
+        default: Optional[int] = None,
+    ) -> Optional[int]:
+        field_path = f"{path}.{key}"
+        if key not in data:
+            if default is None:
+                self.fail(field_path, "is required")
+            return default
+        value = data[key]
+        if isinstance(value, bool) or not isinstance(value, int):
+            self.fail(field_path, "must be an integer")
+            return None
+        if value < 1:
+            self.fail(field_path, "must be at least 1")
+            return None
+        return value
+
+    def vector(
+        self,
+        data: Dict[str, Any],
+        key: str,
+        path: str,
+        *,
+        default: Optional[Tuple[float, float, float]] = None,
+        nonzero: bool = False,
+    ) -> Optional[Tuple[float, float, float]]:
+        field_path = f"{path}.{key}"
+        if key not in data or data[key] is None:
+            if default is None:
+                self.fail(field_path, "is required")
+            return default
+        value = data[key]
+        if (
+            not isinstance(value, (list, tuple))
+            or len(value) != 3
+            or any(
+                isinstance(v, bool)
+                or not isinstance(v, (int, float))
+                or not math.isfinite(v)
+                for v in value
+            )
+        ):
+            self.fail(field_path, "must be a list of 3 finite numbers")
+            return None
+        if nonzero and not any(value):
+            self.fail(field_path, "must not be the zero vector")
+            return None
+        return (float(value[0]), float(value[1]), float(value[2]))
+
+    def choice(
+        self,
+        data: Dict[str, Any],
+        key: str,
+        path: str,
+        choices: Sequence[str],
+        default: str,
+    ) -> Optional[str]:
+        value = data.get(key, default)
+        if value not in choices:
+            allowed = ", ".join(map(repr, choices))
+            self.fail(f"{path}.{key}", f"must be one of {allowed}")
+            return None
+        return value
+
+    def string(
+        self, data: Dict[str, Any], key: str, path: str, *, required: bool = True
+    ) -> Optional[str]:
+        field_path = f"{path}.{key}"
+        if key not in data or data[key] is None:
+            if required:
+                self.fail(field_path, "is required")
+            return None
+        value = data[key]
+        if not isinstance(value, str) or not value.strip():
+            self.fail(field_path, "must be a non-empty string")
+            return None
+        return value
+
+
+# ----- Solid -----------------------------------------------------------------------
+
+
+def _box_bounds(center: Sequence[float], size: Sequence[float]) -> _Box:
+    lo = tuple(c - s / 2.0 for c, s in zip(center, size))
+    hi = tuple(c + s / 2.0 for c, s in zip(center, size))
+    return lo, hi  # type: ignore[return-value]
+
+
+def _cylinder_bounds(
+    center: Sequence[float], radius: float, depth: float, axis: str
+) -> _Box:
+    # The bounds of the tool GeometryEngine cuts for a ThroughHole (or
+    # HoleArray row) at ``center``: its 4 * depth long prototype moved
+    # by _through_hole_offset, which ignores the coordinate along the
+    # axis and swaps y/z for "x" holes.
+    offset = GeometryEngine._through_hole_offset(axis, center)
+    placement = hole_placement(radius, depth, axis, offset)
+    return placement.lower, placement.upper
+
+
+def _union_bounds(a: _Box, b: _Box) -> _Box:
+    return (
+        tuple(min(x, y) for x, y in zip(a[0], b[0])),  # type: ignore[return-value]
+        tuple(max(x, y) for x, y in zip(a[1], b[1])),
+    )
+
+
+def _overlaps(a: _Box, b: _Box) -> bool:
+    """True if the boxes share a volume (touching faces do not count)."""
+
+    return all(a[0][i] < b[1][i] and b[0][i] < a[1][i] for i in range(3))
+
+
+def _hole_array_bounds(
+    op: Dict[str, Any],
+    origin: Tuple[float, float, float],
+    radius: float,
+    depth: float,
+    axis: str,
+    layout: str,
+    count: int,
+    rows: int,
+) -> _Box:
+    """Bounds of all holes of a ``HoleArray`` without enumerating them."""
+
+    if layout == "polar":
+        r = float(op.get("pattern_radius", 0.0))
+        reach = [abs(r)] * 3
+        reach[_AXES.index(axis)] = 0.0
+        corners = [
+            tuple(o - d for o, d in zip(origin, reach)),
+            tuple(o + d for o, d in zip(origin, reach)),
+        ]
+    else:
+        pitch = op.get("pitch", [0.0, 0.0, 0.0])
+        last_col = [(count - 1) * float(p) for p in pitch]
+        last_row = [0.0, 0.0, 0.0]
+        if layout == "grid":
+            row_pitch = op.get("row_pitch", [0.0, 0.0, 0.0])
+            last_row = [(rows - 1) * float(p) for p in row_pitch]
+        corners = [
+            tuple(o + c * a + r * b for o, a, b in zip(origin, last_col, last_row))
+            for c in (0, 1)
+            for r in (0, 1)
+        ]
+
+    bounds = _cylinder_bounds(corners[0], radius, depth, axis)
+    for corner in corners[1:]:
+        bounds = _union_bounds(bounds, _cylinder_bounds(corner, radius, depth, axis))
+    return bounds
+
+
+def _validate_solid(check: _Checker, solid: Any, path: str) -> None:
+    solid = check.obj(solid, path)
+    if solid is None:
+        return
+
+    if "id" not in solid or solid["id"] is None:
+        check.fail(f"{path}.id", "is required")
+
+    operations = solid.get("operations")
+    if not isinstance(operations, list) or not operations:
+        check.fail(f"{path}.operations", "must be a non-empty list")
+        return
+
+    entries = [(f"{path}.operations[{i}]", op) for i, op in enumerate(operations)]
+    # (path, rows, bounds) of the column tables checked as a whole.
+    tables: List[Tuple[str, int, Any]] = []
+    if solid.get("columns") is not None:
+        entries += _validate_columns(check, solid["columns"], f"{path}.columns", tables)
+
+    outer_radii: List[Tuple[str, float]] = []
+    hole_radii: List[Tuple[str, float]] = []
+    extrude_length: Optional[float] = None
+    extrude_path: Optional[str] = None
+    base_box: Optional[_Box] = None
+    base_box_path: Optional[str] = None
+    # (path, bounds) of every subtractive 3D modifier, checked against
+    # the base solid once it is known.
+    modifiers: List[Tuple[str, Optional[_Box]]] = []
+    # Tool bodies beyond one per modifier (the extra holes of arrays).
+    tools = 0
+
+    for op_path, op in entries:
+        op = check.obj(op, op_path)
+        if op is None:
+            continue
+        op_type = op.get("type")
+
+        if op_type == "SketchCircle":
+            radius = check.number(op, "radius", op_path, positive=True)
+            if radius is not None:
+                target = hole_radii if op.get("is_hole", False) else outer_radii
+                target.append((op_path, radius))
+        elif op_type == "Extrude":
+            length = check.number(op, "length", op_path, positive=True)
+            if extrude_path is not None:
+                check.fail(op_path, f"duplicate Extrude (first at {extrude_path})")
+            else:
+                extrude_path, extrude_length = op_path, length
+        elif op_type == "BaseBox":
+            sizes = [
+                check.number(op, k, op_path, positive=True)
+                for k in ("width", "depth", "height")
+            ]
+            if base_box_path is not None:
+                check.fail(op_path, f"duplicate BaseBox (first at {base_box_path})")
+                continue
+            base_box_path = op_path
+            if None not in sizes:
+                w, d, h = sizes  # type: ignore[misc]
+                lo_xy = -0.5 if op.get("centered_xy", True) else 0.0
+                lo_z = -0.5 if op.get("centered_z", False) else 0.0
+                base_box = (
+                    (lo_xy * w, lo_xy * d, lo_z * h),
+                    ((lo_xy + 1) * w, (lo_xy + 1) * d, (lo_z + 1) * h),
+                )
+        elif op_type == "CutBox":
+            sizes = [
+                check.number(op, k, op_path, positive=True)
+                for k in ("width", "depth", "height")
+            ]
+            center = check.vector(op, "center", op_path)
+            bounds = None
+            if None not in sizes and center is not None:
+                bounds = _box_bounds(center, sizes)  # type: ignore[arg-type]
+            modifiers.append((op_path, bounds))
+        elif op_type == "ThroughHole":
+            radius = check.number(op, "radius", op_path, positive=True)
+            depth = check.number(op, "depth", op_path, positive=True)
+            axis = check.choice(op, "axis", op_path, _AXES, "z")
+            center = check.vector(op, "center", op_path, default=(0.0, 0.0, 0.0))
+            bounds = None
+            if None not in (radius, depth, axis, center):
+                bounds = _cylinder_bounds(
+                    center, radius, depth, axis  # type: ignore[arg-type]
+                )
+            modifiers.append((op_path, bounds))
+        elif op_type == "HoleArray":
+            radius = check.number(op, "radius", op_path, positive=True)
+            depth = check.number(op, "depth", op_path, positive=True)
+            count = check.integer(op, "count", op_path)
+            rows = check.integer(op, "rows", op_path, default=1)
+            axis = check.choice(op, "axis", op_path, _AXES, "z")
+            layout = check.choice(op, "layout", op_path, _LAYOUTS, "linear")
+            origin = check.vector(op, "origin", op_path, default=(0.0, 0.0, 0.0))
+            vectors_ok = all(
+                check.vector(op, key, op_path, default=(0.0, 0.0, 0.0)) is not None
+                for key in ("pitch", "row_pitch")
+            )
+            angles_ok = all(
+                check.number(op, key, op_path, required=False, default=0.0) is not None
+                for key in ("pattern_radius", "start_angle", "sweep_angle")
+            )
+            holes = None
+            if count is not None and rows is not None:
+                holes = count * rows if layout == "grid" else count
+                if holes > _MAX_TOOLS:
+                    check.fail(
+                        f"{op_path}.count",
+                        f"pattern of {holes} holes exceeds the limit of {_MAX_TOOLS}",
+                    )
+                    holes = None
+            bounds = None
+            if (
+                None not in (radius, depth, holes, axis, layout, origin)
+                and vectors_ok
+                and angles_ok
+            ):
+                bounds = _hole_array_bounds(
+                    op, origin, radius, depth, axis, layout, count, rows  # type: ignore
+                )
+            modifiers.append((op_path, bounds))
+            tools += (holes or 1) - 1
+        else:
+            check.fail(f"{op_path}.type", f"unsupported operation type {op_type!r}")
+
+    tools += len(modifiers) + sum(rows for _, rows, _ in tables)
+    if tools > _MAX_TOOLS:
+        check.fail(
+            f"{path}.operations",
+            f"{tools} modifier tools exceed the limit of {_MAX_TOOLS}",
+        )
+
+    # -- base solid ------------------------------------------------------------
+
+    base: Optional[_Box] = None
+    if base_box_path is not None:
+        if extrude_path is not None or outer_radii or hole_radii:
+            check.fail(
+                f"{path}.operations",
+                "mixes BaseBox with sketch/extrude operations; choose one style",
+            )
+        base = base_box
+    elif extrude_path is None:
+        check.fail(
+            f"{path}.operations",
+            "must define either a BaseBox or an Extrude with sketch circles",
+        )
+    elif not outer_radii:
+        check.fail(extrude_path, "no non-hole SketchCircle to extrude")
+    else:
+        outer = max(r for _, r in outer_radii)
+        for hole_path, hole_radius in hole_radii:
+            if hole_radius >= outer:
+                check.fail(
+                    f"{hole_path}.radius",
+                    f"hole radius {hole_radius:g} must be smaller than the "
+                    f"outer radius {outer:g}",
+                )
+        if extrude_length is not None:
+            base = ((-outer, -outer, 0.0), (outer, outer, extrude_length))
+
+    # -- degenerate modifiers ----------------------------------------------------
+
+    if base is not None:
+        for mod_path, bounds in modifiers:
+            if bounds is not None and not _overlaps(bounds, base):
+                check.fail(mod_path, "lies entirely outside the base solid")
+        for table_path, _, bounds in tables:
+            if bounds is not None:
+                _check_table_overlap(check, table_path, bounds, base)
+
+
+# ----- Columnar operations ---------------------------------------------------------
+#
+# Row paths such as ``$.solid.columns.ThroughHole[3].radius`` name row 3
+# of that table. A field may be a list (one entry per row, ``None`` for
+# rows that do not set it) or a scalar shared by all rows.
+
+
+def _validate_columns(
+    check: _Checker, columns: Any, path: str, tables: List[Tuple[str, int, Any]]
+) -> List[Tuple[str, Any]]:
+    """Check ``solid.columns`` without expanding the big tables.
+
+    ``ThroughHole`` and ``CutBox`` tables are checked column-wise and
+    added to ``tables`` as ``(path, rows, bounds)``, where ``bounds`` are
+    the per-row tool bounds (or ``None`` if a column is invalid). Rows of
+    other tables are returned as ``(path, operation)`` pairs for the
+    per-operation checks.
+    """
+
+    columns = check.obj(columns, path)
+    if columns is None:
+        return []
+
+    entries: List[Tuple[str, Any]] = []
+    for op_type, table in columns.items():
+        table_path = f"{path}.{op_type}"
+        table = check.obj(table, table_path)
+        if table is None:
+            continue
+        count = _column_count(check, table, table_path)
+        if count is None:
+            continue
+        if op_type == "ThroughHole":
+            bounds = _hole_table_bounds(check, table, count, table_path)
+            tables.append((table_path, count, bounds))
+        elif op_type == "CutBox":
+            bounds = _box_table_bounds(check, table, count, table_path)
+            tables.append((table_path, count, bounds))
+        else:
+            rows = column_rows(op_type, table, count)
+            entries += ((f"{table_path}[{i}]", op) for i, op in enumerate(rows))
+    return entries
+
+
+def _column_count(check: _Checker, table: Dict[str, Any], path: str) -> Optional[int]:
+    lengths = {len(v) for v in table.values() if isinstance(v, list)}
+    if not lengths:
+        check.fail(path, "needs at least one list-valued field")
+        return None
+    if len(lengths) > 1:
+        check.fail(path, f"list fields must have equal lengths (got {sorted(lengths)})")
+        return None
+    return lengths.pop()
+
+
+def _fail_rows(
+    check: _Checker, path: str, key: str, value: Any, rows: Sequence[int], message: str
+) -> None:
+    """Report the first of ``rows`` (all of them for a scalar ``value``)."""
+
+    if not isinstance(value, list):
+        check.fail(f"{path}.{key}", message)
+        return
+    if len(rows) > 1:
+        message += f" (and {len(rows) - 1} more rows)"
+    check.fail(f"{path}[{rows[0]}].{key}", message)
+
+
+def _as_array(value: Any) -> Any:
+    import numpy as np
+
+    try:
+        return np.asarray(value)
+    except (TypeError, ValueError, OverflowError):
+        # Ragged nesting or values NumPy cannot hold.
+        return None
+
+
+def _positive_column(
+    check: _Checker, table: Dict[str, Any], key: str, count: int, path: str
+) -> Any:
+    import numpy as np
+
+    if key not in table:
+        check.fail(f"{path}.{key}", "is required")
+        return None
+    value = table[key]
+    values = _as_array(value)
+    if (
+        values is None
+        or values.dtype.kind not in "iuf"
+        or values.ndim != (1 if isinstance(value, list) else 0)
+    ):
+        check.fail(f"{path}.{key}", "must be a number or a list of numbers")
+        return None
+    values = np.broadcast_to(values.astype(float), (count,))
+    bad = np.flatnonzero(~(np.isfinite(values) & (values > 0)))
+    if bad.size:
+        _fail_rows(check, path, key, value, bad, "must be positive and finite")
+        return None
+    return values
+
+
+def _center_column(
+    check: _Checker, table: Dict[str, Any], count: int, path: str, required: bool
+) -> Any:
+    import numpy as np
+
+    value = table.get("center")
+    if value is None:
+        if required:
+            check.fail(f"{path}.center", "is required")
+            return None
+        return np.zeros((count, 3))
+    if not isinstance(value, list):
+        check.fail(f"{path}.center", "must be a list of [x, y, z] vectors")
+        return None
+    if None in value:
+        missing = [i for i, v in enumerate(value) if v is None]
+        if required:
+            _fail_rows(check, path, "center", value, missing, "is required")
+            return None
+        value = [(0.0, 0.0, 0.0) if v is None else v for v in value]
+    values = _as_array(value)
+    if values is None or values.dtype.kind not in "iuf" or values.shape != (count, 3):
+        check.fail(f"{path}.center", "must be a list of [x, y, z] vectors")
+        return None
+    values = values.astype(float)
+    bad = np.flatnonzero(~np.isfinite(values).all(axis=1))
+    if bad.size:
+        _fail_rows(check, path, "center", value, bad, "must be finite")
+        return None
+    return values
+
+
+def _axis_column(check: _Checker, table: Dict[str, Any], count: int, path: str) -> Any:
+    import numpy as np
+
+    value = table.get("axis")
+    if value is None:
+        value = "z"
+    elif isinstance(value, list) and None in value:
+        value = ["z" if v is None else v for v in value]
+    values = _as_array(value)
+    if values is None or values.ndim != (1 if isinstance(value, list) else 0):
+        check.fail(f"{path}.axis", "must be an axis or a list of axes")
+        return None
+    values = np.broadcast_to(values, (count,))
+    bad = np.flatnonzero(~np.isin(values, _AXES))
+    if bad.size:
+        allowed = ", ".join(map(repr, _AXES))
+        _fail_rows(check, path, "axis", value, bad, f"must be one of {allowed}")
+        return None
+    return values
+
+
+def _hole_table_bounds(
+    check: _Checker, table: Dict[str, Any], count: int, path: str
+) -> Any:
+    """Check a ``ThroughHole`` table; return per-row ``(lower, upper)`` bounds.
+
+    Row-wise :func:`_cylinder_bounds`.
+    """
+
+    import numpy as np
+
+    radius = _positive_column(check, table, "radius", count, path)
+    depth = _positive_column(check, table, "depth", count, path)
+    center = _center_column(check, table, count, path, required=False)
+    axes = _axis_column(check, table, count, path)
+    if radius is None or depth is None or center is None or axes is None:
+        return None
+
+    x, y, z = (axes == axis for axis in _AXES)
+    # GeometryEngine._through_hole_offset: the coordinate along the axis
+    # is ignored and "x" holes swap y/z.
+    offset = np.column_stack(
+        (
+            np.where(x, 0.0, center[:, 0]),
+            np.where(x, center[:, 2], np.where(y, 0.0, center[:, 1])),
+            np.where(z, 0.0, np.where(x, center[:, 1], center[:, 2])),
+        )
+    )
+    # hole_placement: radius across the axis, 2 * depth along it.
+    half = np.repeat(radius[:, None], 3, axis=1)
+    half[np.arange(count), np.select([x, y], [0, 1], 2)] = 2 * depth
+    return offset - half, offset + half
+
+
+def _box_table_bounds(
+    check: _Checker, table: Dict[str, Any], count: int, path: str
+) -> Any:
+    """Check a ``CutBox`` table; return per-row ``(lower, upper)`` bounds."""
+
+    import numpy as np
+
+    sizes = [
+        _positive_column(check, table, key, count, path)
+        for key in ("width", "depth", "height")
+    ]
+    center = _center_column(check, table, count, path, required=True)
+    if any(size is None for size in sizes) or center is None:
+        return None
+    half = np.column_stack(sizes) / 2.0
+    return center - half, center + half
+
+
+def _check_table_overlap(
+    check: _Checker, path: str, bounds: Any, base: _Box
+) -> None:
+    import numpy as np
+
+    lower, upper = bounds
+    overlaps = (lower < np.asarray(base[1])) & (np.asarray(base[0]) < upper)
+    outside = np.flatnonzero(~overlaps.all(axis=1))
+    if outside.size:
+        message = "lies entirely outside the base solid"
+        if outside.size > 1:
+            message += f" (and {outside.size - 1} more rows)"
+        check.fail(f"{path}[{outside[0]}]", message)
+
+
+# ----- Drawing ---------------------------------------------------------------------
+
+
+def _validate_drawing(check: _Checker, drawing: Any, path: str) -> None:
+    drawing = check.obj(drawing, path)
+    if drawing is None:
+        return
+
+    check.string(drawing, "page_title", path)
+    check.string(drawing, "template_path", path)
+
+    view_ids: Dict[str, str] = {}
+    views = drawing.get("views", [])
+    if not isinstance(views, list):
+        check.fail(f"{path}.views", "must be a list")
+        views = []
+    for index, view in enumerate(views):
+        view_path = f"{path}.views[{index}]"
+        view = check.obj(view, view_path)
+        if view is None:
+            continue
+        view_id = check.string(view, "id", view_path)
+        if view_id is not None:
+            if view_id in view_ids:
+                check.fail(
+                    f"{view_path}.id",
+                    f"duplicate view id (first at {view_ids[view_id]})",
+                )
+            else:
+                view_ids[view_id] = view_path
+        check.vector(view, "direction", view_path, nonzero=True)
+        if view.get("is_section", False) and view.get("section_normal") is not None:
+            check.vector(view, "section_normal", view_path, nonzero=True)
+        check.number(view, "scale", view_path, required=False, positive=True)
+
+    dimensions = drawing.get("dimensions", [])
+    if not isinstance(dimensions, list):
+        check.fail(f"{path}.dimensions", "must be a list")
+        dimensions = []
+    for index, dim in enumerate(dimensions):
+        dim_path = f"{path}.dimensions[{index}]"
+        dim = check.obj(dim, dim_path)
+        if dim is None:
+            continue
+        view_id = check.string(dim, "view_id", dim_path)
+        if view_id is not None and view_id not in view_ids:
+            known = ", ".join(map(repr, view_ids)) or "none"
+            check.fail(
+                f"{dim_path}.view_id",
+                f"unknown view id {view_id!r} (known: {known})",
+            )
+        check.string(dim, "kind", dim_path)
+        if "label" not in dim or dim["label"] is None:
+            check.fail(f"{dim_path}.label", "is required")
+
+
+# ----- Outputs ---------------------------------------------------------------------
+
+
+def _validate_outputs(check: _Checker, job: Dict[str, Any]) -> None:
+    has_drawing = job.get("drawing") is not None
+    paths: Dict[str, str] = {}
+
+    keys = ["output_pdf", "output_svg"] + [f"output_{fmt}" for fmt in GEOMETRY_FORMATS]
+    for key in keys:
+        if job.get(key) is None:
+            continue
+        value = check.string(job, key, "$")
+        if value is None:
+            continue
+        if value in paths:
+            check.fail(f"$.{key}", f"same path as $.{paths[value]}")
+        paths.setdefault(value, key)
+
+    backend = job.get("backend", "techdraw")
+    if backend not in _BACKENDS:
+        allowed = ", ".join(map(repr, _BACKENDS))
+        check.fail("$.backend", f"must be one of {allowed}")
+    elif has_drawing and backend == "svg":
+        if job.get("output_pdf") is None and job.get("output_svg") is None:
+            check.fail("$", "the svg backend needs output_svg and/or output_pdf")
+    elif has_drawing and job.get("output_pdf") is None:
+        check.fail("$.output_pdf", "is required when a drawing is requested")
+    if not has_drawing:
+        if job.get("output_svg") is not None:
+            check.fail("$.output_svg", "requires a drawing")
+        if not any(job.get(f"output_{fmt}") for fmt in GEOMETRY_FORMATS):
+            check.fail(
+                "$",
+                "must request a drawing or at least one of "
+                + ", ".join(f"output_{fmt}" for fmt in GEOMETRY_FORMATS),
+            )
+
+    for flag in ("project_views", "incremental", "echo_specs"):
+        if flag in job and not isinstance(job[flag], bool):
+            check.fail(f"$.{flag}", "must be a boolean")
+
+    for key in ("stl_tolerance", "stl_angular_tolerance"):
+        check.number(job, key, "$", required=False, positive=True)
+    if job.get("thumbnail_size") is not None:
+        size = check.integer(job, "thumbnail_size", "$")
+        if size is not None and size < 16:
+            check.fail("$.thumbnail_size", "must be at least 16")
+
+
+# ----- Boolean options -------------------------------------------------------------
+
+
+def _validate_boolean(check: _Checker, boolean: Any, path: str) -> None:
+    boolean = check.obj(boolean, path)
+    if boolean is None:
+        return
+    if "parallel" in boolean and not isinstance(boolean["parallel"], bool):
+        check.fail(f"{path}.parallel", "must be a boolean")
+    if "threads" in boolean:
+        check.fail(
+            f"{path}.threads",
+            "OCCT's thread pool is per process; set SCANMASTER_BOOLEAN_THREADS",
+        )
+    fuzzy = check.number(boolean, "fuzzy", path, required=False)
+    if fuzzy is not None and fuzzy < 0:
+        check.fail(f"{path}.fuzzy", "must not be negative")
+    check.choice(boolean, "glue", path, ("off", "shift", "full"), "off")
+
+
+# ----- Entry points ----------------------------------------------------------------
+
+
+def validate_job(job: Any) -> List[ValidationIssue]:
+    """Return every problem found in ``job`` (empty list if it is valid).
+
+    ``job`` is the raw decoded JSON object, as accepted by
+    ``job_runner.run_job``.
+    """
+
+    check = _Checker()
+    job = check.obj(job, "$")
+    if job is None:
+        return check.issues
+    if "outputs" in job:
+        # Checked in the flat output_<format> form the runner uses.
+        from .job_codec import expand_outputs
+
+        job = dict(job)
+        try:
+            expand_outputs(job)
+        except JobValidationError as exc:
+            check.issues.extend(exc.issues)
+
+    if "solid" not in job:
+        check.fail("$.solid", "is required")
+    else:
+        _validate_solid(check, job["solid"], "$.solid")
+    if job.get("drawing") is not None:
+        _validate_drawing(check, job["drawing"], "$.drawing")
+    if job.get("boolean") is not None:
+        _validate_boolean(check, job["boolean"], "$.boolean")
+    _validate_outputs(check, job)
+    return check.issues
+
+
+def ensure_valid_job(job: Any) -> None:
+    """Raise :class:`JobValidationError` if ``job`` has any issue."""
+
+    issues = validate_job(job)
+    if issues:
+        raise JobValidationError(issues)
@@ -0,0 +1,65 @@
+"""Batch failure-isolation check for ``job_runner.run_batch``.
+
+Runs a small geometry-only batch in which one job kills its worker
+process outright (as a crash inside OCCT would) and checks that only
+that job fails: the pool is restarted and every other job, including
+the ones running next to the crash and the ones not started yet,
+still succeeds.
+
+Like ``test_geometry_engine.py`` this is a plain script; it needs
+CadQuery but not FreeCAD. Worker processes are forked, so it runs on
+Linux/macOS.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import job_runner
+
+JOBS = 10
+WORKERS = 2
+CRASHING = 3
+
+_batch_task = job_runner._batch_task
+
+
+def _crashing_task(job):
+    if job.get("crash"):
+        os._exit(1)
+    return _batch_task(job)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [
+            {
+                "job_id": f"job-{i}",
+                "solid": {
+                    "id": f"cube-{i}",
+                    "operations": [
+                        {"type": "BaseBox", "width": 1 + i, "depth": 1, "height": 1}
+                    ],
+                },
+                "output_brep": str(Path(tmp) / f"cube-{i}.brep"),
+                "crash": i == CRASHING,
+            }
+            for i in range(JOBS)
+        ]
+        # Forked pool workers inherit the patched task.
+        job_runner._batch_task = _crashing_task
+        try:
+            batch = job_runner.run_batch(jobs, workers=WORKERS)
+        finally:
+            job_runner._batch_task = _batch_task
+
+    failed = [r["job_id"] for r in batch["results"] if not r["ok"]]
+    print("Batch summary:", {k: batch["summary"][k] for k in ("jobs", "ok", "failed")})
+    print("Failed:", failed, batch["results"][CRASHING]["error"]["type"])
+    assert [r["job_id"] for r in batch["results"]] == [j["job_id"] for j in jobs]
+    assert failed == [f"job-{CRASHING}"], failed
+    assert batch["results"][CRASHING]["error"]["type"] == "BrokenProcessPool"
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,12 @@ quickly verify that the generic SolidSpec/GeometryEngine pipeline works
 (locally or in CI) without needing TechDraw.
 """
 
+import math
+import tempfile
+from pathlib import Path
+
 from scanmaster_drawing_engine.geometry_engine import (
+    BooleanOptions,
     GeometryEngine,
     SolidSpec,
     SketchCircle,
@@ -13,7 +18,19 @@ from scanmaster_drawing_engine.geometry_engine import (
     BaseBox,
     CutBox,
     ThroughHole,
+    HoleArray,
+    ThroughHoleTable,
+    hole_array_centers,
 )
+from scanmaster_drawing_engine.artifact_cache import ArtifactStore
+from scanmaster_drawing_engine.solid_cache import SolidCache, solid_spec_key
+from scanmaster_drawing_engine.spec_parsing import solid_spec_from_dict
+from scanmaster_drawing_engine.parametric import ParametricTemplate, expand_family
+from scanmaster_drawing_engine.drawing_engine import DimensionSpec, DrawingSpec, ViewSpec
+from scanmaster_drawing_engine.exporters import GEOMETRY_FORMATS, export_geometry
+from scanmaster_drawing_engine.instrumentation import Timings
+from scanmaster_drawing_engine.svg_backend import generate_svg_drawing
+from scanmaster_drawing_engine.validation import validate_job
 
 
 def main() -> None:
@@ -45,6 +62,302 @@ def main() -> None:
     block_shape = block.val()
     print("Block shape type:", block_shape.ShapeType())
 
+    # --- Hole pattern: 4 x 5 grid of Z holes cut in one pass ---
+    grid_spec = SolidSpec(
+        id="test-hole-grid",
+        operations=[
+            BaseBox(width=50.0, depth=40.0, height=10.0, centered_xy=False, centered_z=False),
+            HoleArray(
+                radius=1.0,
+                depth=10.0,
+                count=5,
+                rows=4,
+                layout="grid",
+                origin=(5.0, 5.0, 5.0),
+                pitch=(10.0, 0.0, 0.0),
+                row_pitch=(0.0, 10.0, 0.0),
+            ),
+        ],
+    )
+    grid_shape = engine.build_solid(grid_spec).val()
+    print("Hole grid volume:", round(grid_shape.Volume(), 3))
+    assert abs(grid_shape.Volume() - (50.0 * 40.0 * 10.0 - 20 * math.pi * 10.0)) < 1e-3
+
+    # --- HoleArray places its holes exactly like a ThroughHole ladder ---
+    plate = BaseBox(width=50.0, depth=20.0, height=10.0, centered_xy=False, centered_z=False)
+    for axis, origin, pitch in (
+        ("x", (0.0, 5.0, 5.0), (0.0, 0.0, 10.0)),
+        ("z", (10.0, 10.0, 100.0), (15.0, 0.0, 0.0)),
+    ):
+        array = HoleArray(
+            radius=2.0, depth=5.0, count=2, axis=axis, origin=origin, pitch=pitch
+        )
+        ladder = [
+            ThroughHole(radius=2.0, depth=5.0, axis=axis, center=tuple(center))
+            for center in hole_array_centers(array).tolist()
+        ]
+        array_volume = engine.build_solid(
+            SolidSpec(id=f"array-{axis}", operations=[plate, array])
+        ).val().Volume()
+        ladder_volume = engine.build_solid(
+            SolidSpec(id=f"ladder-{axis}", operations=[plate, *ladder])
+        ).val().Volume()
+        print(f"HoleArray vs ladder ({axis}):", round(array_volume, 3), round(ladder_volume, 3))
+        assert abs(array_volume - ladder_volume) < 1e-6
+        assert array_volume < 50.0 * 20.0 * 10.0 - 1.0
+
+    # --- Operation table: same solid (and cache key) as individual holes ---
+    holes = [
+        ThroughHole(radius=1.0, depth=10.0, axis="z", center=(5.0 + 10 * i, 5.0, 5.0))
+        for i in range(5)
+    ]
+    base = grid_spec.operations[0]
+    row_spec = SolidSpec(id="test-rows", operations=[base, *holes])
+    table_spec = SolidSpec(
+        id="test-table", operations=[base, ThroughHoleTable.from_operations(holes)]
+    )
+    row_volume = engine.build_solid(row_spec).val().Volume()
+    table_volume = engine.build_solid(table_spec).val().Volume()
+    print("Table volume:", round(table_volume, 3))
+    assert abs(row_volume - table_volume) < 1e-6
+    assert solid_spec_key(row_spec) == solid_spec_key(table_spec)
+
+    # --- Columnar jobs: parsed straight into a table, checked per column ---
+    columnar = {
+        "id": "test-columns",
+        "operations": [
+            {
+                "type": "BaseBox",
+                "width": 50.0,
+                "depth": 40.0,
+                "height": 10.0,
+                "centered_xy": False,
+                "centered_z": False,
+            }
+        ],
+        "columns": {
+            "ThroughHole": {
+                "radius": 1.0,
+                "depth": 10.0,
+                "axis": "z",
+                "center": [list(hole.center) for hole in holes],
+            }
+        },
+    }
+    columnar_spec = solid_spec_from_dict(columnar)
+    assert isinstance(columnar_spec.operations[-1], ThroughHoleTable)
+    assert solid_spec_key(columnar_spec) == solid_spec_key(row_spec)
+    columnar_job = {"solid": columnar, "output_brep": "columnar.brep"}
+    assert not validate_job(columnar_job)
+    columnar["columns"]["ThroughHole"]["radius"] = [1.0, 1.0, -1.0, 1.0, 1.0]
+    issues = {issue.path for issue in validate_job(columnar_job)}
+    print("Columnar issues:", sorted(issues))
+    assert issues == {"$.solid.columns.ThroughHole[2].radius"}
+
+    # --- Solid cache: reordered/near-identical specs hit the same entry ---
+    cache = SolidCache(max_bytes=7_000)
+    cached_engine = GeometryEngine(cache=cache)
+    cached_engine.build_solid(block_spec)
+    reordered = SolidSpec(
+        id="test-block-copy",
+        operations=[
+            block_spec.operations[0],
+            ThroughHole(radius=3.0, depth=10.0, axis="z", center=(30.0, 0.0, 5.0 + 1e-9)),
+            block_spec.operations[1],
+        ],
+    )
+    cached_engine.build_solid(reordered)
+    cached_engine.build_solid(ring_spec)
+    stats = cache.stats()
+    print("Solid cache stats:", stats)
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["evictions"] == 1 and stats["bytes"] <= cache.max_bytes
+
+    # --- Parametric family: variants share their base solid ---
+    family = ParametricTemplate.from_dict(
+        {
+            "parameters": {"od": 40, "id": 20, "length": 20, "hole_z": "=length / 2"},
+            "solid": {
+                "id": "ring_{od}x{id}_{hole_z:g}",
+                "operations": [
+                    {"type": "SketchCircle", "radius": "=od / 2"},
+                    {"type": "SketchCircle", "radius": "=id / 2", "is_hole": True},
+                    {"type": "Extrude", "length": "=length"},
+                    {
+                        "type": "ThroughHole",
+                        "radius": 2,
+                        "depth": "=od",
+                        "axis": "x",
+                        "center": [0, 0, "=hole_z"],
+                    },
+                ],
+            },
+        }
+    )
+    for unsafe in ("=9**9**9", "{od.__class__}"):
+        try:
+            ParametricTemplate.from_dict(
+                {"parameters": {"od": 40}, "solid": {"id": unsafe}}
+            ).instantiate({})
+        except ValueError:
+            continue
+        raise AssertionError(f"template {unsafe!r} was not rejected")
+    rows = [{"hole_z": 5}, {"hole_z": 10}, {"od": 50}]
+    family_engine = GeometryEngine(base_cache_entries=4)
+    ids = []
+    for job in expand_family(family, rows):
+        spec = solid_spec_from_dict(job["solid"])
+        family_engine.build_solid(spec)
+        ids.append(spec.id)
+    base_stats = family_engine.base_cache_stats()
+    print("Family:", ids, base_stats)
+    assert ids == ["ring_40x20_5", "ring_40x20_10", "ring_50x20_10"]
+    assert base_stats["misses"] == 2 and base_stats["hits"] == 1
+
+    # --- Incremental rebuild: an edited hole only replays the tail ---
+    def edited_block(hole_x: float) -> SolidSpec:
+        return SolidSpec(
+            id="test-edit",
+            operations=[
+                block_spec.operations[0],
+                block_spec.operations[1],
+                ThroughHole(radius=3.0, depth=10.0, axis="z", center=(hole_x, 0.0, 5.0)),
+                ThroughHole(radius=2.0, depth=10.0, axis="z", center=(40.0, 15.0, 5.0)),
+            ],
+        )
+
+    editor_engine = GeometryEngine()
+    first = editor_engine.rebuild(edited_block(30.0))
+    edited = editor_engine.rebuild(edited_block(35.0))
+    print("Rebuild:", first.report(), edited.report())
+    assert first.reused == 0 and (edited.reused, edited.recomputed) == (2, 2)
+    expected = engine.build_solid(edited_block(35.0)).val().Volume()
+    assert abs(edited.solid.val().Volume() - expected) < 1e-6
+
+    # --- Tool pre-pass: stray, duplicate and abutting tools cost no boolean ---
+    slot_spec = SolidSpec(
+        id="test-slot",
+        operations=[
+            BaseBox(width=50.0, depth=20.0, height=10.0, centered_xy=False, centered_z=False),
+            *[
+                CutBox(width=5.0, depth=20.0, height=4.0, center=(x, 10.0, 8.0))
+                for x in (12.5, 17.5, 22.5)
+            ],
+            ThroughHole(radius=2.0, depth=10.0, axis="z", center=(40.0, 10.0, 5.0)),
+            ThroughHole(radius=2.0, depth=10.0, axis="z", center=(40.0, 10.0, 5.0)),
+            ThroughHole(radius=2.0, depth=10.0, axis="z", center=(90.0, 10.0, 5.0)),
+        ],
+    )
+    timings = Timings()
+    with timings.activate():
+        slotted = GeometryEngine().build_solid(slot_spec)
+    (tools_meta,) = [r.meta for r in timings.records if r.name == "geometry.tools"]
+    print("Tool pre-pass:", tools_meta)
+    removed = (tools_meta["outside"], tools_meta["duplicates"], tools_meta["merged"])
+    assert removed == (1, 1, 2)
+    unfiltered = GeometryEngine(prefilter_tools=False).build_solid(slot_spec)
+    assert abs(slotted.val().Volume() - unfiltered.val().Volume()) < 1e-6
+
+    # --- OCCT boolean options: serial/parallel/fuzzy cut the same solid ---
+    volumes = {
+        round(engine.build_solid(block_spec, options).val().Volume(), 6)
+        for options in (
+            BooleanOptions(parallel=False),
+            BooleanOptions(parallel=True),
+            BooleanOptions(fuzzy=1e-5),
+        )
+    }
+    print("Boolean option volumes:", volumes)
+    assert volumes == {round(block_shape.Volume(), 6)}
+
+    # --- Multi-artifact exports: one solid, exporters on threads ---
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = {fmt: str(Path(tmp) / f"block.{fmt}") for fmt in GEOMETRY_FORMATS}
+        written = export_geometry(block, outputs, thumbnail_size=64, max_workers=4)
+        sizes = {fmt: Path(path).stat().st_size for fmt, path in written.items()}
+        print("Exports:", sizes)
+        assert all(sizes.values())
+        assert Path(written["png"]).read_bytes().startswith(b"\x89PNG")
+
+    # --- Artifact store: outputs are copies, later writes miss the store ---
+    with tempfile.TemporaryDirectory() as tmp:
+        rendered = Path(tmp) / "rendered.pdf"
+        rendered.write_bytes(b"cached drawing")
+        store = ArtifactStore(str(Path(tmp) / "store"))
+        store.store("ab" * 32, str(rendered), None, 1.0)
+        entry = store.lookup("ab" * 32, with_svg=False)
+        out_pdf = Path(tmp) / "out.pdf"
+        store.materialise(entry, str(out_pdf), None)
+        out_pdf.write_bytes(b"next job")
+        cached = store.lookup("ab" * 32, with_svg=False).pdf_path.read_bytes()
+        assert cached == b"cached drawing", cached
+
+    # --- Upfront job validation: all issues at once, with JSON paths ---
+    bad_job = {
+        "solid": {
+            "id": "bad-ring",
+            "operations": [
+                {"type": "SketchCircle", "radius": 10.0},
+                {"type": "SketchCircle", "radius": 12.0, "is_hole": True},
+                {"type": "Extrude", "length": 20.0},
+                {"type": "CutBox", "width": 1, "depth": 1, "height": 1, "center": [50, 0, 0]},
+                # x-axis holes sit at y = center[2], z = center[1]: this
+                # one cuts the ring, the next one misses it.
+                {"type": "ThroughHole", "radius": 2, "depth": 5, "axis": "x", "center": [0, 15, 5]},
+                {"type": "ThroughHole", "radius": 2, "depth": 5, "axis": "x", "center": [0, 5, 15]},
+                # 10^16 holes: rejected before hole_array_centers runs.
+                {"type": "HoleArray", "radius": 1, "depth": 5, "layout": "grid",
+                 "count": 10**8, "rows": 10**8},
+            ],
+        },
+        "drawing": {
+            "page_title": "BAD",
+            "template_path": "template.svg",
+            "views": [{"id": "FRONT", "direction": [0, -1, 0]}],
+            "dimensions": [{"view_id": "SIDE", "kind": "linear", "label": "L"}],
+        },
+        "output_pdf": "bad.pdf",
+        "boolean": {"threads": 8},
+    }
+    issues = {issue.path for issue in validate_job(bad_job)}
+    print("Validation issues:", sorted(issues))
+    assert issues == {
+        "$.solid.operations[1].radius",
+        "$.solid.operations[3]",
+        "$.solid.operations[5]",
+        "$.solid.operations[6].count",
+        "$.drawing.dimensions[0].view_id",
+        "$.boolean.threads",
+    }
+
+    # --- SVG backend: full page without FreeCAD ---
+    with tempfile.TemporaryDirectory() as tmp:
+        template = Path(tmp) / "template.svg"
+        template.write_text(
+            '<svg xmlns="http://www.w3.org/2000/svg" width="297mm" height="210mm" '
+            'viewBox="0 0 297 210"/>',
+            encoding="utf8",
+        )
+        drawing_spec = DrawingSpec(
+            page_title="SMOKE",
+            template_path=str(template),
+            views=[
+                ViewSpec(id="FRONT", direction=(0.0, -1.0, 0.0)),
+                ViewSpec(id="TOP", direction=(0.0, 0.0, 1.0)),
+                ViewSpec(id="SEC", direction=(0.0, -1.0, 0.0), is_section=True),
+            ],
+            dimensions=[
+                DimensionSpec(view_id="FRONT", kind="linear", label="50 mm", edges=[]),
+                DimensionSpec(view_id="TOP", kind="diameter", label="Ø 6", edges=[]),
+            ],
+        )
+        svg_path = Path(tmp) / "block.svg"
+        views = generate_svg_drawing(block, drawing_spec, output_svg=str(svg_path))
+        svg = svg_path.read_text(encoding="utf8")
+        print("SVG page:", len(svg), "bytes,", [v.view_id for v in views])
+        assert svg.count('class="dimension"') == 2
+        assert views[2].projection.section, "section view has no cut faces"
+
 
 if __name__ == "__main__":
     main()
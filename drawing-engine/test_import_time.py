@@ -0,0 +1,65 @@
+"""Import-time budget check for the drawing engine.
+
+Starts fresh interpreters, imports the job runner and the spec/parsing
+modules, parses and validates a small job, and checks that:
+
+* no heavy CAD module (CadQuery, OCP, FreeCAD) got imported, and
+* the cold import stays below ``IMPORT_BUDGET_S`` (best of a few runs,
+  override with ``SCANMASTER_IMPORT_BUDGET_S``).
+
+Like ``test_geometry_engine.py`` this is a plain script; it does not
+need FreeCAD (nor, in fact, CadQuery).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+IMPORT_BUDGET_S = float(os.environ.get("SCANMASTER_IMPORT_BUDGET_S", "0.5"))
+RUNS = 3
+
+HEAVY_MODULES = ("cadquery", "OCP", "FreeCAD", "TechDraw")
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import job_runner
+from scanmaster_drawing_engine.spec_parsing import solid_spec_from_dict
+from scanmaster_drawing_engine.geometry_engine import validate_solid_spec
+elapsed = time.perf_counter() - start
+validate_solid_spec(solid_spec_from_dict({
+    "id": "import-check",
+    "operations": [{"type": "BaseBox", "width": 1, "depth": 1, "height": 1}],
+}))
+heavy = [m for m in %r if m in sys.modules]
+print(json.dumps({"elapsed_s": elapsed, "heavy": heavy}))
+""" % (HEAVY_MODULES,)
+
+
+def _cold_import() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=Path(__file__).resolve().parent,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main() -> None:
+    runs = [_cold_import() for _ in range(RUNS)]
+    best = min(r["elapsed_s"] for r in runs)
+    heavy = sorted({m for r in runs for m in r["heavy"]})
+
+    print(f"Cold import: {best * 1000:.1f} ms (budget {IMPORT_BUDGET_S * 1000:.0f} ms)")
+    print("Heavy modules imported:", heavy or "none")
+
+    assert not heavy, f"Heavy CAD modules imported eagerly: {heavy}"
+    assert best <= IMPORT_BUDGET_S, f"Cold import took {best:.3f}s"
+
+
+if __name__ == "__main__":
+    main()